@@ -0,0 +1,255 @@
+"""Time each stage of the dashboard pipeline on synthetic surveys of growing size.
+
+Runs headlessly (no Streamlit) and writes one JSON record per (rows, stage):
+
+    python benchmarks/bench_pipeline.py --sizes 100 1000 10000 100000 -o results.json
+
+A stage slower than --budget seconds is skipped at larger sizes, which shows
+where each stage stops scaling without waiting hours for 10^7 rows.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from survey_analytics import (  # noqa: E402
+    BARRIERS, QUESTIONS, SurveyCube, build_cube, build_index, section_scores, select
+)
+from survey_aggregates import build_aggregates, read_aggregates, write_aggregates  # noqa: E402
+from survey_data import (  # noqa: E402
+    arrow_strings, file_state, frame_memory, read_snapshot, read_survey_csv, write_snapshot
+)
+from survey_search import CommentIndex  # noqa: E402
+from survey_sql import SqlRowView, SurveyDatabase  # noqa: E402
+from survey_stream import stream_survey  # noqa: E402
+from survey_tables import section_summaries  # noqa: E402
+from synthetic import SurveyProfile, write_survey  # noqa: E402
+
+DEFAULT_SIZES = [10 ** k for k in range(2, 6)]
+# Rows per chunk of the streamed read, small enough that 10^5 rows take several chunks
+STREAM_CHUNK_ROWS = 10_000
+MAX_SIZES = [10 ** k for k in range(2, 8)]
+# A keyword, a phrase and a prefix, with words the synthetic comments take from 109.csv
+SEARCH_QUERIES = ['manila', '"manila package"', 'expens*']
+# Stages whose output later stages need; with --stages they still run, untimed
+PRODUCERS = {'read_csv_clean', 'snapshot_write', 'build_cube', 'build_index', 'word_frequencies', 'aggregates_build',
+             'sql_ingest', 'comment_index'}
+
+
+def _crosstabs(cube):
+    # Fresh cube so the memoized tables are really recomputed
+    cube = SurveyCube(cube.counts, cube.totals)
+    for question in QUESTIONS + [BARRIERS]:
+        cube.crosstab(question, margins=True)
+        cube.percentages(question)
+    return cube
+
+
+def _section_loop(cube):
+    cube = SurveyCube(cube.counts, cube.totals)
+    for label in cube.sections():
+        section = cube.section(label)
+        for question in QUESTIONS + [BARRIERS]:
+            section.value_counts(question)
+
+
+def _comments(df):
+    comments = df['Additional_Comments'].dropna()
+    return comments[comments.str.strip() != '']
+
+
+def stages(csv_path, workdir, state):
+    """(name, func) pairs in run order; later stages read earlier results from ``state``."""
+    snapshot_path = os.path.join(workdir, 'snapshot.arrow')
+    aggregates_path = os.path.join(workdir, 'aggregates.pkl')
+    database_path = os.path.join(workdir, 'survey.db')
+
+    def load():
+        state['df'], state['unique_barriers'] = read_survey_csv(csv_path)
+
+    def cube():
+        state['cube'] = build_cube(state['df'], state['unique_barriers'])
+
+    def index():
+        state['index'] = build_index(state['df'], state['unique_barriers'])
+
+    def select_sections():
+        programs = state['index'].values('Program')
+        select(state['df'], state['unique_barriers'], state['cube'], state['index'],
+               programs[:max(1, len(programs) // 2)], state['index'].values('Section'))
+
+    def select_answers():
+        select(state['df'], state['unique_barriers'], state['cube'], state['index'],
+               state['index'].values('Program'), state['index'].values('Section'),
+               {'Affordability_Rating': ['Very Expensive'], BARRIERS: ['Safety concerns']})
+
+    def word_frequencies():
+        from survey_wordcloud import word_frequencies as frequencies
+        state['frequencies'] = frequencies(_comments(state['df']))
+
+    def comment_index():
+        state['comments'] = CommentIndex.build(state['df'])
+
+    def comment_search():
+        for query in SEARCH_QUERIES:
+            state['comments'].search(query)
+
+    def aggregates():
+        ingest = {'sha256': '', 'rows': len(state['df']), 'last_timestamp': None}
+        write_aggregates(aggregates_path, build_aggregates(csv_path, file_state(csv_path), state['df'],
+                                                           state['unique_barriers'], ingest))
+
+    def sql_ingest():
+        # Into a new file every run, since ingesting the same content again writes nothing
+        if 'database' in state:
+            state['database'].close()
+        if os.path.exists(database_path):
+            os.remove(database_path)
+        state['database'] = SurveyDatabase(database_path, create=True)
+        ingest = {'sha256': '', 'rows': len(state['df']), 'last_timestamp': None}
+        state['database'].ingest('synthetic', state['df'], state['unique_barriers'], state['cube'], ingest)
+
+    def sql_select_sections():
+        programs = state['database'].values('Program')
+        state['database'].select(programs[:max(1, len(programs) // 2)], state['database'].values('Section'))
+
+    def sql_select_answers():
+        database = state['database']
+        database.select(database.values('Program'), database.values('Section'),
+                        {'Affordability_Rating': ['Very Expensive'], BARRIERS: ['Safety concerns']})
+
+    def sql_section_rows():
+        rows = SqlRowView(state['database'], state['database'].selection())
+        label = state['cube'].sections()[0]
+        rows.rows((rows['Manila_Willingness'] == 'No') & (rows['Program_Section'] == label), ['Name', 'Email'])
+
+    def wordcloud():
+        from survey_wordcloud import render_wordcloud
+        render_wordcloud(state['frequencies'], 400, 200, 'Word Cloud of Comments', (8, 4))
+
+    return [
+        ('read_csv_clean', load),
+        ('snapshot_write', lambda: write_snapshot(snapshot_path, state['df'], state['unique_barriers'])),
+        ('snapshot_read', lambda: read_snapshot(snapshot_path)),
+        ('snapshot_read_lean', lambda: read_snapshot(snapshot_path, lean=True)),
+        ('build_cube', cube),
+        # The cube and comments of read_csv_clean + build_cube, one chunk of rows in memory at a time
+        ('read_csv_stream', lambda: stream_survey(csv_path, STREAM_CHUNK_ROWS)),
+        ('section_scores', lambda: section_scores(state['cube'])),
+        ('crosstabs', lambda: _crosstabs(state['cube'])),
+        ('section_loop', lambda: _section_loop(state['cube'])),
+        # Every section's report summary, as aggregates_build and the reports compute them
+        ('section_summaries', lambda: section_summaries(SurveyCube(state['cube'].counts, state['cube'].totals),
+                                                        section_scores(state['cube']))),
+        ('build_index', index),
+        ('select_sections', select_sections),
+        ('select_answers', select_answers),
+        ('word_frequencies', word_frequencies),
+        ('wordcloud_render', wordcloud),
+        # Full-text search over the comments: built once at load, then every query reads postings only
+        ('comment_index', comment_index),
+        ('comment_search', comment_search),
+        # What a cold dashboard start costs with and without prebuilt aggregates
+        ('aggregates_build', aggregates),
+        ('aggregates_read', lambda: read_aggregates(aggregates_path, csv_path, file_state(csv_path))),
+        # The embedded database: selections and respondent lists without the rows in memory
+        ('sql_ingest', sql_ingest),
+        ('sql_select_sections', sql_select_sections),
+        ('sql_select_answers', sql_select_answers),
+        ('sql_section_rows', sql_section_rows),
+    ]
+
+
+def time_stage(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run(sizes, repeat=3, budget=60.0, only=None, seed=0, log=print):
+    profile = SurveyProfile()
+    results = []
+    over_budget = set()
+    with tempfile.TemporaryDirectory(prefix='survey-bench-') as workdir:
+        for n_rows in sizes:
+            csv_path = os.path.join(workdir, f'synthetic-{n_rows}.csv')
+            start = time.perf_counter()
+            write_survey(csv_path, n_rows, seed=seed, profile=profile)
+            log(f'{n_rows:>10} rows  generated in {time.perf_counter() - start:.2f}s')
+            state = {}
+            for name, func in stages(csv_path, workdir, state):
+                record = {'rows': n_rows, 'stage': name}
+                if only and name not in only:
+                    if name in PRODUCERS:
+                        func()
+                    continue
+                if name in over_budget:
+                    results.append(dict(record, skipped='over budget at a smaller size'))
+                    continue
+                try:
+                    runs = time_stage(func, repeat)
+                except MemoryError:
+                    over_budget.add(name)
+                    results.append(dict(record, skipped='MemoryError'))
+                    continue
+                record.update(best_s=min(runs), mean_s=float(np.mean(runs)), runs=runs)
+                results.append(record)
+                log(f'{n_rows:>10} rows  {name:<18} {min(runs):10.4f}s')
+                if min(runs) > budget:
+                    over_budget.add(name)
+            if 'df' in state:
+                # What one copy of the frame costs a session, with object vs Arrow text columns
+                results.append({'rows': n_rows, 'stage': 'frame_memory',
+                                'object_bytes': frame_memory(state['df']),
+                                'lean_bytes': frame_memory(arrow_strings(state['df']))})
+            if 'cube' in state:
+                # The per-section stages scale with this rather than with the rows
+                results.append({'rows': n_rows, 'stage': 'sections', 'sections': len(state['cube'].sections())})
+            if 'database' in state:
+                state['database'].close()
+            os.remove(csv_path)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f'row counts (default: {DEFAULT_SIZES}; up to {MAX_SIZES[-1]:,} is supported)')
+    parser.add_argument('--max', action='store_true', help=f'run every size in {MAX_SIZES}')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='skip a stage at larger sizes once it takes longer than this (seconds)')
+    parser.add_argument('--stages', nargs='+', help='only time these stages (their inputs still run)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='benchmark-results.json')
+    args = parser.parse_args(argv)
+
+    sizes = MAX_SIZES if args.max else sorted(args.sizes)
+    results = run(sizes, args.repeat, args.budget, set(args.stages or ()), args.seed)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(args.output)
+
+
+if __name__ == '__main__':
+    main()
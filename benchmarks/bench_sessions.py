@@ -0,0 +1,156 @@
+"""Load test: memory and rerun latency of 1-100 concurrent dashboard sessions.
+
+Simulates what each Streamlit session does on a rerun (fetch the data, apply a
+sidebar selection, read a few columns of the filtered rows) in its own thread,
+all starting together, and keeps every session's state alive while measuring.
+A ``--filtered`` share of sessions narrows to one program; the rest keep the
+default all-rows selection:
+
+    python benchmarks/bench_sessions.py --rows 100000 --sessions 1 10 25 50 100 -o sessions.json
+
+``shared`` sessions reference the one SurveyStore version; ``copied`` sessions
+unpickle their own frame and cube, like ``st.cache_data`` does. Each (mode,
+sessions) run happens in a fresh process so resident memory is comparable.
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from survey_analytics import RowView, select, selection_key  # noqa: E402
+from survey_cache import LRUCache  # noqa: E402
+from survey_data import file_state, ingest_survey  # noqa: E402
+from survey_store import SurveyStore  # noqa: E402
+from synthetic import SurveyProfile, write_survey  # noqa: E402
+
+DEFAULT_SESSIONS = [1, 10, 25, 50, 100]
+MODES = ['shared', 'copied']
+# Same bound as the dashboard's selection LRU
+SELECTION_CACHE_SIZE = 32
+
+
+def rss_bytes():
+    """Resident memory of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(csv_path, cache_dir, mode, sessions, filtered=0.5, seed=0):
+    """Run ``sessions`` concurrent reruns in this process; returns one result record."""
+    baseline = rss_bytes()
+    store = SurveyStore(csv_path, cache_dir, lean=True)
+    state = file_state(csv_path)
+    loaded = store.get(state)
+    pickled = pickle.dumps((loaded.df, loaded.cube)) if mode == 'copied' else None
+    selections = LRUCache(SELECTION_CACHE_SIZE)
+    programs = loaded.index.values('Program')
+    sections = loaded.index.values('Section')
+    start_together = threading.Barrier(sessions)
+    held = [None] * sessions
+    latencies = [None] * sessions
+    data_latencies = [None] * sessions
+
+    def session(k):
+        rng = np.random.default_rng(seed + k)
+        chosen = [programs[rng.integers(len(programs))]] if rng.random() < filtered else programs
+        start_together.wait()
+        start = time.perf_counter()
+        data = store.get(state)
+        df, cube = pickle.loads(pickled) if mode == 'copied' else (data.df, data.cube)
+        data_latencies[k] = time.perf_counter() - start
+        selection = selections.get(
+            selection_key(chosen, sections),
+            lambda: select(df, data.unique_barriers, cube, data.index, chosen, sections)
+        )
+        view = RowView(df, selection.positions)
+        for column in ['Name', 'Email', 'Program_Section']:
+            view[column]
+        latencies[k] = time.perf_counter() - start
+        held[k] = (df, cube, view)
+
+    threads = [threading.Thread(target=session, args=(k,)) for k in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = np.array(latencies) * 1000
+    data_latencies = np.array(data_latencies) * 1000
+    return {
+        'mode': mode,
+        'sessions': sessions,
+        'rss_mb': (rss_bytes() - baseline) / 2 ** 20,
+        'rss_per_session_mb': (rss_bytes() - baseline) / 2 ** 20 / sessions,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'max_ms': float(latencies.max()),
+        # Just getting hold of the frame and cube, the part the two modes differ in
+        'data_p50_ms': float(np.percentile(data_latencies, 50)),
+        'data_p95_ms': float(np.percentile(data_latencies, 95)),
+        'frame_mb': loaded.memory / 2 ** 20,
+        'selection_cache': selections.stats(),
+    }
+
+
+def run(n_rows, session_counts, modes=MODES, filtered=0.5, seed=0, log=print):
+    results = []
+    with tempfile.TemporaryDirectory(prefix='survey-sessions-') as workdir:
+        csv_path = os.path.join(workdir, f'synthetic-{n_rows}.csv')
+        cache_dir = os.path.join(workdir, 'cache')
+        write_survey(csv_path, n_rows, seed=seed, profile=SurveyProfile())
+        # Build the snapshot once so every run starts from the memory-mapped file
+        ingest_survey(csv_path, cache_dir)
+        context = multiprocessing.get_context('spawn')
+        for mode in modes:
+            for sessions in session_counts:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    record = pool.submit(measure, csv_path, cache_dir, mode, sessions, filtered, seed).result()
+                results.append(dict(record, rows=n_rows))
+                log(f"{mode:>7} {sessions:>4} sessions  +{record['rss_mb']:8.1f} MB  "
+                    f"p50 {record['p50_ms']:8.1f} ms  p95 {record['p95_ms']:8.1f} ms  "
+                    f"data p95 {record['data_p95_ms']:8.1f} ms")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--filtered', type=float, default=0.5,
+                        help='share of sessions that filter to a single program (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='sessions-results.json')
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, sorted(args.sessions), args.modes, args.filtered, args.seed)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Synthetic survey responses shaped like 109.csv, for benchmarking at any scale.
+
+Answer distributions are taken from a template CSV (109.csv by default) so the
+Likert skew, barrier combinations and comment rate match the real survey;
+programs and sections are multiplied to get many Program-Section groups.
+
+    python benchmarks/synthetic.py 100000 -o synthetic-100000.csv
+"""
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from survey_data import BARRIER_OPTIONS, COLUMNS, MULTISELECT_DELIMITER  # noqa: E402
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '109.csv')
+SINGLE_CHOICE = [
+    'Tour_Location_Preference', 'Affordability_Rating', 'Most_Important_Factor',
+    'Previous_Vote_Mattered', 'Non_Student_Factors', 'Manila_Willingness',
+    'Preferred_Package'
+]
+SECTION_LETTERS = 'ABCDEFGH'
+# Distinct comments to draw from; sampling a pool keeps 10^7 rows fast
+COMMENT_POOL = 2000
+
+
+class SurveyProfile:
+    """Empirical answer distributions of a survey CSV."""
+
+    def __init__(self, template=TEMPLATE):
+        # Header as written (pandas would rename the repeated "Timestamp")
+        with open(template, newline='', encoding='utf-8') as f:
+            self.header = next(csv.reader(f))
+        df = pd.read_csv(template, encoding='utf-8').set_axis(COLUMNS, axis=1)
+        self.programs = sorted(df['Program'].dropna().unique())
+        self.choices = {}
+        for column in SINGLE_CHOICE:
+            counts = df[column].value_counts()
+            self.choices[column] = (counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy())
+        barriers = df['Barriers'].fillna('').str.split(MULTISELECT_DELIMITER, regex=False)
+        ticked = barriers.explode().str.strip()
+        self.barrier_rates = np.array([(ticked == option).sum() / len(df) for option in BARRIER_OPTIONS])
+        comments = df['Additional_Comments'].dropna().astype(str)
+        comments = comments[comments.str.strip() != '']
+        self.comment_rate = len(comments) / len(df)
+        self.words = np.array(' '.join(comments).split() or ['ok'], dtype=object)
+
+
+def _comments(profile, rng, size):
+    lengths = rng.integers(3, 30, size=COMMENT_POOL)
+    pool = np.array([' '.join(rng.choice(profile.words, size=n)) for n in lengths], dtype=object)
+    comments = pool[rng.integers(0, COMMENT_POOL, size=size)]
+    comments[rng.random(size) >= profile.comment_rate] = None
+    return comments
+
+
+def _barriers(profile, rng, size):
+    ticks = rng.random((size, len(BARRIER_OPTIONS))) < profile.barrier_rates
+    options = np.array(BARRIER_OPTIONS, dtype=object)
+    # Join each distinct tick pattern once, then look rows up by pattern
+    patterns, inverse = np.unique(np.packbits(ticks, axis=1, bitorder='little')[:, 0], return_inverse=True)
+    joined = []
+    for pattern in patterns:
+        mask = np.unpackbits(np.array([pattern], dtype=np.uint8), bitorder='little')[:len(options)].astype(bool)
+        joined.append(f'{MULTISELECT_DELIMITER} '.join(options[mask]) or None)
+    return np.array(joined, dtype=object)[inverse.ravel()]
+
+
+def generate_survey(n_rows, seed=0, n_programs=None, profile=None):
+    """DataFrame of ``n_rows`` synthetic responses with the template's header."""
+    profile = profile or SurveyProfile()
+    rng = np.random.default_rng(seed)
+    # Roughly 25 respondents per Program-Section, as in the real survey
+    if n_programs is None:
+        n_programs = max(len(profile.programs), n_rows // (25 * len(SECTION_LETTERS)))
+    programs = np.array(profile.programs + [f'PRG{k:05d}' for k in range(n_programs - len(profile.programs))],
+                        dtype=object)[:n_programs]
+    sections = np.array(list(SECTION_LETTERS), dtype=object)
+
+    ids = pd.Series(np.arange(n_rows)).astype(str)
+    minutes = pd.Series(rng.integers(0, 24 * 60, size=n_rows))
+    data = {
+        'Timestamp': '9/5/2025 ' + (minutes // 60).astype(str) + ':' + (minutes % 60).astype(str).str.zfill(2),
+        'Name': 'Student ' + ids,
+        'Email': 'student' + ids + '@example.edu',
+        'Program': programs[rng.integers(0, len(programs), size=n_rows)],
+        'Section': sections[rng.integers(0, len(sections), size=n_rows)],
+    }
+    for column in SINGLE_CHOICE:
+        values, p = profile.choices[column]
+        data[column] = values[rng.choice(len(values), size=n_rows, p=p)]
+    data['Barriers'] = _barriers(profile, rng, n_rows)
+    data['Additional_Comments'] = _comments(profile, rng, n_rows)
+    frame = pd.DataFrame(data)[COLUMNS]
+    frame.columns = profile.header
+    return frame
+
+
+def write_survey(path, n_rows, seed=0, n_programs=None, profile=None):
+    generate_survey(n_rows, seed, n_programs, profile).to_csv(path, index=False, encoding='utf-8')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('-o', '--output', help='CSV path (default: synthetic-<rows>.csv)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--programs', type=int, help='number of programs (default: scales with rows)')
+    parser.add_argument('--template', default=TEMPLATE, help='CSV whose distributions are copied')
+    args = parser.parse_args(argv)
+    path = args.output or f'synthetic-{args.rows}.csv'
+    write_survey(path, args.rows, args.seed, args.programs, SurveyProfile(args.template))
+    print(path)
+
+
+if __name__ == '__main__':
+    main()
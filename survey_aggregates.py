@@ -0,0 +1,142 @@
+import os
+import pickle
+import time
+
+import numpy as np
+
+from survey_analytics import BARRIERS, GROUP_KEYS, QUESTIONS, RowView, build_cube, build_index, section_scores
+from survey_data import fingerprint
+from survey_tables import VIEW_TABLES, section_summaries, view_tables
+
+# Bump whenever the contents change shape, including the classes pickled inside
+# (SurveyCube, the tables' columns); older files are then ignored, not misread.
+# 2: every column is read as text, so e.g. numbered sections are no longer ints
+# 3: section summaries carry their answer breakdowns and top answers
+AGGREGATES_VERSION = 3
+
+
+def aggregates_path(csv_path='109.csv', pseudonymized=False):
+    """Where the build step writes the aggregates for ``csv_path``, next to the CSV."""
+    stem = os.path.splitext(csv_path)[0]
+    return f"{stem}-aggregates{'-anon' if pseudonymized else ''}.pkl"
+
+
+class PrebuiltAggregates:
+    """Everything the dashboard shows for the unfiltered survey, built offline from one version of the CSV.
+
+    Reading it costs the same however many responses the survey has (apart from
+    the comment texts), so a cold dashboard can paint before the rows are loaded.
+    ``empty_rows`` is the frame with no rows, for views that list respondents.
+    """
+
+    def __init__(self, source, ingest, unique_barriers, cube, options, tables, sections, word_frequencies,
+                 empty_rows, pseudonym_key_id=None):
+        self.version = AGGREGATES_VERSION
+        self.source = source
+        self.ingest = ingest
+        self.unique_barriers = unique_barriers
+        self.cube = cube
+        self.scores = section_scores(cube)
+        self.options = options
+        self.tables = tables
+        self.sections = sections
+        self.word_frequencies = word_frequencies
+        self.empty_rows = empty_rows
+        self.pseudonym_key_id = pseudonym_key_id
+
+    def values(self, column):
+        """Filter options for ``column``, in the order BitmapIndex.values gives them."""
+        return list(self.options.get(column, []))
+
+
+def build_aggregates(csv_path, state, df, unique_barriers, ingest, pseudonym_key_id=None):
+    """Aggregates of every row of ``df``, as ingested from ``csv_path`` at ``state``.
+
+    Pass the key id when names and emails were pseudonymized.
+    """
+    return _build(csv_path, state, ingest, unique_barriers, build_cube(df, unique_barriers),
+                  build_index(df, unique_barriers), RowView(df, np.arange(len(df))), df.iloc[:0], pseudonym_key_id)
+
+
+def build_streamed_aggregates(csv_path, state, survey, ingest, pseudonym_key_id=None):
+    """Aggregates of a ``survey_stream.StreamedSurvey`` of ``csv_path``; the same as reading it whole.
+
+    Only its comment rows are needed, so the rows never have to be in memory together.
+    """
+    comments = survey.comments()
+    return _build(csv_path, state, ingest, survey.unique_barriers, survey.cube, survey,
+                  RowView(comments, np.arange(len(comments))), survey.empty_rows(), pseudonym_key_id)
+
+
+def _build(csv_path, state, ingest, unique_barriers, cube, options, rows, empty_rows, pseudonym_key_id):
+    # ``options`` gives the filter options through ``values``; ``rows`` needs only what ROW_VIEWS read
+    # Only the build pays for the word-cloud import
+    from survey_wordcloud import word_frequencies
+
+    scores = section_scores(cube)
+    tables = {view: view_tables(view, cube, scores, rows) for view in VIEW_TABLES}
+    comments = tables['comments']['comments']
+    # Keyed like the dashboard's word-cloud cache: None for all comments, else the section
+    frequencies = {None: word_frequencies(comments['Additional_Comments'])}
+    for label, group in comments.groupby('Program_Section', observed=True):
+        frequencies[label] = word_frequencies(group['Additional_Comments'])
+    source = {'path': csv_path, 'size': state[0], 'mtime_ns': state[1], 'sha256': ingest['sha256'],
+              'built': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+    return PrebuiltAggregates(
+        source, ingest, unique_barriers, cube,
+        {column: options.values(column) for column in GROUP_KEYS + QUESTIONS + [BARRIERS]},
+        tables,
+        section_summaries(cube, scores),
+        frequencies, empty_rows, pseudonym_key_id
+    )
+
+
+def write_aggregates(path, aggregates):
+    # Written aside and renamed, so a dashboard never reads a half-written file
+    tmp = f'{path}.tmp-{os.getpid()}'
+    # Writable by the owner only whatever the umask, or read_aggregates would not trust it
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o644)
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(aggregates, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _trusted(f):
+    # Unpickling runs whatever code the file names, so it is only read when it can have come
+    # from this user: owned by them and not writable by anyone else
+    stat = os.fstat(f.fileno())
+    if hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+        return False
+    return not stat.st_mode & 0o022
+
+
+def read_aggregates(path, csv_path, state, pseudonym_key_id=None):
+    """The aggregates at ``path`` if they were built from the current ``csv_path``, else None.
+
+    ``state`` is the CSV's (size, mtime) stamp; the file is only hashed when the
+    stamp moved but the size did not (e.g. after a copy). Aggregates built with a
+    different pseudonym key, or with none when one is expected, are not used.
+
+    The file is a pickle, and loading a pickle can run arbitrary code: whoever can write
+    next to the CSV can run code as the dashboard. It is trusted like the code itself, so
+    it is only read when this user owns it and no one else may write it (``survey_cli.py
+    build`` writes it that way); keep the data directory no more writable than the code.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if not _trusted(f):
+                return None
+            aggregates = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if getattr(aggregates, 'version', None) != AGGREGATES_VERSION:
+        return None
+    if aggregates.pseudonym_key_id != pseudonym_key_id:
+        return None
+    source = aggregates.source
+    if (source['size'], source['mtime_ns']) != tuple(state):
+        if source['size'] != state[0] or fingerprint(csv_path)['sha256'] != source['sha256']:
+            return None
+    return aggregates
@@ -0,0 +1,420 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+from survey_data import barrier_column, choice_dtype, program_section
+from survey_index import BitmapIndex
+
+# Single-choice questions, in survey order
+QUESTIONS = [
+    'Tour_Location_Preference', 'Affordability_Rating', 'Most_Important_Factor',
+    'Previous_Vote_Mattered', 'Non_Student_Factors', 'Manila_Willingness',
+    'Preferred_Package'
+]
+# Multi-select question, fed from the Barrier_* indicator columns
+BARRIERS = 'Barriers'
+QUESTION_LABELS = {
+    'Tour_Location_Preference': 'Location Preference',
+    'Affordability_Rating': 'Affordability',
+    'Most_Important_Factor': 'Most Important Factor',
+    'Previous_Vote_Mattered': 'Previous Vote Mattered',
+    'Non_Student_Factors': 'Non-Student Factors',
+    'Manila_Willingness': 'Manila Willingness',
+    'Preferred_Package': 'Preferred Package',
+    BARRIERS: 'Barriers',
+}
+GROUP_KEYS = ['Program', 'Section']
+CUBE_LEVELS = GROUP_KEYS + ['question', 'answer']
+
+EXPENSIVE = ['Expensive', 'Very Expensive']
+AFFORDABLE = ['Affordable', 'Very Affordable']
+DISSATISFIED = ['Disagree', 'Strongly Disagree']
+SATISFIED = ['Agree', 'Strongly Agree']
+
+
+def _memoized(method):
+    # Cubes are immutable, so derived tables are computed once per cube instance
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__,) + tuple(tuple(a) if isinstance(a, list) else a for a in args)
+        key += tuple(sorted(kwargs.items()))
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = method(self, *args, **kwargs)
+            return value
+    return wrapper
+
+
+def _group_positions(labels):
+    """{label: positions of it in ``labels``, in order}, found with one sort."""
+    codes, uniques = pd.factorize(labels)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))[:-1]
+    return dict(zip(uniques, np.split(order[codes[order] >= 0], bounds)))
+
+
+class SurveyCube:
+    """(Program, Section, question, answer) -> count, plus respondents per section.
+
+    Every count, percentage table and chart in the dashboard is derived from
+    these two small Series, so the row-level frame is only scanned once.
+    ``levels`` holds the answer order of categorical questions (Likert scales
+    first to last); crosstab columns follow it.
+    """
+
+    def __init__(self, counts, totals, levels=None):
+        self.counts = counts
+        self.totals = totals
+        self.levels = levels or {}
+        self._memo = {}
+        labels = program_section(counts.index.get_level_values('Program'),
+                                 counts.index.get_level_values('Section'))
+        self.by_section = counts.set_axis(pd.MultiIndex.from_arrays(
+            [labels, counts.index.get_level_values('question'), counts.index.get_level_values('answer')],
+            names=['Program_Section', 'question', 'answer']
+        ))
+        self.section_totals = totals.set_axis(pd.Index(
+            program_section(totals.index.get_level_values('Program'), totals.index.get_level_values('Section')),
+            name='Program_Section'
+        )).sort_index()
+
+    def __getstate__(self):
+        # Pickles (prebuilt aggregates, process pools) carry only the counts; memoized
+        # tables and per-section cubes are rebuilt on demand
+        return {'counts': self.counts, 'totals': self.totals, 'levels': self.levels}
+
+    def __setstate__(self, state):
+        self.__init__(state['counts'], state['totals'], state['levels'])
+
+    @property
+    def total(self):
+        return int(self.totals.sum())
+
+    def sections(self):
+        return list(self.section_totals.index)
+
+    def nunique(self, key):
+        return self.totals.index.get_level_values(key).nunique()
+
+    def select(self, programs=None, sections=None):
+        """Cube of the rows whose Program/Section are in the given selections."""
+        def keep(index):
+            mask = np.ones(len(index), dtype=bool)
+            if programs is not None:
+                mask &= index.get_level_values('Program').isin(programs)
+            if sections is not None:
+                mask &= index.get_level_values('Section').isin(sections)
+            return mask
+        return SurveyCube(self.counts[keep(self.counts.index)], self.totals[keep(self.totals.index)], self.levels)
+
+    def merge(self, other):
+        """Cube over this cube's rows plus ``other``'s, e.g. responses appended since it was built."""
+        counts = self.counts.add(other.counts, fill_value=0).astype(np.int64)
+        totals = self.totals.add(other.totals, fill_value=0).astype(np.int64)
+        levels = {}
+        for question in set(self.levels) | set(other.levels):
+            answers = self.levels.get(question, []) + other.levels.get(question, [])
+            levels[question] = list(choice_dtype(question, answers).categories)
+        return SurveyCube(counts, totals, levels)
+
+    @_memoized
+    def _section_positions(self):
+        # Each section's cells in counts and rows in totals, grouped once per cube so a
+        # section costs its own size instead of a pass over the whole cube
+        totals_labels = program_section(self.totals.index.get_level_values('Program'),
+                                        self.totals.index.get_level_values('Section'))
+        return (_group_positions(self.by_section.index.get_level_values('Program_Section')),
+                _group_positions(totals_labels))
+
+    @_memoized
+    def section(self, label):
+        """Cube of a single 'Program Section' label."""
+        counts, totals = self._section_positions()
+        none = np.zeros(0, dtype=np.intp)
+        return SurveyCube(self.counts.iloc[counts.get(label, none)], self.totals.iloc[totals.get(label, none)],
+                          self.levels)
+
+    @_memoized
+    def section_value_counts(self, question):
+        """{label: ``section(label).value_counts(question)``} for every section, in one grouped pass.
+
+        Sections where nobody answered ``question`` are left out.
+        """
+        counts = self.by_section[self.by_section.index.get_level_values('question') == question]
+        counts = counts.droplevel('question').groupby(level=['Program_Section', 'answer']).sum()
+        counts = counts[counts > 0]
+        codes, labels = pd.factorize(counts.index.get_level_values('Program_Section'))
+        values = counts.to_numpy()
+        # Most common first within each section; ties keep the answers' sorted order
+        order = np.lexsort((-values, codes))
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        answers = counts.index.get_level_values('answer')
+        return {labels[codes[positions[0]]]: pd.Series(values[positions], index=answers[positions])
+                for positions in np.split(order, bounds) if len(positions)}
+
+    @_memoized
+    def section_counts(self, question, answers=None):
+        """Per-section respondents whose answer is in ``answers`` (any answer if None)."""
+        index = self.by_section.index
+        mask = index.get_level_values('question') == question
+        if answers is not None:
+            mask &= index.get_level_values('answer').isin(answers)
+        counts = self.by_section[mask].groupby(level='Program_Section').sum()
+        return counts.reindex(self.section_totals.index, fill_value=0)
+
+    @_memoized
+    def top_answers(self, question):
+        """Most common answer, its count and share per section; ties go to the first answer alphabetically."""
+        counts = self.by_section[self.by_section.index.get_level_values('question') == question]
+        frame = counts.droplevel('question').rename('count').reset_index()
+        frame = frame.sort_values(['Program_Section', 'count', 'answer'], ascending=[True, False, True])
+        frame = frame.drop_duplicates('Program_Section').set_index('Program_Section')
+        frame['pct'] = frame['count'] / self.section_totals.reindex(frame.index) * 100
+        return frame
+
+    def program_counts(self):
+        return self.totals.groupby(level='Program').sum().sort_values(ascending=False)
+
+    @_memoized
+    def value_counts(self, question):
+        """Like ``df[question].value_counts()``."""
+        counts = self.counts[self.counts.index.get_level_values('question') == question]
+        counts = counts.groupby(level='answer').sum()
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def count(self, question, answers):
+        """Respondents whose answer to ``question`` is one of ``answers``."""
+        counts = self.value_counts(question)
+        return int(counts[counts.index.isin(answers)].sum())
+
+    @_memoized
+    def crosstab(self, question, margins=False):
+        """Like ``pd.crosstab(Program_Section, df[question], margins=margins)``."""
+        counts = self.by_section[self.by_section.index.get_level_values('question') == question]
+        table = counts.droplevel('question').unstack('answer', fill_value=0).sort_index().sort_index(axis=1)
+        if question in self.levels:
+            # Scale order instead of alphabetical, e.g. Very Expensive ... Very Affordable
+            ordered = [answer for answer in self.levels[question] if answer in table.columns]
+            table = table[ordered + [answer for answer in table.columns if answer not in ordered]]
+        table.columns.name = question
+        if margins:
+            table['All'] = table.sum(axis=1)
+            table.loc['All'] = table.sum()
+        return table
+
+    @_memoized
+    def percentages(self, question):
+        """Like ``pd.crosstab(..., normalize='index') * 100``."""
+        table = self.crosstab(question)
+        return table.div(table.sum(axis=1), axis=0) * 100
+
+    @_memoized
+    def melted_percentages(self, question, var_name):
+        """Long-form percentages for stacked Program-Section bar charts."""
+        return self.percentages(question).reset_index().melt(
+            id_vars='Program_Section', var_name=var_name, value_name='Percentage'
+        )
+
+
+def _answer_codes(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def build_cube(df, unique_barriers=()):
+    """Count every (Program, Section, question, answer) combination.
+
+    Each question is counted with one ``np.bincount`` over (section code, answer code)
+    pairs, so categorical answers are never compared as strings.
+    """
+    grouped = df.groupby(GROUP_KEYS, sort=True)
+    totals = grouped.size()
+    # -1 for rows with a missing Program or Section, which groupby leaves out too
+    groups = grouped.ngroup().to_numpy()
+    pairs = [(question,) + _answer_codes(df[question]) + (groups,) for question in QUESTIONS]
+    if len(unique_barriers):
+        # Each ticked checkbox counts as one (Program, Section, 'Barriers', option) answer
+        rows, cols = np.nonzero(df[[barrier_column(b) for b in unique_barriers]].to_numpy())
+        pairs.append((BARRIERS, cols, pd.Index(unique_barriers, dtype=object), groups[rows]))
+
+    keys = {'group': [], 'question': [], 'answer': []}
+    values = []
+    for question, codes, answers, row_groups in pairs:
+        valid = (codes >= 0) & (row_groups >= 0)
+        flat = np.bincount(row_groups[valid] * len(answers) + codes[valid], minlength=len(totals) * len(answers))
+        hits = np.flatnonzero(flat)
+        group, answer = np.divmod(hits, len(answers))
+        keys['group'].append(group)
+        keys['question'].append(np.full(len(hits), question, dtype=object))
+        keys['answer'].append(np.asarray(answers, dtype=object)[answer])
+        values.append(flat[hits])
+    group = np.concatenate(keys['group']).astype(np.intp)
+    index = pd.MultiIndex.from_arrays([
+        totals.index.get_level_values('Program')[group],
+        totals.index.get_level_values('Section')[group],
+        np.concatenate(keys['question']),
+        np.concatenate(keys['answer']),
+    ], names=CUBE_LEVELS)
+    counts = pd.Series(np.concatenate(values).astype(np.int64), index=index).sort_index()
+    levels = {question: list(df[question].cat.categories)
+              for question in QUESTIONS if isinstance(df[question].dtype, pd.CategoricalDtype)}
+    return SurveyCube(counts, totals, levels)
+
+
+def sum_cubes(cubes):
+    """Cube over the rows of all ``cubes``; equal to build_cube of their frames concatenated."""
+    counts = pd.concat([cube.counts for cube in cubes]).groupby(level=CUBE_LEVELS, sort=True).sum()
+    totals = pd.concat([cube.totals for cube in cubes]).groupby(level=GROUP_KEYS, sort=True).sum()
+    levels = {}
+    for question in set().union(*(cube.levels for cube in cubes)):
+        answers = [answer for cube in cubes for answer in cube.levels.get(question, [])]
+        levels[question] = list(choice_dtype(question, answers).categories)
+    return SurveyCube(counts.astype(np.int64), totals.astype(np.int64), levels)
+
+
+def section_scores(cube):
+    """Numeric sentiment inputs and 0-100 scores for every section, one row per Program_Section.
+
+    Everything is computed column-wise from the cube; turn values into text only when displaying.
+    """
+    scores = pd.DataFrame({
+        'total': cube.section_totals,
+        'expensive': cube.section_counts('Affordability_Rating', EXPENSIVE),
+        'affordable': cube.section_counts('Affordability_Rating', AFFORDABLE),
+        'definitely_willing': cube.section_counts('Manila_Willingness', ['Yes, definitely']),
+        'probably_willing': cube.section_counts('Manila_Willingness', ['Yes, probably']),
+        'dissatisfied': cube.section_counts('Previous_Vote_Mattered', DISSATISFIED),
+        'satisfied': cube.section_counts('Previous_Vote_Mattered', SATISFIED),
+        'believes_external': cube.section_counts('Non_Student_Factors', ['Yes']),
+        'barriers_reported': cube.section_counts(BARRIERS),
+    })
+    scores['positive_willing'] = scores['definitely_willing'] + scores['probably_willing']
+    for column in ['expensive', 'affordable', 'definitely_willing', 'positive_willing',
+                   'dissatisfied', 'satisfied', 'believes_external']:
+        scores[f'{column}_pct'] = scores[column] / scores['total'] * 100
+    scores['financial'] = (scores['total'] - scores['expensive']) / scores['total'] * 100
+    scores['participation'] = scores['definitely_willing'] / scores['total'] * 100
+    scores['process'] = (scores['total'] - scores['dissatisfied']) / scores['total'] * 100
+    scores['overall'] = (scores['financial'] + scores['participation'] + scores['process']) / 3
+    return scores
+
+
+class Selection:
+    """Row positions and derived aggregates for one normalized sidebar selection."""
+
+    def __init__(self, positions, cube):
+        self.positions = positions
+        self.cube = cube
+        self.scores = section_scores(cube)
+
+
+class RowView:
+    """Read-only rows of ``df`` at ``positions``, without copying the frame.
+
+    A column is gathered the first time it is read, and not at all when every row
+    is selected, so a view only pays for the few columns it displays.
+    """
+
+    def __init__(self, df, positions):
+        self.df = df
+        self.positions = positions
+        self.everything = len(positions) == len(df)
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, column):
+        if column not in self._columns:
+            values = self.df[column]
+            self._columns[column] = values if self.everything else values.iloc[self.positions]
+        return self._columns[column]
+
+    def nonblank(self, column):
+        """Mask (aligned with the view) of the rows whose ``column`` holds more than whitespace."""
+        text = self[column]
+        return text.notna() & (text.str.strip() != '')
+
+    def rows(self, mask, columns):
+        """Frame of ``columns`` for the rows where ``mask`` (aligned with the view) is True."""
+        if isinstance(mask, pd.Series):
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+        return self.df.iloc[self.positions[mask], self.df.columns.get_indexer(columns)]
+
+    def memory(self):
+        """Bytes gathered for this view so far; zero when it reads the frame itself."""
+        if self.everything:
+            return 0
+        return int(sum(values.memory_usage(index=False, deep=True) for values in self._columns.values()))
+
+
+def build_index(df, unique_barriers):
+    """Bitmap index over Program, Section, every question and every barrier option."""
+    return BitmapIndex.build(df, GROUP_KEYS + QUESTIONS,
+                             {BARRIERS: {barrier: barrier_column(barrier) for barrier in unique_barriers}})
+
+
+def selection_key(programs, sections, answers=None, match_all=True):
+    """Order-insensitive key for a sidebar selection."""
+    answers = tuple(sorted(
+        (column, tuple(sorted(map(str, values)))) for column, values in (answers or {}).items() if len(values)
+    ))
+    return tuple(sorted(map(str, programs))), tuple(sorted(map(str, sections))), answers, match_all
+
+
+def select(df, unique_barriers, cube, index, programs, sections, answers=None, match_all=True):
+    """Rows and aggregates for a selection, found with bitwise ops on the bitmap index.
+
+    ``answers`` maps questions (or BARRIERS) to accepted answers; answers within a
+    question are OR'ed and questions are AND'ed, or OR'ed when ``match_all`` is False.
+    """
+    bits = index.match({'Program': programs, 'Section': sections})
+    answers = {column: values for column, values in (answers or {}).items() if len(values)}
+    if not answers:
+        return Selection(index.positions(bits), cube.select(programs, sections))
+    np.bitwise_and(bits, index.match(answers, match_all), out=bits)
+    positions = index.positions(bits)
+    # Answer filters cut across sections, so this selection gets its own cube
+    return Selection(positions, build_cube(df.iloc[positions], unique_barriers))
+
+
+def _classify(values, conditions, labels, default):
+    return pd.Series(np.select(conditions, labels, default), index=values.index, dtype=object)
+
+
+def affordability_labels(expensive_pct):
+    return _classify(expensive_pct, [expensive_pct > 50, expensive_pct > 25],
+                     ['😟 Concerned', '😐 Mixed'], '😊 Positive')
+
+
+def confidence_labels(dissatisfied_pct):
+    return _classify(dissatisfied_pct, [dissatisfied_pct > 50, dissatisfied_pct > 25],
+                     ['😟 Low Confidence', '😐 Mixed Confidence'], '😊 High Confidence')
+
+
+def trust_labels(believes_external_pct):
+    return _classify(believes_external_pct, [believes_external_pct > 60, believes_external_pct > 30],
+                     ['😟 Low Trust', '😐 Mixed Trust'], '😊 High Trust')
+
+
+def willingness_labels(definitely_pct, positive_pct):
+    return _classify(definitely_pct, [definitely_pct > 60, positive_pct > 60, positive_pct > 40],
+                     ['😊 Very Positive', '🙂 Positive', '😐 Mixed'], '😟 Concerning')
+
+
+def sentiment_labels(overall):
+    return _classify(overall, [overall >= 70, overall >= 50, overall >= 30],
+                     ['😊 Very Positive', '🙂 Positive', '😐 Mixed'], '😟 Concerning')
+
+
+def count_pct(counts, pcts):
+    """Display helper: "12 (34.5%)" for aligned count/percentage Series."""
+    return counts.astype(int).astype(str) + ' (' + pcts.map('{:.1f}%'.format).astype(str) + ')'
+
+
+def pct_text(values):
+    """Display helper: "34.5%" for a percentage Series."""
+    return values.map('{:.1f}%'.format).astype(str)
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache with hit/miss counters.
+
+    Concurrent misses on the same key compute it once; the other callers wait for
+    that result instead of repeating the work.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._computing = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            computing = self._computing.get(key)
+            if computing is None:
+                self.misses += 1
+                done = self._computing[key] = threading.Event()
+        if computing is not None:
+            computing.wait()
+            # Usually a hit now; if that compute failed or was already evicted, try again
+            return self.get(key, compute)
+        # Compute outside the lock so one slow miss does not block other keys
+        try:
+            value = compute()
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        finally:
+            with self._lock:
+                del self._computing[key]
+            done.set()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,326 @@
+"""Compute the dashboard's tables without Streamlit and write them to files.
+
+    python survey_cli.py tables -o out                      # every view, as JSON
+    python survey_cli.py tables --views barriers sentiment --format parquet
+    python survey_cli.py --program BSCS --section A tables  # one Program-Section
+    python survey_cli.py sections -o out                    # per-section report numbers
+    python survey_cli.py wordfreq -o out                    # comment word frequencies
+    python survey_cli.py search '"boat ride"' visa*         # out/search/: matching comments per section
+    python survey_cli.py build                              # 109-aggregates.pkl for the dashboard
+    python survey_cli.py reports --format html pdf          # out/reports/<section>.html|pdf
+    python survey_cli.py --csv 2025-2.csv ingest            # add a semester to survey.db
+    python survey_cli.py --csv big.csv build --chunksize 100000   # stream a CSV too large to load
+    python survey_cli.py --waves 'waves/*.csv' tables       # every term's export as one survey
+    python survey_cli.py --waves 'waves/*.csv' compare      # out/waves/: changes between the waves
+
+Each export writes out/<view>/<table>.<format> (or one JSON file) plus out/manifest.json
+naming the source file's hash, row count and filters. ``build`` writes the prebuilt
+aggregates the dashboard paints from before it has loaded the rows; ``ingest`` adds the
+CSV to the embedded database the dashboards query when SURVEY_DATABASE names it.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def pseudonymizer(key, cache_dir):
+    """SurveyStore ``prepare`` hook replacing names and emails, as the anonymized dashboard does.
+
+    One table serves every load and chunk of the run, so each distinct name is hashed once.
+    """
+    from survey_pseudonym import PseudonymTable, discard_stored_table
+
+    discard_stored_table(cache_dir)
+    pseudonyms = PseudonymTable(key)
+
+    def prepare(df):
+        # Streamed builds pass just the comment rows, which have no emails
+        for column in ['Name', 'Email']:
+            if column in df:
+                df[column] = pseudonyms.pseudonymize(df[column], column)
+        return df
+
+    return prepare
+
+
+def load(args):
+    """The loaded survey (a DataVersion) and the selection for the command-line filters."""
+    from survey_analytics import select
+    from survey_data import file_state
+    from survey_store import SurveyStore
+    from survey_waves import waves_state
+
+    prepare = pseudonymizer(args.key, args.cache_dir) if args.pseudonymize else None
+    store = SurveyStore(args.csv, args.cache_dir, lean=True, prepare=prepare, waves=args.waves)
+    data = store.get(waves_state(args.waves) if args.waves else file_state(args.csv))
+    programs = args.program or data.index.values('Program')
+    sections = args.section or data.index.values('Section')
+    return data, select(data.df, data.unique_barriers, data.cube, data.index, programs, sections)
+
+
+def write_table(table, path, fmt):
+    # Crosstabs keep their row labels in a named index and may have non-string column names;
+    # row tables keep the source row numbers in an unnamed one, which is dropped
+    if any(name is not None for name in table.index.names):
+        table = table.reset_index()
+    table.columns = [str(column) for column in table.columns]
+    if fmt == 'parquet':
+        table.to_parquet(path, index=False)
+    else:
+        table.to_json(path, orient='records', force_ascii=False, indent=1)
+
+
+def write_json(value, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False, indent=1, default=_plain)
+
+
+def _plain(value):
+    """JSON fallback for numpy scalars."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def cmd_tables(args, data, selection):
+    from survey_analytics import RowView
+    from survey_tables import VIEW_TABLES, view_tables
+
+    rows = RowView(data.df, selection.positions)
+    written = []
+    for view in args.views or list(VIEW_TABLES):
+        os.makedirs(os.path.join(args.output, view), exist_ok=True)
+        for name, table in view_tables(view, selection.cube, selection.scores, rows).items():
+            path = os.path.join(args.output, view, f'{name}.{args.format}')
+            write_table(table, path, args.format)
+            written.append(os.path.relpath(path, args.output))
+    return written
+
+
+def cmd_sections(args, data, selection):
+    from survey_tables import section_summaries
+
+    report = {}
+    for label, summary in section_summaries(selection.cube, selection.scores).items():
+        summary['counts'] = {question: counts.to_dict() for question, counts in summary['counts'].items()}
+        summary['scores'] = summary['scores'].to_dict()
+        report[label] = summary
+    write_json(report, os.path.join(args.output, 'sections.json'))
+    return ['sections.json']
+
+
+def cmd_wordfreq(args, data, selection):
+    # Imports matplotlib through wordcloud, so only this command pays for it
+    from survey_analytics import RowView
+    from survey_wordcloud import word_frequencies
+
+    rows = RowView(data.df, selection.positions)
+    comments = rows.rows(rows.nonblank('Additional_Comments'), ['Program_Section', 'Additional_Comments'])
+    frequencies = {'All': word_frequencies(comments['Additional_Comments'])}
+    for label, group in comments.groupby('Program_Section', observed=True):
+        frequencies[label] = word_frequencies(group['Additional_Comments'])
+    write_json(frequencies, os.path.join(args.output, 'wordfreq.json'))
+    return ['wordfreq.json']
+
+
+def cmd_search(args, data, selection):
+    from survey_analytics import RowView
+    from survey_tables import comment_search_tables
+
+    os.makedirs(os.path.join(args.output, 'search'), exist_ok=True)
+    rows = RowView(data.df, selection.positions)
+    written = []
+    for name, table in comment_search_tables(data.comments, rows, ' '.join(args.query)).items():
+        path = os.path.join(args.output, 'search', f'{name}.{args.format}')
+        write_table(table, path, args.format)
+        written.append(os.path.relpath(path, args.output))
+    return written
+
+
+def cmd_build(args, data, selection):
+    from survey_aggregates import aggregates_path, build_aggregates, write_aggregates
+    from survey_pseudonym import pseudonym_key_id
+
+    path = args.aggregates or aggregates_path(args.csv, args.pseudonymize)
+    key_id = pseudonym_key_id(args.key) if args.pseudonymize else None
+    write_aggregates(path, build_aggregates(args.csv, data.state, data.df, data.unique_barriers, data.ingest, key_id))
+    print(path)
+
+
+def cmd_build_streamed(args):
+    # Reads the CSV chunk by chunk instead of loading it, for files too large to hold
+    from survey_aggregates import aggregates_path, build_streamed_aggregates, write_aggregates
+    from survey_data import file_state, fingerprint
+    from survey_pseudonym import pseudonym_key_id
+    from survey_stream import stream_survey
+
+    path = args.aggregates or aggregates_path(args.csv, args.pseudonymize)
+    key_id = pseudonym_key_id(args.key) if args.pseudonymize else None
+    # Stamped before reading, so a CSV written meanwhile looks stale rather than current
+    state = file_state(args.csv)
+    sha256 = fingerprint(args.csv)['sha256']
+    prepare = pseudonymizer(args.key, args.cache_dir) if args.pseudonymize else None
+    survey = stream_survey(args.csv, args.chunksize, prepare=prepare)
+    ingest = {'sha256': sha256, 'rows': survey.rows, 'last_timestamp': survey.last_timestamp,
+              'base_sha256': None, 'base_rows': None}
+    write_aggregates(path, build_streamed_aggregates(args.csv, state, survey, ingest, key_id))
+    print(path)
+
+
+def cmd_ingest(args, data, selection):
+    from survey_sql import SurveyDatabase
+
+    database = SurveyDatabase(args.database, create=True)
+    source = args.source or os.path.basename(args.csv)
+    if database.ingest(source, data.df, data.unique_barriers, data.cube, data.ingest, args.csv):
+        print(f'{args.database}: {source} holds {len(data.df)} responses')
+    else:
+        print(f'{args.database}: {source} is unchanged')
+
+
+def cmd_ingest_streamed(args):
+    from survey_sql import SurveyDatabase
+
+    database = SurveyDatabase(args.database, create=True)
+    source = args.source or os.path.basename(args.csv)
+    survey = database.ingest_csv(source, args.csv, args.chunksize)
+    if survey is not None:
+        print(f'{args.database}: {source} holds {survey.rows} responses')
+    else:
+        print(f'{args.database}: {source} is unchanged')
+
+
+def cmd_reports(args, data, selection):
+    from survey_aggregates import aggregates_path, read_aggregates
+    from survey_pseudonym import pseudonym_key_id
+    from survey_reports import generate_reports, section_tasks
+
+    prebuilt = None
+    if not (args.program or args.section or args.waves):
+        # Summaries and word frequencies of an up-to-date build are reused as they are
+        key_id = pseudonym_key_id(args.key) if args.pseudonymize else None
+        prebuilt = read_aggregates(aggregates_path(args.csv, args.pseudonymize), args.csv, data.state, key_id)
+    out_dir = os.path.join(args.output, 'reports')
+    tasks = section_tasks(data.df, selection.positions, selection.cube, selection.scores, prebuilt)
+    written = generate_reports(tasks, selection.cube, selection.scores, out_dir, args.format, args.workers,
+                               args.plotlyjs)
+    return [os.path.relpath(path, args.output) for path in written]
+
+
+def cmd_compare(args, data, selection):
+    from survey_tables import wave_tables
+    from survey_waves import select_waves
+
+    programs = args.program or data.index.values('Program')
+    sections = args.section or data.index.values('Section')
+    waves = select_waves(data.df, data.unique_barriers, data.wave_cubes, selection.positions, programs, sections)
+    if args.compare:
+        waves = {wave: scores for wave, scores in waves.items() if wave in args.compare}
+    os.makedirs(os.path.join(args.output, 'waves'), exist_ok=True)
+    written = []
+    for name, table in wave_tables(waves, args.base, args.target).items():
+        path = os.path.join(args.output, 'waves', f'{name}.{args.format}')
+        write_table(table, path, args.format)
+        written.append(os.path.relpath(path, args.output))
+    return written
+
+
+COMMANDS = {'tables': cmd_tables, 'sections': cmd_sections, 'wordfreq': cmd_wordfreq, 'reports': cmd_reports,
+            'compare': cmd_compare, 'search': cmd_search}
+
+
+def main(argv=None):
+    from survey_data import CACHE_DIR
+    from survey_tables import VIEW_TABLES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default='109.csv', help='survey export to read (default: 109.csv)')
+    parser.add_argument('--waves', metavar='PATTERN',
+                        help="read every CSV matching this glob as one wave instead of --csv, e.g. 'waves/*.csv'")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--program', action='append', help='only this program; repeat for more (default: all)')
+    parser.add_argument('--section', action='append', help='only this section; repeat for more (default: all)')
+    parser.add_argument('--pseudonymize', action='store_true', help='replace names and emails with pseudonyms')
+    parser.add_argument('-o', '--output', default='out')
+    commands = parser.add_subparsers(dest='command', required=True)
+    tables = commands.add_parser('tables', help="every view's tables")
+    tables.add_argument('--views', nargs='+', choices=list(VIEW_TABLES))
+    tables.add_argument('--format', choices=['json', 'parquet'], default='json')
+    commands.add_parser('sections', help='per-section report numbers, labels and insights')
+    commands.add_parser('wordfreq', help='comment word frequencies, overall and per section')
+    search = commands.add_parser('search', help='comments matching a query, and matches per section')
+    search.add_argument('query', nargs='+', help='words (all must appear), "quoted phrases", prefixes like visa* and -excluded words')
+    search.add_argument('--format', choices=['json', 'parquet'], default='json')
+    reports = commands.add_parser('reports', help='Program-Section report files, rendered in parallel')
+    reports.add_argument('--format', nargs='+', choices=['html', 'pdf'], default=['html'])
+    reports.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    reports.add_argument('--plotlyjs', choices=['directory', 'cdn', 'inline'], default='directory',
+                         help='plotly.js: one shared file next to the reports, from a CDN, or inside every file')
+    compare = commands.add_parser('compare', help='wave-over-wave scores, trends and changes (needs --waves)')
+    compare.add_argument('--compare', nargs='+', metavar='WAVE', help='only these waves (default: all)')
+    compare.add_argument('--base', help='wave the changes are measured from (default: the first)')
+    compare.add_argument('--target', help='wave the changes are measured to (default: the last)')
+    compare.add_argument('--format', choices=['json', 'parquet'], default='json')
+    build = commands.add_parser('build', help='prebuilt aggregates for a fast dashboard start')
+    build.add_argument('--aggregates', help='file to write (default: next to the CSV, e.g. 109-aggregates.pkl)')
+    build.add_argument('--chunksize', type=int, help='stream the CSV this many rows at a time instead of loading it')
+    ingest = commands.add_parser('ingest', help='add the CSV to an embedded database, replacing its earlier version')
+    ingest.add_argument('--database', default='survey.db', help='SQLite file, created if missing (default: survey.db)')
+    ingest.add_argument('--source', help='name of the CSV in the database, e.g. 2025-2 (default: its file name)')
+    ingest.add_argument('--chunksize', type=int, help='stream the CSV this many rows at a time instead of loading it')
+    args = parser.parse_args(argv)
+    if args.command in ('build', 'ingest') and (args.program or args.section):
+        parser.error(f'{args.command} always covers every response; drop --program/--section')
+    if args.command in ('build', 'ingest') and args.waves:
+        parser.error(f'{args.command} works on one CSV at a time; pass each wave with --csv')
+    if args.command == 'compare' and not args.waves:
+        parser.error('compare needs the wave files: pass --waves')
+    if args.command == 'ingest' and args.pseudonymize:
+        parser.error('ingest stores the responses as they are; the anonymized dashboard pseudonymizes what it reads')
+    if args.pseudonymize:
+        # Same key as the anonymized dashboard when it comes from SURVEY_PSEUDONYM_KEY or the key file
+        from survey_pseudonym import pseudonym_key
+        args.key = pseudonym_key(cache_dir=args.cache_dir)
+
+    if getattr(args, 'chunksize', None):
+        return (cmd_build_streamed if args.command == 'build' else cmd_ingest_streamed)(args)
+    start = time.perf_counter()
+    data, selection = load(args)
+    if args.command == 'compare':
+        # Wave names are only known once the files are found
+        waves = list(data.wave_cubes)
+        unknown = [wave for wave in args.compare or () if wave not in waves]
+        if unknown:
+            parser.error(f"--compare: no wave {', '.join(map(repr, unknown))}; the waves are {', '.join(waves)}")
+        compared = [wave for wave in waves if not args.compare or wave in args.compare]
+        for option in ('base', 'target'):
+            wave = getattr(args, option)
+            if wave is not None and wave not in compared:
+                parser.error(f"--{option}: {wave!r} is not one of the compared waves ({', '.join(compared)})")
+    if args.command == 'build':
+        # Written next to the CSV, where the dashboard looks, not into the output directory
+        return cmd_build(args, data, selection)
+    if args.command == 'ingest':
+        return cmd_ingest(args, data, selection)
+    ingest = data.ingest
+    os.makedirs(args.output, exist_ok=True)
+    written = COMMANDS[args.command](args, data, selection)
+    write_json({
+        'command': args.command,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'source': {'path': args.waves or args.csv, 'sha256': ingest['sha256'], 'rows': ingest['rows'],
+                   'last_timestamp': ingest['last_timestamp']},
+        'filters': {'program': args.program, 'section': args.section},
+        'respondents': len(selection.positions),
+        'seconds': round(time.perf_counter() - start, 3),
+        'files': written,
+    }, os.path.join(args.output, 'manifest.json'))
+    print(os.path.join(args.output, 'manifest.json'))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
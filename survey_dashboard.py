@@ -0,0 +1,1277 @@
+import os
+import warnings
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import seaborn as sns
+import streamlit as st
+
+from survey_aggregates import aggregates_path, read_aggregates
+from survey_analytics import BARRIERS, QUESTION_LABELS, QUESTIONS, RowView, select, selection_key
+from survey_cache import LRUCache
+from survey_data import barrier_column, file_state
+from survey_pseudonym import pseudonym_key_id
+from survey_search import CommentIndex, highlight
+from survey_sql import SqlRowView, SurveyDatabase
+from survey_store import SurveyStore
+from survey_tables import (
+    WAVE_METRICS, comment_search_tables, section_summary, sentiment_overview, view_tables, wave_tables
+)
+from survey_watch import FileWatcher, PatternWatcher
+from survey_waves import select_waves, waves_state
+from survey_wordcloud import WordCloudCache
+warnings.filterwarnings('ignore')
+
+# The page of both dashboards: data loading, sidebar filters and every view. The scripts
+# only call run(); educTanon_dashboard.py passes a pseudonym hook, the one difference
+
+# Names, emails, timestamps and comments as Arrow strings instead of Python str objects;
+# set to False to get plain object columns back
+LEAN_TEXT = True
+
+# Every semester's responses in an embedded database (`python survey_cli.py ingest`) instead of
+# 109.csv: filters and aggregates then run in SQLite and only their results reach pandas
+DATABASE_PATH = os.environ.get('SURVEY_DATABASE')
+# One export per term, e.g. SURVEY_WAVES='waves/*.csv': every matching file is loaded (in parallel)
+# as one wave of a single survey instead of 109.csv. Ignored when SURVEY_DATABASE is set
+WAVES_PATTERN = os.environ.get('SURVEY_WAVES') if not DATABASE_PATH else None
+# The file (or wave files) whose changes reload the data
+DATA_PATH = DATABASE_PATH or WAVES_PATTERN or '109.csv'
+
+def pseudonymize(df, table):
+    # Keyed (HMAC) pseudonyms for names and emails; a database fetch may have neither column
+    for column in ['Name', 'Email']:
+        if column in df.columns:
+            df[column] = table.pseudonymize(df[column], column)
+    return df
+
+# Load and process data
+@st.cache_resource
+def survey_store(key_id=None, _pseudonyms=None):
+    # One read-only copy of the rows, cube and bitmap index for every session in this process
+    # (st.cache_data would unpickle a copy per session). get(data_state) reloads when 109.csv
+    # changes: from the memory-mapped snapshot unless the content really differs, and when
+    # rows were only appended it parses just those and merges them into the cube. With a
+    # pseudonym table (one store per key) names and emails are pseudonymized before the
+    # frame is shared
+    prepare = None if _pseudonyms is None else lambda df: pseudonymize(df, _pseudonyms)
+    return SurveyStore('109.csv', lean=LEAN_TEXT, prepare=prepare, waves=WAVES_PATTERN)
+
+# Aggregates built offline with `python survey_cli.py build` (`--pseudonymize build` for the
+# anonymized dashboard); used only when they match 109.csv and were made with the same key
+@st.cache_resource(max_entries=1)
+def prebuilt_aggregates(state, key_id=None):
+    path = aggregates_path('109.csv', pseudonymized=key_id is not None)
+    return read_aggregates(path, '109.csv', state, key_id)
+
+@st.cache_resource
+def survey_database():
+    # Opened once per process; every session's thread queries it through its own connection
+    return SurveyDatabase(DATABASE_PATH)
+
+# Most recently used filter selections kept in memory (rows + aggregates each)
+SELECTION_CACHE_SIZE = 32
+
+@st.cache_resource
+def selection_cache():
+    # Shared by all sessions: an entry depends only on the data version and the selection
+    return LRUCache(maxsize=SELECTION_CACHE_SIZE)
+
+# Word cloud frequencies and PNGs kept per (selection, section)
+WORDCLOUD_CACHE_SIZE = 64
+
+@st.cache_resource
+def wordcloud_cache():
+    return WordCloudCache(maxsize=WORDCLOUD_CACHE_SIZE)
+
+# Seconds of quiet before a burst of writes to 109.csv counts as one change
+DATA_WATCH_DEBOUNCE = 2.0
+# How often each open page compares its data version with the watcher's
+DATA_REFRESH_SECONDS = 5
+
+@st.cache_resource
+def data_watcher():
+    # One watcher per server process; it clears only what was derived from the data
+    selections, wordclouds = selection_cache(), wordcloud_cache()
+
+    def invalidate(state):
+        # The store reloads by itself once sessions ask for the new stamp
+        selections.clear()
+        wordclouds.clear()
+
+    # A wave added, removed or rewritten is a change too
+    watcher = PatternWatcher if WAVES_PATTERN else FileWatcher
+    return watcher(DATA_PATH, on_change=invalidate, debounce=DATA_WATCH_DEBOUNCE).start()
+
+# Compares two integers every few seconds; only a settled change to 109.csv reruns the page,
+# or rows finishing their background load when the page was painted without them
+@st.fragment(run_every=DATA_REFRESH_SECONDS)
+def refresh_on_data_change(store, seen_version, pending_state):
+    if data_watcher().version != seen_version:
+        st.rerun()
+    if pending_state is not None and store.loaded(pending_state) is not None:
+        st.rerun()
+
+class Page:
+    """One rerun's selection as the views read it: its cube, scores, rows and tables."""
+
+    def __init__(self, cube, scores, rows, filter_key, data=None, selection=None, prebuilt=None, filters=()):
+        self.cube = cube
+        self.scores = scores
+        # RowView, or SqlRowView with SURVEY_DATABASE; empty while prebuilt results are shown
+        self.rows = rows
+        self.filter_key = filter_key
+        # The loaded DataVersion and the selection's positions in it, when the rows are loaded
+        self.data = data
+        self.selection = selection
+        # Prebuilt aggregates, when they are what this (unfiltered) selection shows
+        self.prebuilt = prebuilt
+        # (programs, sections, answer filters) chosen in the sidebar
+        self.filters = filters
+        # Several wave files loaded (SURVEY_WAVES): views can compare them
+        self.comparing_waves = data is not None and data.wave_cubes is not None
+
+    def tables(self, view):
+        # The unfiltered tables were computed by the build step; any other selection's come from its cube
+        if self.prebuilt is not None:
+            return self.prebuilt.tables[view]
+        return view_tables(view, self.cube, self.scores, self.rows)
+
+    def summary(self, label):
+        if self.prebuilt is not None:
+            return self.prebuilt.sections[label]
+        return section_summary(self.cube, self.scores, label)
+
+    def frequencies(self, label=None):
+        # Word-cloud frequencies of all comments (None) or one section's, when prebuilt
+        return self.prebuilt.word_frequencies.get(label) if self.prebuilt is not None else None
+
+    def wave_scores(self):
+        # {wave: (cube, scores)} of this selection, cached next to it: choosing which waves to
+        # compare only picks entries out of it, and Program/Section selections never read rows
+        return selection_cache().get(
+            self.filter_key + ('waves',),
+            lambda: select_waves(self.data.df, self.data.unique_barriers, self.data.wave_cubes,
+                                 self.selection.positions, *self.filters)
+        )
+
+# Each tab is a function so that lazy mode only runs the one being viewed
+def show_overview(page):
+    st.header("📊 Overview: Survey Questions & Analysis")
+    
+    st.markdown("""
+    ### 📋 Survey Questions Asked:
+    
+    1. **Where do you personally want to have the educational tour?** → *Location Preference Tab*
+    2. **How would you rate the affordability of the Manila package (PHP 22,000) for you and your family?** → *Affordability Tab*
+    3. **If given a choice, which factor is MOST important in your tour decision?** → *Important Factors Tab*
+    4. **Do you feel your previous vote for the tour location/package mattered, given that we are now re-evaluating the options?** → *Voting Power Tab*
+    5. **Is the re-evaluation of the location/package happening now because it was affected on factors other than student preference?** → *Non-Student Factors Tab*
+    6. **If Manila remains the final destination, are you still willing and able to join the educational tour?** → *Manila Willingness Tab*
+    7. **What are the biggest barriers for you to join the tour as currently planned? (Check all that apply)** → *Barriers Tab*
+    8. **Do you have any additional comments or suggestions regarding the tour destination, package, or decision process?** → *Comments Tab*
+    9. **Select the package you prefer:** → *Preferred Package Tab*
+    
+    *📈 Overall sentiment analysis available in the Sentiment Analysis Tab*
+    """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        program_counts = page.tables('overview')['program_counts']
+        fig = px.bar(program_counts, x='Program', y='Count', title='Responses by Program', 
+                     color='Program', color_discrete_sequence=px.colors.qualitative.Set3)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        with st.expander("Show Voters by Program-Section"):
+            for ps in page.cube.sections():
+                st.write(f"**{ps}:**")
+                voters = page.rows.rows(page.rows['Program_Section'] == ps, ['Name', 'Email'])
+                st.dataframe(voters, use_container_width=True)
+
+def show_location(page):
+    st.header("🗺️ Tour Location Preference")
+    st.markdown("**Question:** Where do you personally want to have the educational tour?")
+    
+    tables = page.tables('location')
+    location_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.pie(location_counts, values='Count', names='Location', title='Location Preference Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(location_counts, x='Location', y='Count', title='Location Preference Count')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown Table
+    st.subheader("📊 Breakdown by Program-Section")
+    
+    # Create crosstab for detailed breakdown
+    location_breakdown = tables['breakdown']
+    st.dataframe(location_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    location_pct_breakdown = tables['percentages']
+    st.subheader("📈 Percentage Breakdown by Program-Section")
+    st.dataframe(location_pct_breakdown, use_container_width=True)
+    
+    # Visual breakdown
+    loc_by_program_section = tables['by_section']
+    fig = px.bar(loc_by_program_section, x='Program_Section', y='Percentage', color='Location', barmode='stack',
+                 title='Location Preference by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Location and Program-Section"):
+        for loc in location_counts['Location']:
+            st.write(f"**{loc}:**")
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows['Tour_Location_Preference'] == loc) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_affordability(page):
+    st.header("💸 Affordability Analysis")
+    st.markdown("**Question:** How would you rate the affordability of the Manila package (PHP 22,000) for you and your family?")
+    
+    tables = page.tables('affordability')
+    affordability_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(affordability_counts, x='Rating', y='Count', title='Affordability Rating Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.pie(affordability_counts, values='Count', names='Rating', title='Affordability Rating Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    
+    # Create crosstab for detailed breakdown
+    afford_breakdown = tables['breakdown']
+    st.dataframe(afford_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    afford_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(afford_pct_breakdown, use_container_width=True)
+    
+    # Affordability sentiment summary
+    st.subheader("📈 Affordability Sentiment by Program-Section")
+    afford_sentiment_df = tables['sentiment']
+    st.dataframe(afford_sentiment_df, use_container_width=True)
+    
+    # Visual breakdown
+    afford_by_program_section = tables['by_section']
+    fig = px.bar(afford_by_program_section, x='Program_Section', y='Percentage', color='Rating', barmode='stack',
+                 title='Affordability Rating by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Affordability and Program-Section"):
+        for rating in affordability_counts['Rating']:
+            st.write(f"**{rating}:**")
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows['Affordability_Rating'] == rating) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_factors(page):
+    st.header("🏆 Most Important Tour Factors")
+    st.markdown("**Question:** If given a choice, which factor is MOST important in your tour decision?")
+    
+    tables = page.tables('factors')
+    factor_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(factor_counts, x='Count', y='Factor', orientation='h', title='Most Important Factors')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.pie(factor_counts, values='Count', names='Factor', title='Factor Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    
+    # Create crosstab for detailed breakdown
+    factors_breakdown = tables['breakdown']
+    st.dataframe(factors_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    factors_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(factors_pct_breakdown, use_container_width=True)
+    
+    # Priority analysis by program-section
+    st.subheader("🎯 Priority Analysis by Program-Section")
+    priority_df = tables['priority']
+    st.dataframe(priority_df, use_container_width=True)
+    
+    # Visual breakdown
+    factors_by_program_section = tables['by_section']
+    fig = px.bar(factors_by_program_section, x='Program_Section', y='Percentage', color='Factor', barmode='stack',
+                 title='Important Factors by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Factor and Program-Section"):
+        for factor in factor_counts['Factor']:
+            st.write(f"**{factor}:**")
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows['Most_Important_Factor'] == factor) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_voting(page):
+    st.header("🗳️ Voting Power Perception")
+    st.markdown("**Question:** Do you feel your previous vote for the tour location/package mattered, given that we are now re-evaluating the options?")
+    
+    tables = page.tables('voting')
+    voting_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(voting_counts, x='Response', y='Count', title='Vote Mattered Perception')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.pie(voting_counts, values='Count', names='Response', title='Vote Perception Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    # Create crosstab for detailed breakdown
+    voting_breakdown = tables['breakdown']
+    st.dataframe(voting_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    voting_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(voting_pct_breakdown, use_container_width=True)
+    
+    # Voting confidence analysis
+    st.subheader("📈 Voting Confidence by Program-Section")
+    voting_confidence_df = tables['confidence']
+    st.dataframe(voting_confidence_df, use_container_width=True)
+    
+    # Visual breakdown
+    voting_by_program_section = tables['by_section']
+    fig = px.bar(voting_by_program_section, x='Program_Section', y='Percentage', color='Response', barmode='stack',
+                 title='Voting Power Perception by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Voting Perception"):
+        for response in voting_counts['Response']:
+            st.write(f"**{response}:**")
+            voters = page.rows.rows(page.rows['Previous_Vote_Mattered'] == response, ['Name', 'Email', 'Program', 'Section'])
+            st.dataframe(voters, use_container_width=True)
+
+def show_non_student_factors(page):
+    st.header("⚖️ Non-Student Factors Perception")
+    st.markdown("**Question:** Is the re-evaluation of the location/package happening now because it was affected on factors other than student preference?")
+    
+    tables = page.tables('non_student_factors')
+    factors_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(factors_counts, x='Response', y='Count', title='Non-Student Factors Influence')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.pie(factors_counts, values='Count', names='Response', title='Perception Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    # Create crosstab for detailed breakdown
+    nsfactors_breakdown = tables['breakdown']
+    st.dataframe(nsfactors_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    nsfactors_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(nsfactors_pct_breakdown, use_container_width=True)
+    
+    # Trust analysis
+    st.subheader("📈 Process Trust by Program-Section")
+    trust_analysis_df = tables['trust']
+    st.dataframe(trust_analysis_df, use_container_width=True)
+    
+    # Visual breakdown
+    nsfactors_by_program_section = tables['by_section']
+    fig = px.bar(nsfactors_by_program_section, x='Program_Section', y='Percentage', color='Response', barmode='stack',
+                 title='Non-Student Factors Perception by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Non-Student Factors Perception"):
+        for response in factors_counts['Response']:
+            st.write(f"**{response}:**")
+            voters = page.rows.rows(page.rows['Non_Student_Factors'] == response, ['Name', 'Email', 'Program', 'Section'])
+            st.dataframe(voters, use_container_width=True)
+
+def show_willingness(page):
+    st.header("🚦 Manila Willingness Analysis")
+    st.markdown("**Question:** If Manila remains the final destination, are you still willing and able to join the educational tour?")
+    
+    tables = page.tables('willingness')
+    willingness_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.pie(willingness_counts, values='Count', names='Response', title='Manila Willingness Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(willingness_counts, x='Response', y='Count', title='Manila Willingness Count')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    
+    # Create crosstab for detailed breakdown
+    will_breakdown = tables['breakdown']
+    st.dataframe(will_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    will_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(will_pct_breakdown, use_container_width=True)
+    
+    # Willingness sentiment analysis
+    st.subheader("📈 Willingness Sentiment by Program-Section")
+    willingness_sentiment_df = tables['sentiment']
+    st.dataframe(willingness_sentiment_df, use_container_width=True)
+    
+    # Visual breakdown
+    will_by_program_section = tables['by_section']
+    fig = px.bar(will_by_program_section, x='Program_Section', y='Percentage', color='Response', barmode='stack',
+                 title='Manila Willingness by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Willingness and Program-Section"):
+        for response in willingness_counts['Response']:
+            st.write(f"**{response}:**")
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows['Manila_Willingness'] == response) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_barriers(page):
+    st.header("🛑 Barriers Analysis")
+    st.markdown("**Question:** What are the biggest barriers for you to join the tour as currently planned? (Check all that apply)")
+    
+    tables = page.tables('barriers')
+    barrier_df = tables['counts']  # Top 10 barriers
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.bar(barrier_df.sort_values('Count', ascending=True), x='Count', y='Barrier', orientation='h', title='Top 10 Barriers to Joining')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.pie(barrier_df, values='Count', names='Barrier', title='Top 10 Barrier Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Barriers by Program-Section")
+    
+    # Create barrier analysis by program-section
+    barrier_analysis_df = tables['analysis']
+    st.dataframe(barrier_analysis_df, use_container_width=True)
+    
+    # Detailed barrier breakdown table
+    st.subheader("📈 Detailed Barrier Breakdown by Program-Section")
+    barrier_ps_df = tables['breakdown']
+    st.dataframe(barrier_ps_df, use_container_width=True)
+    
+    # Visual breakdown
+    barrier_ps_viz = tables['by_section']
+    if not barrier_ps_viz.empty:
+        fig = px.bar(barrier_ps_viz, x='Program_Section', y='Count', color='Barrier', barmode='stack',
+                     title='Barriers by Program-Section')
+        fig.update_layout(xaxis_title='Program-Section', xaxis_tickangle=45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Barrier and Program-Section"):
+        for barrier in barrier_df['Barrier']:
+            st.write(f"**{barrier}:**")
+            col_name = barrier_column(barrier)
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows[col_name] == 1) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_comments(page):
+    st.header("💬 Student Comments")
+    st.markdown("**Question:** Do you have any additional comments or suggestions regarding the tour destination, package, or decision process?")
+    
+    tables = page.tables('comments')
+    comments_df = tables['comments']
+    
+    if len(comments_df) > 0:
+        st.subheader(f"📝 All Comments ({len(comments_df)} total)")
+        
+        # Show summary by program-section
+        comments_summary = tables['by_section']
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Comments by Program-Section:**")
+            st.dataframe(comments_summary, use_container_width=True)
+        
+        with col2:
+            # Create word cloud if comments exist
+            try:
+                wordcloud_png = wordcloud_cache().png((page.filter_key, None), comments_df['Additional_Comments'],
+                                                      400, 200, 'Word Cloud of Comments', (8, 4), page.frequencies())
+                st.image(wordcloud_png, use_container_width=True)
+            except:
+                st.write("Word cloud could not be generated")
+        
+        st.subheader("📋 All Student Comments")
+        
+        # Group comments by program-section for better organization
+        for ps in comments_summary['Program_Section']:
+            ps_comments = comments_df[comments_df['Program_Section'] == ps]
+            if not ps_comments.empty:
+                with st.expander(f"{ps} - {len(ps_comments)} comments"):
+                    for idx, row in ps_comments.iterrows():
+                        st.write(f"**{row['Name']}** ({row['Program_Section']}):")
+                        st.write(f"_{row['Additional_Comments']}_")
+                        st.write("---")
+        
+        show_comment_search(page, comments_df)
+    else:
+        st.write("No comments found in the filtered data.")
+
+# Matches listed with their words highlighted; all of them are in the table below the list
+SEARCH_RESULTS_SHOWN = 50
+
+def comment_search(page, comments_df, query):
+    # (index, tables) for a query over the selection's comments
+    if page.data is not None:
+        # The index built when the responses were loaded; a query reads only its words' postings
+        return page.data.comments, comment_search_tables(page.data.comments, page.rows, query)
+    # No rows in this process (SURVEY_DATABASE, or prebuilt results while the rows load):
+    # index the comments the tab already has, once per selection
+    comments = comments_df.reset_index(drop=True)
+    index = selection_cache().get(page.filter_key + ('comments',), lambda: CommentIndex.build(comments))
+    return index, comment_search_tables(index, RowView(comments, np.arange(len(comments))), query)
+
+# A fragment, so typing a query only redraws the search results
+@st.fragment
+def show_comment_search(page, comments_df):
+    st.subheader("🔍 Search Comments")
+    query = st.text_input(
+        "Search comments", key="comment_search", placeholder='e.g. visa, "boat ride", expens*',
+        help='Every word must appear; "quoted words" must appear together in that order; '
+             'a trailing * matches any ending (expens* finds expensive and expenses).'
+    )
+    if not query.strip():
+        st.dataframe(
+            comments_df[['Name', 'Program_Section', 'Additional_Comments']],
+            use_container_width=True,
+            hide_index=True
+        )
+        return
+    index, search = comment_search(page, comments_df, query)
+    matches = search['comments']
+    st.write(f"**{len(matches)}** of {len(comments_df)} comments match.")
+    if matches.empty:
+        return
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.write("**Matches by Program-Section:**")
+        st.dataframe(search['by_section'], use_container_width=True, hide_index=True)
+    with col2:
+        terms = index.matched_terms(query)
+        for idx, row in matches.head(SEARCH_RESULTS_SHOWN).iterrows():
+            comment = highlight(row['Additional_Comments'], terms, ':orange-background[', ']')
+            st.markdown(f"**{row['Name']}** ({row['Program_Section']}): _{comment}_")
+        if len(matches) > SEARCH_RESULTS_SHOWN:
+            st.caption(f"First {SEARCH_RESULTS_SHOWN} shown; every match is in the table below.")
+    st.dataframe(matches, use_container_width=True, hide_index=True)
+
+def show_package(page):
+    st.header("📦 Package Preference Analysis")
+    st.markdown("**Question:** Select the package you prefer:")
+    
+    tables = page.tables('package')
+    package_counts = tables['counts']
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.pie(package_counts, values='Count', names='Package', title='Package Preference Distribution')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(package_counts, x='Package', y='Count', title='Package Preference Count')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Program-Section Breakdown
+    st.subheader("📊 Breakdown by Program-Section")
+    
+    # Create crosstab for detailed breakdown
+    package_breakdown = tables['breakdown']
+    st.dataframe(package_breakdown, use_container_width=True)
+    
+    # Percentage breakdown
+    package_pct_breakdown = tables['percentages']
+    st.subheader("� Percentage Breakdown by Program-Section")
+    st.dataframe(package_pct_breakdown, use_container_width=True)
+    
+    # Package preference analysis
+    st.subheader("📈 Package Preference Analysis by Program-Section")
+    package_analysis_df = tables['analysis']
+    st.dataframe(package_analysis_df, use_container_width=True)
+    
+    # Visual breakdown
+    package_by_program_section = tables['by_section']
+    fig = px.bar(package_by_program_section, x='Program_Section', y='Percentage', color='Package', barmode='stack',
+                 title='Package Preference by Program-Section (%)')
+    fig.update_layout(xaxis_tickangle=45)
+    st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("📋 Detailed Voter List by Package and Program-Section"):
+        for pkg in package_counts['Package']:
+            st.write(f"**{pkg}:**")
+            for ps in page.cube.sections():
+                ps_voters = page.rows.rows((page.rows['Preferred_Package'] == pkg) & (page.rows['Program_Section'] == ps), ['Name', 'Email'])
+                if not ps_voters.empty:
+                    st.write(f"  *{ps}:* {len(ps_voters)} voters")
+                    st.dataframe(ps_voters, use_container_width=True)
+
+def show_sentiment(page):
+    st.header("� Comprehensive Sentiment Analysis")
+    
+    # Overall sentiment metrics
+    col1, col2, col3 = st.columns(3)
+    
+    tables = page.tables('sentiment')
+    overview = sentiment_overview(page.cube)
+    financial_sentiment = overview['financial']
+    participation_sentiment = overview['participation']
+    process_sentiment = overview['process']
+    overall_sentiment = overview['overall']
+    
+    with col1:
+        st.metric("Financial Sentiment", f"{financial_sentiment:.1f}/100", 
+                 help="Higher score = More students find tour affordable")
+    with col2:
+        st.metric("Participation Willingness", f"{participation_sentiment:.1f}/100",
+                 help="Percentage of students definitely willing to join Manila tour")
+    with col3:
+        st.metric("Process Trust", f"{process_sentiment:.1f}/100",
+                 help="Higher score = Students feel their votes mattered")
+    
+    # Overall sentiment gauge
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=overall_sentiment,
+        title={'text': "Overall Sentiment Score"},
+        gauge={'axis': {'range': [0, 100]},
+               'bar': {'color': "darkblue"},
+               'steps': [
+                   {'range': [0, 33], 'color': "lightcoral"},
+                   {'range': [33, 66], 'color': "lightyellow"},
+                   {'range': [66, 100], 'color': "lightgreen"}],
+               'threshold': {'line': {'color': "red", 'width': 4},
+                           'thickness': 0.75, 'value': 50}}))
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Detailed Program-Section Analysis
+    st.subheader("📊 Detailed Sentiment Analysis by Program-Section")
+    
+    sentiment_df = tables['sentiment']
+    st.dataframe(sentiment_df, use_container_width=True)
+    
+    # Visual representation of sentiment scores
+    st.subheader("📈 Sentiment Scores Visualization")
+    
+    # Prepare data for visualization straight from the numeric scores
+    sentiment_viz_df = tables['scores']
+    
+    fig = px.bar(sentiment_viz_df, x='Program-Section', y='Score', color='Metric',
+                 title='Sentiment Scores by Program-Section', barmode='group')
+    fig.update_layout(xaxis_tickangle=45, yaxis_title='Score (%)', yaxis_range=[0, 100])
+    fig.add_hline(y=50, line_dash="dash", line_color="gray", 
+                  annotation_text="Neutral Line (50%)")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Key insights
+    st.subheader("🔍 Key Insights")
+    
+    # Find sections with concerning sentiment
+    concerning_sections = page.scores[page.scores['overall'] < 40]
+    if not concerning_sections.empty:
+        st.warning("⚠️ **Sections with Concerning Sentiment (< 40%):**")
+        for ps, overall in concerning_sections['overall'].items():
+            st.write(f"- **{ps}**: {overall:.1f}% overall sentiment")
+    
+    # Find sections with very positive sentiment
+    positive_sections = page.scores[page.scores['overall'] >= 70]
+    if not positive_sections.empty:
+        st.success("✅ **Sections with Very Positive Sentiment (≥ 70%):**")
+        for ps, overall in positive_sections['overall'].items():
+            st.write(f"- **{ps}**: {overall:.1f}% overall sentiment")
+    
+    # Summary statistics
+    st.subheader("📊 Summary Statistics")
+    col1, col2, col3 = st.columns(3)
+    
+    overall_scores = page.scores['overall']
+    
+    with col1:
+        st.metric("Highest Sentiment Score", f"{overall_scores.max():.1f}%")
+    with col2:
+        st.metric("Lowest Sentiment Score", f"{overall_scores.min():.1f}%")
+    with col3:
+        st.metric("Average Sentiment Score", f"{overall_scores.mean():.1f}%")
+
+    if page.comparing_waves:
+        # The same scores per wave, from each wave's cube for this selection
+        st.subheader("🌊 Sentiment Across Waves")
+        wave_trend = wave_tables(page.wave_scores())
+        wave_overall = wave_trend['overall'].melt(
+            id_vars='Wave', value_vars=['Financial Score', 'Participation Score', 'Process Score', 'Overall Score'],
+            var_name='Metric', value_name='Score')
+        fig = px.line(wave_overall, x='Wave', y='Score', color='Metric', markers=True, title='Sentiment Scores by Wave')
+        fig.update_layout(yaxis_title='Score (%)', yaxis_range=[0, 100])
+        st.plotly_chart(fig, use_container_width=True)
+        overall_by_wave = wave_trend['trend'][wave_trend['trend']['Metric'] == 'Overall Score']
+        overall_by_wave = overall_by_wave.pivot(index='Program-Section', columns='Wave', values='Value')
+        st.write("**Overall Sentiment Score by Program-Section and Wave:**")
+        st.dataframe(overall_by_wave[wave_trend['overall']['Wave']].round(1), use_container_width=True)
+
+# A fragment reruns on its own: picking another section only redraws this panel,
+# from the selection's cached cube and scores, instead of the whole dashboard
+@st.fragment
+def show_section_report(page):
+    selected_ps = st.selectbox(
+        "Select Program-Section for Detailed Analysis:",
+        options=page.cube.sections(),
+        help="Choose a program-section to see detailed analysis"
+    )
+    
+    if selected_ps:
+        ps_df = page.rows.rows(page.rows['Program_Section'] == selected_ps, ['Name', 'Email'])
+        summary = page.summary(selected_ps)
+        ps_counts = summary['counts']
+        ps_scores = summary['scores']
+        
+        st.markdown(f"## 📊 Complete Analysis for **{selected_ps}**")
+        # Respondents in the section from the summary, also when the rows are not loaded yet
+        st.markdown(f"**Total Students:** {summary['total']}")
+        
+        # Show students in this program-section
+        st.subheader("👥 Students in this Program-Section")
+        students_list = ps_df[['Name', 'Email']].reset_index(drop=True)
+        students_list.index += 1  # Start numbering from 1
+        st.dataframe(students_list, use_container_width=True)
+        
+        st.markdown("---")
+        
+        # 1. LOCATION PREFERENCE ANALYSIS
+        st.subheader("🗺️ Q1: Where do you personally want to have the educational tour?")
+        
+        location_data = ps_counts['Tour_Location_Preference']
+        if not location_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.pie(values=location_data.values, names=location_data.index, 
+                           title=f'Location Preferences - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                location_summary = pd.DataFrame(summary['breakdowns']['Tour_Location_Preference'],
+                                                columns=['Location', 'Count', 'Percentage'])
+                st.write("**Breakdown:**")
+                st.dataframe(location_summary, use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        
+        # 2. AFFORDABILITY ANALYSIS
+        st.subheader("💸 Q2: How would you rate the affordability of the Manila package (PHP 22,000)?")
+        
+        afford_data = ps_counts['Affordability_Rating']
+        if not afford_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.bar(x=afford_data.index, y=afford_data.values, 
+                           title=f'Affordability Ratings - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.metric("Find it Expensive", f"{int(ps_scores['expensive'])} ({ps_scores['expensive_pct']:.1f}%)")
+                st.metric("Find it Affordable", f"{int(ps_scores['affordable'])} ({ps_scores['affordable_pct']:.1f}%)")
+                st.write(f"**Affordability Sentiment:** {summary['labels']['affordability']}")
+        
+        st.markdown("---")
+        
+        # 3. IMPORTANT FACTORS ANALYSIS
+        st.subheader("🏆 Q3: Which factor is MOST important in your tour decision?")
+        
+        factors_data = ps_counts['Most_Important_Factor']
+        if not factors_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.bar(y=factors_data.index, x=factors_data.values, orientation='h',
+                           title=f'Most Important Factors - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.write("**Top Priority Analysis:**")
+                top_factor, top_count, top_pct = summary['top']['Most_Important_Factor']
+                
+                st.metric("Top Priority", top_factor)
+                st.metric("Students who chose this", f"{top_count} ({top_pct:.1f}%)")
+        
+        st.markdown("---")
+        
+        # 4. VOTING POWER ANALYSIS
+        st.subheader("🗳️ Q4: Do you feel your previous vote for the tour location/package mattered?")
+        
+        voting_data = ps_counts['Previous_Vote_Mattered']
+        if not voting_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.pie(values=voting_data.values, names=voting_data.index,
+                           title=f'Voting Power Perception - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.metric("Dissatisfied with Vote Impact", f"{int(ps_scores['dissatisfied'])} ({ps_scores['dissatisfied_pct']:.1f}%)")
+                st.metric("Satisfied with Vote Impact", f"{int(ps_scores['satisfied'])} ({ps_scores['satisfied_pct']:.1f}%)")
+                st.write(f"**Voting Confidence:** {summary['labels']['confidence']}")
+        
+        st.markdown("---")
+        
+        # 5. NON-STUDENT FACTORS ANALYSIS
+        st.subheader("⚖️ Q5: Is the re-evaluation affected by factors other than student preference?")
+        
+        nsfactors_data = ps_counts['Non_Student_Factors']
+        if not nsfactors_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.bar(x=nsfactors_data.index, y=nsfactors_data.values,
+                           title=f'Non-Student Factors Perception - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.metric("Believe External Influence",
+                          f"{int(ps_scores['believes_external'])} ({ps_scores['believes_external_pct']:.1f}%)")
+                st.write(f"**Process Trust Level:** {summary['labels']['trust']}")
+        
+        st.markdown("---")
+        
+        # 6. MANILA WILLINGNESS ANALYSIS
+        st.subheader("🚦 Q6: If Manila remains the final destination, are you still willing to join?")
+        
+        willingness_data = ps_counts['Manila_Willingness']
+        if not willingness_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.pie(values=willingness_data.values, names=willingness_data.index,
+                           title=f'Manila Willingness - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                st.metric("Definitely Willing",
+                          f"{int(ps_scores['definitely_willing'])} ({ps_scores['definitely_willing_pct']:.1f}%)")
+                st.metric("Total Positive Response",
+                          f"{int(ps_scores['positive_willing'])} ({ps_scores['positive_willing_pct']:.1f}%)")
+                st.write(f"**Willingness Sentiment:** {summary['labels']['willingness']}")
+        
+        st.markdown("---")
+        
+        # 7. BARRIERS ANALYSIS
+        st.subheader("🛑 Q7: What are the biggest barriers for you to join the tour?")
+        
+        # Barrier counts for this program-section
+        barrier_counts_ps = summary['breakdowns'][BARRIERS]
+        
+        if barrier_counts_ps:
+            col1, col2 = st.columns(2)
+            with col1:
+                barrier_df_ps = pd.DataFrame(barrier_counts_ps, columns=['Barrier', 'Count', 'Percentage'])
+                barrier_df_ps = barrier_df_ps.sort_values('Count', ascending=True)
+                fig = px.bar(barrier_df_ps, x='Count', y='Barrier', orientation='h',
+                           title=f'Barriers to Joining - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                top_barrier, top_barrier_count, top_barrier_pct = summary['top'][BARRIERS]
+                
+                st.metric("Top Barrier", top_barrier)
+                st.metric("Students affected", f"{top_barrier_count} ({top_barrier_pct:.1f}%)")
+                st.metric("Total Barriers Reported", summary['barriers_reported'])
+        else:
+            st.info("No barriers reported by students in this section.")
+        
+        st.markdown("---")
+        
+        # 8. COMMENTS ANALYSIS
+        st.subheader("💬 Q8: Additional comments or suggestions")
+        
+        comments = page.tables('comments')['comments']
+        ps_comments = comments[comments['Program_Section'] == selected_ps]
+        
+        if not ps_comments.empty:
+            st.write(f"**{len(ps_comments)} students provided comments:**")
+            
+            # Show word cloud if comments exist
+            try:
+                wordcloud_png = wordcloud_cache().png((page.filter_key, selected_ps), ps_comments['Additional_Comments'],
+                                                      600, 300, f'Word Cloud of Comments - {selected_ps}', (10, 5),
+                                                      page.frequencies(selected_ps))
+                st.image(wordcloud_png, use_container_width=True)
+            except:
+                st.write("Word cloud could not be generated")
+            
+            # Show all comments
+            for idx, row in ps_comments.iterrows():
+                st.write(f"**{row['Name']}:** _{row['Additional_Comments']}_")
+                st.write("---")
+        else:
+            st.info("No comments provided by students in this section.")
+        
+        st.markdown("---")
+        
+        # 9. PACKAGE PREFERENCE ANALYSIS
+        st.subheader("📦 Q9: Select the package you prefer")
+        
+        package_data = ps_counts['Preferred_Package']
+        if not package_data.empty:
+            col1, col2 = st.columns(2)
+            with col1:
+                fig = px.pie(values=package_data.values, names=package_data.index,
+                           title=f'Package Preferences - {selected_ps}')
+                st.plotly_chart(fig, use_container_width=True)
+            
+            with col2:
+                top_package, top_package_count, top_package_pct = summary['top']['Preferred_Package']
+                
+                st.metric("Preferred Package", top_package)
+                st.metric("Students who chose this", f"{top_package_count} ({top_package_pct:.1f}%)")
+                
+                package_summary = pd.DataFrame(summary['breakdowns']['Preferred_Package'],
+                                               columns=['Package', 'Count', 'Percentage'])
+                st.write("**Breakdown:**")
+                st.dataframe(package_summary, use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        
+        # 10. OVERALL SENTIMENT ANALYSIS
+        st.subheader("📈 Overall Sentiment Analysis")
+        
+        # Sentiment scores were computed for every section in one pass
+        financial_score = ps_scores['financial']
+        participation_score = ps_scores['participation']
+        process_score = ps_scores['process']
+        overall_score = ps_scores['overall']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Financial Sentiment", f"{financial_score:.1f}%")
+        with col2:
+            st.metric("Participation Willingness", f"{participation_score:.1f}%")
+        with col3:
+            st.metric("Process Trust", f"{process_score:.1f}%")
+        with col4:
+            st.metric("Overall Sentiment", f"{overall_score:.1f}%")
+        
+        # Sentiment classification
+        sentiment_status = summary['labels']['sentiment']
+        if overall_score >= 50:
+            st.success(f"**Overall Assessment:** {sentiment_status}")
+        elif overall_score >= 30:
+            st.warning(f"**Overall Assessment:** {sentiment_status}")
+        else:
+            st.error(f"**Overall Assessment:** {sentiment_status}")
+        
+        # Summary insights
+        st.subheader("🔍 Key Insights & Recommendations")
+        
+        insights = summary['insights']
+        for insight in insights:
+            st.write(f"• {insight}")
+        
+        if not insights:
+            st.write("• Overall positive sentiment with no major concerns identified")
+
+
+def show_section_summary(page):
+    st.header("📋 Comprehensive Program-Section Summary")
+    st.markdown("*This tab provides a complete analysis overview for each program-section with all survey responses and visualizations.*")
+    
+    # Create Program-Section selector
+    show_section_report(page)
+    
+    # Section comparison overview
+    tables = page.tables('section_summary')
+    st.markdown("---")
+    st.subheader("📊 Quick Comparison Across All Program-Sections")
+    
+    comparison_df = tables['comparison']
+    st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+
+# What the comparison leads with: affordability, willingness and whether votes mattered
+COMPARED_METRICS = ['expensive_pct', 'definitely_willing_pct', 'dissatisfied_pct']
+# Measures where a drop is the good news
+LOWER_IS_BETTER = {'expensive_pct', 'dissatisfied_pct'}
+
+# A fragment, so choosing waves, the baseline or the measure only redraws this view,
+# from the per-wave cubes already cached for the selection
+@st.fragment
+def show_wave_comparison(waves):
+    names = list(waves)
+    chosen = st.multiselect("Waves to compare", options=names, default=names, key="compare_waves")
+    chosen = [wave for wave in names if wave in chosen]
+    if len(chosen) < 2:
+        st.info("Choose at least two waves to compare.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        base = st.selectbox("Baseline wave", chosen, index=0, key="compare_base")
+    with col2:
+        target = st.selectbox("Compared wave", chosen, index=len(chosen) - 1, key="compare_target")
+    tables = wave_tables({wave: waves[wave] for wave in chosen}, base, target, COMPARED_METRICS)
+    overall = tables['overall'].set_index('Wave')
+
+    st.subheader(f"📊 {target} compared with {base}")
+    columns = st.columns(len(COMPARED_METRICS) + 1)
+    with columns[0]:
+        st.metric("Respondents", int(overall.loc[target, 'Respondents']),
+                  delta=int(overall.loc[target, 'Respondents'] - overall.loc[base, 'Respondents']))
+    for column, metric in zip(columns[1:], COMPARED_METRICS):
+        label = WAVE_METRICS[metric]
+        with column:
+            st.metric(label, f"{overall.loc[target, label]:.1f}%",
+                      delta=f"{overall.loc[target, label] - overall.loc[base, label]:+.1f} pts",
+                      delta_color="inverse" if metric in LOWER_IS_BETTER else "normal")
+    st.dataframe(tables['overall'], use_container_width=True, hide_index=True)
+
+    st.subheader("📈 Trends by Program-Section")
+    measure = st.selectbox("Measure", list(WAVE_METRICS.values()), key="compare_measure")
+    trend = tables['trend'][tables['trend']['Metric'] == measure]
+    fig = px.line(trend, x='Wave', y='Value', color='Program-Section', markers=True, title=f'{measure} by Wave')
+    fig.update_layout(yaxis_title=measure, yaxis_range=[0, 100])
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader(f"🔀 Change per Program-Section: {base} → {target}")
+    st.dataframe(tables['deltas'], use_container_width=True, hide_index=True)
+
+
+def show_waves(page):
+    st.header("🌊 Wave-over-Wave Comparison")
+    st.markdown("*How each wave answered, overall and per program-section, for the current filters.*")
+    show_wave_comparison(page.wave_scores())
+
+VIEWS = {
+    "Overview": show_overview,
+    "Location Preference": show_location,
+    "Affordability": show_affordability,
+    "Important Factors": show_factors,
+    "Voting Power": show_voting,
+    "Non-Student Factors": show_non_student_factors,
+    "Manila Willingness": show_willingness,
+    "Barriers": show_barriers,
+    "Comments": show_comments,
+    "Preferred Package": show_package,
+    "Sentiment Analysis": show_sentiment,
+    "Program-Section Summary": show_section_summary,
+}
+
+def run(pseudonyms=None):
+    """Draw the dashboard for this rerun of the script.
+
+    ``pseudonyms``, if given, returns the process's ``survey_pseudonym.PseudonymTable``:
+    names and emails are then replaced in the shared rows and in every database fetch,
+    and only aggregates built with the same key are used.
+    """
+    st.set_page_config(page_title="Educational Tour Survey Dashboard", layout="wide", page_icon="🎓")
+
+    # Password authentication
+    if 'logged_in' not in st.session_state:
+        st.session_state.logged_in = False
+
+    if not st.session_state.logged_in:
+        with st.form("login_form"):
+            password = st.text_input("Enter password to access the dashboard", type="password")
+            submitted = st.form_submit_button("Login")
+            if submitted:
+                if password == "admin123":
+                    st.session_state.logged_in = True
+                    st.success("Login successful!")
+                    st.rerun()
+                else:
+                    st.error("Incorrect password. Access denied.")
+        st.stop()
+
+    # Set style for better visualizations
+    plt.style.use('default')
+    sns.set_palette("husl")
+
+    # Taken here, on the script thread: the store's preload thread has no script context
+    table = pseudonyms() if pseudonyms is not None else None
+    key_id = pseudonym_key_id(table.key) if table is not None else None
+    store = survey_store(key_id, table)
+
+    # Sessions read the watcher's last stamp instead of stat-ing the CSV on every rerun
+    data_version, data_state = data_watcher().snapshot()
+    if data_state is None:
+        data_state = waves_state(WAVES_PATTERN) if WAVES_PATTERN else file_state(DATA_PATH)
+    database = survey_database() if DATABASE_PATH else None
+    # With matching prebuilt aggregates the unfiltered page paints from them, in the same time
+    # however many responses there are, while the rows load on a background thread
+    prebuilt = prebuilt_aggregates(data_state, key_id) if database is None and WAVES_PATTERN is None else None
+    if database is not None:
+        # No rows are loaded into this process; every selection is answered by queries
+        data = None
+    elif prebuilt is None:
+        data = store.get(data_state)
+    else:
+        data = store.loaded(data_state)
+        if data is None:
+            store.preload(data_state)
+    if database is not None:
+        ingest = database.info()
+        filter_options = database
+    else:
+        loaded = data if data is not None else prebuilt
+        ingest = loaded.ingest
+        # Filter options come from the bitmap index, or the same lists saved with the aggregates
+        filter_options = data.index if data is not None else prebuilt
+
+    # Sidebar filters
+    st.sidebar.title("Filters")
+    program_options = filter_options.values('Program')
+    section_options = filter_options.values('Section')
+    selected_program = st.sidebar.multiselect("Select Program", options=program_options, default=program_options)
+    selected_section = st.sidebar.multiselect("Select Section", options=section_options, default=section_options)
+
+    # Answer filters, e.g. "Very Expensive" AND "Maybe/Undecided" on Manila
+    answer_filters = {}
+    with st.sidebar.expander("More Filters"):
+        for question in QUESTIONS + [BARRIERS]:
+            chosen = st.multiselect(QUESTION_LABELS[question], options=filter_options.values(question), key=f"filter_{question}")
+            if chosen:
+                answer_filters[question] = chosen
+        match_all = st.radio("Combine answer filters", ["All (AND)", "Any (OR)"], horizontal=True) == "All (AND)"
+
+    # Filter data with bitwise ops on the index, reusing selections seen before
+    filter_key = (data_state, selection_key(selected_program, selected_section, answer_filters, match_all))
+    unfiltered = (not answer_filters and set(selected_program) == set(program_options)
+                  and set(selected_section) == set(section_options))
+    serving_prebuilt = prebuilt is not None and unfiltered
+    if database is None and data is None and not unfiltered:
+        # Any other selection needs the rows and the bitmap index
+        data = store.get(data_state)
+    selection = None
+    if database is not None:
+        # The selection becomes a WHERE clause; its cube is summed from the cubes stored at ingest,
+        # or counted with one GROUP BY per question when answer filters cut across sections
+        selection = selection_cache().get(
+            filter_key,
+            lambda: database.select(selected_program, selected_section, answer_filters, match_all)
+        )
+        # Tabs query just the rows and columns they display, pseudonymized as they arrive
+        prepare = None if table is None else lambda rows: pseudonymize(rows, table)
+        filtered_df = SqlRowView(database, selection.where, prepare=prepare)
+        cube = selection.cube
+        scores = selection.scores
+    elif data is None:
+        # Respondent lists stay empty until the background load finishes and the page reruns
+        filtered_df = RowView(prebuilt.empty_rows, np.arange(0))
+        cube = prebuilt.cube
+        scores = prebuilt.scores
+    else:
+        selection = selection_cache().get(
+            filter_key,
+            lambda: select(data.df, data.unique_barriers, data.cube, data.index, selected_program, selected_section,
+                           answer_filters, match_all)
+        )
+        # Tabs read the selected rows through this view; columns are gathered only when used
+        filtered_df = RowView(data.df, selection.positions)
+        cube = selection.cube
+        scores = selection.scores
+    page = Page(cube, scores, filtered_df, filter_key, data, selection, prebuilt if serving_prebuilt else None,
+                (selected_program, selected_section, answer_filters))
+
+    cache_stats = selection_cache().stats()
+    st.sidebar.caption(
+        f"⚡ Selection cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+        f"{cache_stats['size']}/{cache_stats['maxsize']} entries"
+    )
+    st.sidebar.caption(f"🗂️ {ingest['rows']} responses · last at {ingest['last_timestamp']}")
+    if prebuilt is not None:
+        st.sidebar.caption(f"📦 Prebuilt aggregates from {prebuilt.source['built']}")
+    if data is not None and data.wave_cubes:
+        st.sidebar.caption(f"🌊 {len(data.wave_cubes)} waves: {', '.join(data.wave_cubes)}")
+
+    with st.sidebar:
+        refresh_on_data_change(store, data_version, data_state if data is None and database is None else None)
+
+    # Main title
+    st.title("🎓 Educational Tour Survey Dashboard")
+    if data is None and database is None:
+        st.info("⏳ Showing prebuilt results; respondent names appear once the responses have loaded.")
+    st.markdown("---")
+
+    # Key Metrics
+    st.subheader("📊 Key Metrics")
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric("Total Responses", cube.total)
+    with col2:
+        st.metric("Programs", cube.nunique('Program'))
+    with col3:
+        st.metric("Sections", cube.nunique('Section'))
+    with col4:
+        expensive_pct = cube.count('Affordability_Rating', ['Expensive', 'Very Expensive']) / cube.total * 100 if cube.total > 0 else 0
+        st.metric("Find Expensive", f"{expensive_pct:.1f}%")
+    with col5:
+        willing_pct = cube.count('Manila_Willingness', ['Yes, definitely']) / cube.total * 100 if cube.total > 0 else 0
+        st.metric("Definitely Willing", f"{willing_pct:.1f}%")
+
+    st.markdown("---")
+
+    views = dict(VIEWS)
+    if page.comparing_waves:
+        views["Wave Comparison"] = show_waves
+
+    # st.tabs runs every tab's code on each rerun; lazy mode renders only the chosen view,
+    # so a rerun costs one tab's work and hidden views cost nothing until opened
+    lazy_tabs = st.sidebar.toggle("Lazy tabs", value=True, key="lazy_tabs", help="Only compute the view that is open")
+    if lazy_tabs:
+        current_view = st.radio("View", options=list(views), horizontal=True, key="current_view", label_visibility="collapsed")
+        views[current_view](page)
+    else:
+        for tab, show in zip(st.tabs(list(views)), views.values()):
+            with tab:
+                show(page)
+
+    # After the views ran, so the session's share counts only the columns they read
+    st.sidebar.caption(
+        f"💾 {(data.memory if data is not None else 0) / 2**20:.1f} MB shared by all sessions · {filtered_df.memory() / 2**20:.1f} MB gathered for this session's view"
+        + (" · lean text" if LEAN_TEXT else "")
+    )
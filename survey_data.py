@@ -0,0 +1,412 @@
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    'Timestamp', 'Name', 'Email', 'Program', 'Section',
+    'Tour_Location_Preference', 'Affordability_Rating', 'Most_Important_Factor',
+    'Previous_Vote_Mattered', 'Non_Student_Factors', 'Manila_Willingness',
+    'Barriers', 'Additional_Comments', 'Preferred_Package'
+]
+
+# Bump whenever the cleaning below changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 5
+CACHE_DIR = '.survey_cache'
+# Google Forms joins checkbox answers with ", "
+MULTISELECT_DELIMITER = ','
+# Checkbox choices offered by the form; anything else is the free-text "Other" answer
+BARRIER_OPTIONS = (
+    'Too expensive', 'Safety concerns', 'Parental/guardian consent',
+    'Not interested in company choices', 'Class schedule/conflict', 'Health concerns'
+)
+# Single-choice questions, stored as categoricals so comparisons and counts use integer codes
+CHOICE_COLUMNS = [
+    'Tour_Location_Preference', 'Affordability_Rating', 'Most_Important_Factor',
+    'Previous_Vote_Mattered', 'Non_Student_Factors', 'Manila_Willingness',
+    'Preferred_Package'
+]
+AGREEMENT_LEVELS = ['Strongly Disagree', 'Disagree', 'Neutral', 'Agree', 'Strongly Agree']
+# Likert scales in order, least to most favourable; these columns are ordered categoricals
+LIKERT_LEVELS = {
+    'Affordability_Rating': ['Very Expensive', 'Expensive', 'Neutral', 'Affordable', 'Very Affordable'],
+    'Previous_Vote_Mattered': AGREEMENT_LEVELS,
+    'Non_Student_Factors': AGREEMENT_LEVELS,
+    'Manila_Willingness': ['No', 'Maybe/Undecided', 'Yes, probably', 'Yes, definitely'],
+}
+# Free-text and identifier columns; the lean mode keeps them as Arrow strings instead of str objects
+TEXT_COLUMNS = ['Timestamp', 'Name', 'Email', 'Barriers', 'Additional_Comments']
+ARROW_STRING = pd.StringDtype('pyarrow')
+# Rows per chunk when a CSV is streamed instead of read whole
+CHUNK_ROWS = 100_000
+
+
+def program_section(program, section):
+    return program.astype(str) + ' ' + section.astype(str)
+
+
+def add_program_section(df):
+    """Add the 'Program Section' label of every row as a categorical, missing where either part is."""
+    labels = program_section(df['Program'], df['Section']).where(df['Program'].notna() & df['Section'].notna())
+    df['Program_Section'] = labels.astype(choice_dtype('Program_Section', labels.dropna().unique()))
+    return df
+
+
+def barrier_column(barrier):
+    return f'Barrier_{barrier.replace("/", "_").replace(" ", "_")}'
+
+
+def encode_multiselect(series, delimiter=MULTISELECT_DELIMITER, known_options=None, sparse=False):
+    """Multi-hot encode a "check all that apply" column in a single vectorized pass.
+
+    Returns (indicators, options): an uint8 frame with one column per exact option
+    (sparse columns if requested) aligned with ``series``, and the sorted options.
+    With ``known_options``, the leftover pieces of a row are joined back into one
+    free-text "Other" answer so commas typed by respondents do not split it.
+    """
+    values = pd.Series(series.to_numpy(dtype=object), dtype=object)
+    choices = values.str.split(delimiter, regex=False).explode().str.strip()
+    choices = choices[choices.notna() & (choices != '')]
+    if known_options is not None:
+        known = choices.isin(known_options)
+        other = choices[~known].groupby(level=0, sort=False).agg(f'{delimiter} '.join)
+        choices = pd.concat([choices[known], other])
+    codes, options = pd.factorize(choices, sort=True)
+    rows = choices.index.to_numpy()
+    options = list(options)
+
+    if sparse:
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(options)))
+        columns = {}
+        for k, hits in enumerate(np.split(rows[order], bounds[:-1]) if options else []):
+            column = np.zeros(len(values), dtype=np.uint8)
+            column[hits] = 1
+            columns[k] = pd.arrays.SparseArray(column, fill_value=0)
+        indicators = pd.DataFrame(columns, index=series.index)
+    else:
+        matrix = np.zeros((len(values), len(options)), dtype=np.uint8)
+        matrix[rows, codes] = 1
+        indicators = pd.DataFrame(matrix, index=series.index)
+    indicators.columns = options
+    return indicators, options
+
+
+def choice_dtype(column, values=()):
+    """Categorical dtype for a choice column: the declared levels, then any other answers alphabetically.
+
+    Off-scale answers (e.g. a stray "Cebu" rating) are kept as extra categories
+    instead of becoming NaN.
+    """
+    declared = LIKERT_LEVELS.get(column, [])
+    extra = sorted(set(values) - set(declared))
+    return pd.CategoricalDtype(declared + extra, ordered=column in LIKERT_LEVELS)
+
+
+def encode_choices(df):
+    """Store every single-choice answer column as a categorical (in place)."""
+    for column in CHOICE_COLUMNS:
+        values = df[column].astype(object)
+        df[column] = values.astype(choice_dtype(column, values.dropna().unique()))
+    return df
+
+
+def clean_survey(df, delimiter=MULTISELECT_DELIMITER, sparse=False):
+    # Clean column names
+    df.columns = COLUMNS
+    encode_choices(df)
+    # Computed once here so views group and filter on it without building strings
+    add_program_section(df)
+    # Process Barriers: one exact-match indicator column per checkbox option
+    indicators, unique_barriers = encode_multiselect(df['Barriers'], delimiter, BARRIER_OPTIONS, sparse)
+    indicators.columns = [barrier_column(barrier) for barrier in unique_barriers]
+    df = pd.concat([df, indicators], axis=1)
+    return df, unique_barriers
+
+
+def read_survey_csv(path, delimiter=MULTISELECT_DELIMITER):
+    # Every answer is text; inferring types would let e.g. numbered sections come out int in one
+    # chunk and float in another with a blank, so whole and chunked reads could disagree
+    df = pd.read_csv(path, encoding='utf-8', dtype=str)
+    return clean_survey(df, delimiter)
+
+
+def read_survey_chunks(path, chunksize=CHUNK_ROWS, delimiter=MULTISELECT_DELIMITER):
+    """(frame, barrier options) for every ``chunksize`` rows of the CSV, cleaned like ``read_survey_csv``.
+
+    Row labels run on from chunk to chunk. A chunk's categories and Barrier_* columns
+    cover only the answers in it; ``survey_stream.StreamedSurvey`` combines them.
+    """
+    with pd.read_csv(path, encoding='utf-8', dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield clean_survey(chunk, delimiter)
+
+
+def arrow_strings(df):
+    """``df`` with the text columns held in Arrow string arrays (one buffer per column, no str objects)."""
+    return df.assign(**{column: df[column].astype(ARROW_STRING) for column in TEXT_COLUMNS})
+
+
+def frame_memory(df):
+    """Bytes held by ``df``, counting the strings behind object columns."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def append_rows(df, unique_barriers, new_df, new_barriers):
+    """Cleaned frame of ``df`` followed by ``new_df``, with the union of their barrier indicators.
+
+    Same columns and values as cleaning the combined CSV in one go.
+    """
+    return concat_surveys([(df, unique_barriers), (new_df, new_barriers)])
+
+
+def concat_surveys(parts):
+    """Cleaned frame of every (df, unique_barriers) in ``parts``, one after another, and the union of their options.
+
+    Same columns and values as cleaning the CSVs joined into one.
+    """
+    unique_barriers = sorted(set().union(*(barriers for _, barriers in parts)))
+    indicators = [barrier_column(barrier) for barrier in unique_barriers]
+    frames = [df.copy(deep=False) for df, _ in parts]
+    for column in CHOICE_COLUMNS + ['Program_Section']:
+        # Same categories in every part (a recode, not a re-parse) so concat keeps the categorical
+        dtype = choice_dtype(column, [answer for df in frames for answer in df[column].cat.categories])
+        for df in frames:
+            df[column] = df[column].cat.set_categories(dtype.categories, ordered=dtype.ordered)
+    merged = pd.concat(frames, ignore_index=True)
+    # An option seen in only some parts is missing (NaN) in the others
+    merged[indicators] = merged[indicators].fillna(0).astype(np.uint8)
+    return merged[COLUMNS + ['Program_Section'] + indicators], unique_barriers
+
+
+def file_state(path):
+    """Cheap (size, mtime) stamp; pass it to cached loaders so they re-run on change."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _manifest_path(path, cache_dir):
+    return os.path.join(cache_dir, os.path.basename(path) + '.json')
+
+
+def _read_manifest(path, cache_dir):
+    try:
+        with open(_manifest_path(path, cache_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(path, cache_dir, manifest):
+    target = _manifest_path(path, cache_dir)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, target)
+
+
+def _read_appended(path, manifest):
+    """(new complete lines, sha256 through them) if the file still starts with the bytes the
+    manifest describes, else None.
+
+    Only whole lines are returned, so a row still being written is left for the next load.
+    """
+    offset = manifest['size']
+    digest = hashlib.sha256()
+    last = b''
+    with open(path, 'rb') as f:
+        remaining = offset
+        while remaining:
+            block = f.read(min(1 << 20, remaining))
+            if not block:
+                return None
+            digest.update(block)
+            last = block[-1:]
+            remaining -= len(block)
+        if digest.hexdigest() != manifest['sha256']:
+            return None
+        tail = f.read()
+    tail = tail[:tail.rfind(b'\n') + 1]
+    # Without a newline between them the old last row was extended, not followed
+    if not tail or (last not in (b'\n', b'') and not tail.startswith((b'\n', b'\r\n'))):
+        return None
+    digest.update(tail)
+    return tail, digest.hexdigest()
+
+
+def fingerprint(path, manifest=None):
+    """Size/mtime/sha256 of the CSV; the hash is only recomputed when size or mtime moved."""
+    size, mtime_ns = file_state(path)
+    if manifest and manifest.get('size') == size and manifest.get('mtime_ns') == mtime_ns:
+        return {'size': size, 'mtime_ns': mtime_ns, 'sha256': manifest['sha256']}
+    return {'size': size, 'mtime_ns': mtime_ns, 'sha256': _sha256(path)}
+
+
+def write_snapshot(snapshot_path, df, unique_barriers):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'unique_barriers'] = json.dumps(unique_barriers).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    tmp = f'{snapshot_path}.{os.getpid()}.tmp'
+    # Uncompressed Arrow IPC so readers can memory-map it instead of parsing
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, snapshot_path)
+
+
+def read_snapshot(snapshot_path, lean=False):
+    """Frame and barrier options stored in a snapshot.
+
+    The file is memory-mapped, which saves parsing, but only ``lean`` keeps data in the
+    map: the text columns then wrap its Arrow buffers directly. Without it every column is
+    copied out into pandas (text as Python strings), and so are the categorical and
+    indicator columns in either case. SurveyStore users (the dashboards, the CLI) read lean.
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(snapshot_path, 'r')).read_all()
+    unique_barriers = json.loads(table.schema.metadata[b'unique_barriers'])
+    if not lean:
+        return table.to_pandas(), unique_barriers
+    text = [column for column in TEXT_COLUMNS if column in table.column_names]
+    df = table.drop_columns(text).to_pandas()
+    df = df.assign(**{column: pd.arrays.ArrowStringArray(table[column].cast(pa.string())) for column in text})
+    return df[table.column_names], unique_barriers
+
+
+def _snapshot_name(path, content_sha256, delimiter):
+    # The key covers everything that shapes the cleaned frame, not just the file
+    key = hashlib.sha256(f"{content_sha256}|{SNAPSHOT_VERSION}|{delimiter}|{BARRIER_OPTIONS}".encode('utf-8')).hexdigest()
+    return f"{os.path.basename(path)}-{key[:16]}.arrow"
+
+
+def _try_read_snapshot(cache_dir, snapshot_name, lean=False):
+    snapshot_path = os.path.join(cache_dir, snapshot_name)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        return read_snapshot(snapshot_path, lean)
+    except (ImportError, OSError, ValueError, KeyError):
+        return None
+
+
+def _ingest_info(manifest, df):
+    return {
+        'sha256': manifest['sha256'],
+        'rows': len(df),
+        'last_timestamp': df['Timestamp'].iloc[-1] if len(df) else None,
+        'base_sha256': manifest.get('base_sha256'),
+        'base_rows': manifest.get('base_rows'),
+    }
+
+
+def _store(path, cache_dir, manifest, df, unique_barriers, snapshot_name, **current):
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_snapshot(os.path.join(cache_dir, snapshot_name), df, unique_barriers)
+        stale = manifest.get('snapshot')
+        _write_manifest(path, cache_dir, dict(current, snapshot=snapshot_name, version=SNAPSHOT_VERSION,
+                                              rows=len(df)))
+        if stale and stale != snapshot_name:
+            try:
+                os.remove(os.path.join(cache_dir, stale))
+            except OSError:
+                pass
+    except (ImportError, OSError):
+        # Read-only checkout etc.: the snapshot is an optimisation, not a requirement
+        pass
+
+
+def _append(path, cache_dir, manifest, delimiter):
+    """Parse only the rows added since the manifest was written and merge them into its snapshot."""
+    if manifest.get('snapshot') != _snapshot_name(path, manifest.get('sha256'), delimiter):
+        return None
+    appended = _read_appended(path, manifest)
+    if appended is None:
+        return None
+    previous = _try_read_snapshot(cache_dir, manifest['snapshot'])
+    if previous is None:
+        return None
+    tail, content_sha256 = appended
+    df, unique_barriers = previous
+    try:
+        # Header-less, and text like every read, so the two frames concatenate cleanly
+        new_df = pd.read_csv(io.BytesIO(tail), header=None, names=COLUMNS, encoding='utf-8', dtype=str)
+    except (ValueError, pd.errors.ParserError):
+        return None
+    new_df, new_barriers = clean_survey(new_df, delimiter)
+    df, unique_barriers = append_rows(df, unique_barriers, new_df, new_barriers)
+    current = {
+        'size': manifest['size'] + len(tail),
+        'mtime_ns': file_state(path)[1],
+        'sha256': content_sha256,
+        'base_sha256': manifest['sha256'],
+        'base_rows': manifest.get('rows', len(previous[0])),
+    }
+    _store(path, cache_dir, manifest, df, unique_barriers, _snapshot_name(path, content_sha256, delimiter), **current)
+    return df, unique_barriers, _ingest_info(current, df)
+
+
+def ingest_survey(path='109.csv', cache_dir=CACHE_DIR, delimiter=MULTISELECT_DELIMITER, lean=False):
+    """Like ``load_survey``, plus an info dict about the version that was loaded.
+
+    When the CSV only grew since the last load (its earlier bytes still hash the
+    same) just the new rows are parsed and merged into the snapshot. ``info`` has
+    ``sha256``, ``rows`` and ``last_timestamp``; for appended versions also the
+    ``base_sha256``/``base_rows`` of the version it extends, so callers can update
+    their own aggregates with ``df.iloc[base_rows:]`` instead of rebuilding them.
+    With ``lean`` the TEXT_COLUMNS come back as Arrow strings (see ``arrow_strings``).
+    """
+    manifest = _read_manifest(path, cache_dir)
+    size, mtime_ns = file_state(path)
+    if manifest.get('sha256') and size > manifest.get('size', size):
+        result = _append(path, cache_dir, manifest, delimiter)
+        if result is not None:
+            df, unique_barriers, info = result
+            return (arrow_strings(df) if lean else df), unique_barriers, info
+
+    current = fingerprint(path, manifest)
+    snapshot_name = _snapshot_name(path, current['sha256'], delimiter)
+    if manifest.get('snapshot') == snapshot_name:
+        result = _try_read_snapshot(cache_dir, snapshot_name, lean)
+        if result is not None:
+            if manifest.get('mtime_ns') != current['mtime_ns']:
+                # Touched but identical content: only refresh the stamp
+                try:
+                    _write_manifest(path, cache_dir, dict(manifest, **current))
+                except OSError:
+                    pass
+            return result + (_ingest_info(manifest, result[0]),)
+
+    df, unique_barriers = read_survey_csv(path, delimiter)
+    _store(path, cache_dir, manifest, df, unique_barriers, snapshot_name, **current)
+    return (arrow_strings(df) if lean else df), unique_barriers, _ingest_info(current, df)
+
+
+def snapshot_current(path, cache_dir=CACHE_DIR, delimiter=MULTISELECT_DELIMITER):
+    """Whether ``ingest_survey`` would read ``path`` from its snapshot without parsing; stats, never hashes."""
+    manifest = _read_manifest(path, cache_dir)
+    if not manifest.get('sha256') or (manifest.get('size'), manifest.get('mtime_ns')) != file_state(path):
+        return False
+    snapshot_name = _snapshot_name(path, manifest['sha256'], delimiter)
+    return manifest.get('snapshot') == snapshot_name and os.path.exists(os.path.join(cache_dir, snapshot_name))
+
+
+def load_survey(path='109.csv', cache_dir=CACHE_DIR, delimiter=MULTISELECT_DELIMITER, lean=False):
+    """Load the cleaned survey frame, reusing an on-disk Arrow snapshot when the CSV is unchanged."""
+    df, unique_barriers, _ = ingest_survey(path, cache_dir, delimiter, lean)
+    return df, unique_barriers
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Set bits per byte value, for counting matches without unpacking
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class BitmapIndex:
+    """One packed bitset per (column, value), so filters are bitwise ops instead of row scans.
+
+    Bitsets are ``np.packbits`` arrays of ceil(n_rows / 8) bytes. Within a column the
+    chosen values are OR'ed; ``match`` then ANDs (or ORs) the per-column results.
+    """
+
+    def __init__(self, n_rows, bitmaps):
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps
+        self._empty = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        self._empty.flags.writeable = False
+
+    @classmethod
+    def build(cls, df, columns, indicators=None):
+        """Index single-choice ``columns`` and multi-select ``indicators``.
+
+        ``indicators`` maps a question name to {option: indicator column}, e.g. the
+        Barrier_* columns, so each ticked option gets its own bitset.
+        """
+        bitmaps = {}
+        for column in columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Reuse the stored codes; values come out in category (e.g. Likert) order
+                codes, values = series.cat.codes.to_numpy(), series.cat.categories
+                present = np.bincount(codes[codes >= 0], minlength=len(values)) > 0
+            else:
+                codes, values = pd.factorize(series)
+                present = np.ones(len(values), dtype=bool)
+            bitmaps[column] = {value: np.packbits(codes == k) for k, value in enumerate(values) if present[k]}
+        for question, options in (indicators or {}).items():
+            bitmaps[question] = {
+                option: np.packbits(df[indicator].to_numpy() != 0) for option, indicator in options.items()
+            }
+        for column in bitmaps.values():
+            for bits in column.values():
+                bits.flags.writeable = False
+        return cls(len(df), bitmaps)
+
+    def values(self, column):
+        return list(self.bitmaps.get(column, {}))
+
+    def bitmap(self, column, value):
+        return self.bitmaps.get(column, {}).get(value, self._empty)
+
+    def any_of(self, column, values):
+        bits = self._empty.copy()
+        for value in values:
+            np.bitwise_or(bits, self.bitmap(column, value), out=bits)
+        return bits
+
+    def match(self, filters, match_all=True):
+        """Rows matching {column: values}; columns are AND'ed, or OR'ed when ``match_all`` is False."""
+        if not filters:
+            return self.all_rows()
+        combine = np.bitwise_and if match_all else np.bitwise_or
+        result = None
+        for column, values in filters.items():
+            bits = self.any_of(column, values)
+            result = bits if result is None else combine(result, bits, out=result)
+        return result
+
+    def all_rows(self):
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def count(self, bits):
+        return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+    def positions(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
@@ -0,0 +1,94 @@
+import hashlib
+import hmac
+import os
+import secrets
+
+import numpy as np
+import pandas as pd
+
+from survey_data import CACHE_DIR
+
+# Hex characters kept per pseudonym; 64 bits keeps collisions negligible for large rosters
+PSEUDONYM_LENGTH = 16
+KEY_ENV = 'SURVEY_PSEUDONYM_KEY'
+KEY_FILE = 'pseudonym.key'
+# Earlier versions kept their name -> pseudonym table here, original names included
+STORED_TABLE = 'pseudonyms.json'
+
+
+def pseudonym_key(secret=None, cache_dir=CACHE_DIR):
+    """HMAC key from ``secret`` (e.g. st.secrets), the SURVEY_PSEUDONYM_KEY variable, or a local key file.
+
+    Without configuration a random key is generated once and kept in ``cache_dir``
+    so pseudonyms stay stable across restarts.
+    """
+    secret = secret or os.environ.get(KEY_ENV)
+    if secret:
+        return secret.encode('utf-8')
+    path = os.path.join(cache_dir, KEY_FILE)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read().strip().encode('utf-8')
+    except OSError:
+        pass
+    os.makedirs(cache_dir, exist_ok=True)
+    generated = secrets.token_hex(32)
+    # O_EXCL: if another process won the race, use its key instead
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, encoding='utf-8') as f:
+            return f.read().strip().encode('utf-8')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(generated)
+    return generated.encode('utf-8')
+
+
+def pseudonym_key_id(key):
+    """Short public id of ``key``, to tell which key pseudonymized a stored artifact without storing the key."""
+    return hmac.new(key, b'key-id', hashlib.sha256).hexdigest()[:16]
+
+
+def discard_stored_table(cache_dir=CACHE_DIR):
+    """Delete the name -> pseudonym table an earlier version left in ``cache_dir``, if any."""
+    try:
+        os.remove(os.path.join(cache_dir, STORED_TABLE))
+    except OSError:
+        pass
+
+
+class PseudonymTable:
+    """In-memory {column: {value: pseudonym}} mapping for one HMAC key.
+
+    Values the table has seen are not hashed again, so each distinct name costs one
+    HMAC; keep one table per key for the process and reuse it for every load. It may be
+    shared between threads: two that hash the same value at once store the same pseudonym.
+    The table is never written to disk: it could only be looked up by the original names,
+    which a pseudonymized deployment must not keep.
+    """
+
+    def __init__(self, key, length=PSEUDONYM_LENGTH):
+        self.key = key
+        self.length = length
+        self.mapping = {}
+
+    def _hash(self, column, value):
+        # Column is part of the message so equal strings in Name and Email do not link up
+        message = f'{column}\x00{value}'.encode('utf-8')
+        return hmac.digest(self.key, message, 'sha256').hex()[:self.length]
+
+    def pseudonymize(self, series, column):
+        """Pseudonyms for ``series``, hashing each distinct unseen value once; missing values stay missing.
+
+        Arrow-backed string columns stay Arrow-backed.
+        """
+        codes, uniques = pd.factorize(series)
+        known = self.mapping.setdefault(column, {})
+        uniques = uniques.astype(str).tolist()
+        for value in uniques:
+            if value not in known:
+                known[value] = self._hash(column, value)
+        # Missing values have code -1 and pick up the trailing NaN
+        pseudonyms = np.array([known[value] for value in uniques] + [np.nan], dtype=object)
+        result = pd.Series(pseudonyms[codes], index=series.index, name=series.name)
+        return result.astype(series.dtype) if isinstance(series.dtype, pd.StringDtype) else result
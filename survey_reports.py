@@ -0,0 +1,401 @@
+import base64
+import collections
+import concurrent.futures
+import hashlib
+import html
+import multiprocessing
+import os
+import re
+import time
+
+from survey_analytics import BARRIERS
+from survey_tables import QUESTION_VIEWS, comparison_table, section_summaries, section_summary
+
+# Batch version of the dashboard's Program-Section report: one HTML and/or PDF file per
+# section, rendered in a process pool. Workers get the cube and scores once, when they
+# start; each task carries only its section's rows.
+
+# (question, heading, chart, chart title) in report order; Q8 (comments) follows Q7
+QUESTION_SECTIONS = [
+    ('Tour_Location_Preference', '🗺️ Q1: Where do you personally want to have the educational tour?',
+     'pie', 'Location Preferences'),
+    ('Affordability_Rating', '💸 Q2: How would you rate the affordability of the Manila package (PHP 22,000)?',
+     'bar', 'Affordability Ratings'),
+    ('Most_Important_Factor', '🏆 Q3: Which factor is MOST important in your tour decision?',
+     'barh', 'Most Important Factors'),
+    ('Previous_Vote_Mattered', '🗳️ Q4: Do you feel your previous vote for the tour location/package mattered?',
+     'pie', 'Voting Power Perception'),
+    ('Non_Student_Factors', '⚖️ Q5: Is the re-evaluation affected by factors other than student preference?',
+     'bar', 'Non-Student Factors Perception'),
+    ('Manila_Willingness', '🚦 Q6: If Manila remains the final destination, are you still willing to join?',
+     'pie', 'Manila Willingness'),
+    (BARRIERS, '🛑 Q7: What are the biggest barriers for you to join the tour?',
+     'barh', 'Barriers to Joining'),
+    ('Preferred_Package', '📦 Q9: Select the package you prefer', 'pie', 'Package Preferences'),
+]
+COMMENTS_HEADING = '💬 Q8: Additional comments or suggestions'
+# Answer column name of the breakdown tables, as in the dashboard's views
+ANSWER_LABELS = dict(QUESTION_VIEWS.values())
+FORMATS = ['html', 'pdf']
+
+
+def report_filename(label):
+    """File name stem for a section label, e.g. 'BSIT A' -> 'BSIT_A'."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(label)).strip('_') or 'section'
+
+
+def report_filenames(labels):
+    """{label: file name stem} with a distinct stem per label.
+
+    Labels that report_filename maps to the same stem ('BSIT A' and 'BSIT-A' -> 'BSIT_A';
+    also stems differing only in case, for case-insensitive file systems, and 'index',
+    which the index page uses) get a short hash of the label appended.
+    """
+    stems = {label: report_filename(label) for label in labels}
+    taken = collections.Counter(stem.lower() for stem in stems.values())
+    taken['index'] += 1
+    return {label: f"{stem}_{hashlib.sha1(str(label).encode('utf-8')).hexdigest()[:8]}" if taken[stem.lower()] > 1
+            else stem for label, stem in stems.items()}
+
+
+def _pct(count, total):
+    return f"{count} ({count / total * 100:.1f}%)" if total else f"{count} (0.0%)"
+
+
+def question_details(summary, question):
+    """(metrics, note, breakdown) shown next to a question's chart, as in the dashboard."""
+    scores = summary['scores']
+    labels = summary['labels']
+    total = summary['total']
+    if question == 'Affordability_Rating':
+        return ([('Find it Expensive', _pct(int(scores['expensive']), total)),
+                 ('Find it Affordable', _pct(int(scores['affordable']), total))],
+                f"Affordability Sentiment: {labels['affordability']}", None)
+    if question == 'Previous_Vote_Mattered':
+        return ([('Dissatisfied with Vote Impact', _pct(int(scores['dissatisfied']), total)),
+                 ('Satisfied with Vote Impact', _pct(int(scores['satisfied']), total))],
+                f"Voting Confidence: {labels['confidence']}", None)
+    if question == 'Non_Student_Factors':
+        return ([('Believe External Influence', _pct(int(scores['believes_external']), total))],
+                f"Process Trust Level: {labels['trust']}", None)
+    if question == 'Manila_Willingness':
+        return ([('Definitely Willing', _pct(int(scores['definitely_willing']), total)),
+                 ('Total Positive Response', _pct(int(scores['positive_willing']), total))],
+                f"Willingness Sentiment: {labels['willingness']}", None)
+    if question == 'Most_Important_Factor':
+        answer, count, _ = summary['top'][question]
+        return [('Top Priority', answer), ('Students who chose this', _pct(count, total))], None, None
+    if question == BARRIERS:
+        answer, count, _ = summary['top'][question]
+        return ([('Top Barrier', answer), ('Students affected', _pct(count, total)),
+                 ('Total Barriers Reported', summary['barriers_reported'])], None, None)
+    breakdown = summary['breakdowns'][question]
+    if question == 'Preferred_Package':
+        answer, count, _ = summary['top'][question]
+        return [('Preferred Package', answer), ('Students who chose this', _pct(count, total))], None, breakdown
+    return [], None, breakdown
+
+
+def _figure(question, counts, chart, title):
+    import plotly.express as px
+
+    if chart == 'pie':
+        return px.pie(values=counts.values, names=counts.index, title=title)
+    if chart == 'barh':
+        # Barriers read bottom-up from the most common, like the dashboard's chart
+        ordered = counts.sort_values() if question == BARRIERS else counts
+        return px.bar(y=ordered.index, x=ordered.values, orientation='h', title=title)
+    return px.bar(x=counts.index, y=counts.values, title=title)
+
+
+# Emoji and pictographs, their variation selectors and joiners: no PDF font here draws them.
+# Other scripts (CJK, Hangul, ...) are kept and drawn with whichever PDF_FONTS are installed
+EMOJI = re.compile('[\U0001F000-\U0001FAFF\u2600-\u27BF\u231A\u231B\u23E9-\u23FA\u2B50\u2B55'
+                   '\uFE0E\uFE0F\u200D\u20E3]')
+# Tried in order for each character (matplotlib's font fallback)
+PDF_FONTS = ['DejaVu Sans', 'Noto Sans CJK SC', 'Noto Sans CJK JP', 'Noto Sans CJK KR', 'Noto Sans',
+             'Arial Unicode MS', 'Microsoft YaHei', 'Malgun Gothic']
+
+
+def _plain(text):
+    return EMOJI.sub('', str(text)).strip()
+
+
+def _pdf_fonts():
+    # Only installed families, so matplotlib does not warn about each missing one
+    from matplotlib import font_manager
+
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return [family for family in PDF_FONTS if family in installed] or ['sans-serif']
+
+
+def _table(rows, columns):
+    head = ''.join(f'<th>{html.escape(str(column))}</th>' for column in columns)
+    body = ''.join('<tr>' + ''.join(f'<td>{html.escape(str(value))}</td>' for value in row) + '</tr>' for row in rows)
+    return f'<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+
+STYLE = """
+body { font-family: sans-serif; max-width: 1100px; margin: 2em auto; color: #222; }
+.row { display: flex; gap: 2em; align-items: flex-start; }
+.row > div { flex: 1; }
+.metric { margin: .4em 0; } .metric b { display: block; font-size: 1.4em; }
+table { border-collapse: collapse; margin: .5em 0; } td, th { border: 1px solid #ddd; padding: .25em .6em; }
+.comment { border-bottom: 1px solid #eee; padding: .4em 0; }
+"""
+
+
+def render_html(report, plotlyjs='directory'):
+    """One section's report as a standalone HTML page; ``plotlyjs`` as in plotly's ``to_html``."""
+    summary = report['summary']
+    label = html.escape(str(summary['label']))
+    total = summary['total']
+    parts = [f'<h1>📊 Complete Analysis for {label}</h1>', f'<p><b>Total Students:</b> {total}</p>',
+             '<h2>👥 Students in this Program-Section</h2>',
+             _table(((k, name, email) for k, (name, email) in
+                     enumerate(report['students'][['Name', 'Email']].itertuples(index=False), 1)),
+                    ['#', 'Name', 'Email'])]
+    include = plotlyjs
+    for question, heading, chart, title in QUESTION_SECTIONS:
+        parts.append(f'<hr><h2>{html.escape(heading)}</h2>')
+        counts = summary['counts'][question]
+        if counts.empty:
+            if question == BARRIERS:
+                parts.append('<p>No barriers reported by students in this section.</p>')
+        else:
+            figure = _figure(question, counts, chart, f"{title} - {summary['label']}")
+            chart_html = figure.to_html(full_html=False, include_plotlyjs=include)
+            # plotly.js is needed once per page
+            include = False
+            metrics, note, breakdown = question_details(summary, question)
+            side = ''.join(f'<div class="metric">{html.escape(name)}<b>{html.escape(str(value))}</b></div>'
+                           for name, value in metrics)
+            if note:
+                side += f'<p><b>{html.escape(note)}</b></p>'
+            if breakdown:
+                side += '<p><b>Breakdown:</b></p>' + _table(breakdown, [ANSWER_LABELS[question], 'Count', 'Percentage'])
+            parts.append(f'<div class="row"><div>{chart_html}</div><div>{side}</div></div>')
+        if question == BARRIERS:
+            parts.append(_comments_html(report))
+    parts.append(_sentiment_html(summary))
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{label}</title>'
+            f'<style>{STYLE}</style></head><body>{"".join(parts)}</body></html>')
+
+
+def _comments_html(report):
+    comments = report['comments']
+    parts = [f'<hr><h2>{html.escape(COMMENTS_HEADING)}</h2>']
+    if comments.empty:
+        parts.append('<p>No comments provided by students in this section.</p>')
+        return ''.join(parts)
+    parts.append(f'<p><b>{len(comments)} students provided comments:</b></p>')
+    if report.get('wordcloud_png'):
+        encoded = base64.b64encode(report['wordcloud_png']).decode('ascii')
+        parts.append(f'<img alt="Word cloud" style="max-width:100%" src="data:image/png;base64,{encoded}">')
+    for name, comment in comments[['Name', 'Additional_Comments']].itertuples(index=False):
+        parts.append(f'<div class="comment"><b>{html.escape(str(name))}:</b> <i>{html.escape(str(comment))}</i></div>')
+    return ''.join(parts)
+
+
+def _sentiment_html(summary):
+    scores = summary['scores']
+    metrics = [('Financial Sentiment', scores['financial']), ('Participation Willingness', scores['participation']),
+               ('Process Trust', scores['process']), ('Overall Sentiment', scores['overall'])]
+    parts = ['<hr><h2>📈 Overall Sentiment Analysis</h2><div class="row">']
+    parts += [f'<div class="metric">{name}<b>{value:.1f}%</b></div>' for name, value in metrics]
+    parts.append(f"</div><p><b>Overall Assessment:</b> {html.escape(summary['labels']['sentiment'])}</p>")
+    parts.append('<h2>🔍 Key Insights &amp; Recommendations</h2><ul>')
+    insights = summary['insights'] or ['Overall positive sentiment with no major concerns identified']
+    # Insights use markdown bold, as in the dashboard
+    parts += ['<li>' + re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', html.escape(insight)) + '</li>' for insight in insights]
+    parts.append('</ul>')
+    return ''.join(parts)
+
+
+def render_pdf(report, path):
+    """One section's report as a PDF: summary page, a page of charts, then students and comments."""
+    import io
+
+    import matplotlib.image as mpimg
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    summary = report['summary']
+    scores = summary['scores']
+    with PdfPages(path) as pdf:
+        page = Figure(figsize=(8.27, 11.69))
+        lines = [(f"Complete Analysis for {summary['label']}", 16, 'bold'),
+                 (f"Total Students: {summary['total']}", 11, 'normal'), ('', 11, 'normal'),
+                 ('Overall Sentiment Analysis', 13, 'bold')]
+        lines += [(f'{name}: {value:.1f}%', 11, 'normal') for name, value in [
+            ('Financial Sentiment', scores['financial']), ('Participation Willingness', scores['participation']),
+            ('Process Trust', scores['process']), ('Overall Sentiment', scores['overall'])]]
+        lines += [(f"Overall Assessment: {_plain(summary['labels']['sentiment'])}", 11, 'bold'), ('', 11, 'normal'),
+                  ('Key Insights & Recommendations', 13, 'bold')]
+        insights = summary['insights'] or ['Overall positive sentiment with no major concerns identified']
+        lines += [('• ' + _plain(insight.replace('**', '')), 10, 'normal') for insight in insights]
+        for question, heading, chart, title in QUESTION_SECTIONS:
+            if summary['counts'][question].empty:
+                continue
+            metrics, note, _ = question_details(summary, question)
+            if metrics or note:
+                lines.append(('', 10, 'normal'))
+                lines.append((_plain(heading), 10, 'bold'))
+                lines += [(f'{name}: {_plain(value)}', 10, 'normal') for name, value in metrics]
+                if note:
+                    lines.append((_plain(note), 10, 'normal'))
+        _write_lines(pdf, page, lines)
+
+        charts = Figure(figsize=(8.27, 11.69))
+        axes = charts.subplots(5, 2).ravel()
+        for ax, (question, heading, chart, title) in zip(axes, QUESTION_SECTIONS):
+            counts = summary['counts'][question]
+            ax.set_title(title, fontsize=9)
+            if counts.empty:
+                ax.axis('off')
+                continue
+            ordered = counts.sort_values()
+            ax.barh([str(answer)[:40] for answer in ordered.index], ordered.values, color='#4c78a8')
+            ax.tick_params(labelsize=6)
+        for ax in axes[len(QUESTION_SECTIONS):]:
+            ax.axis('off')
+        if report.get('wordcloud_png'):
+            axes[len(QUESTION_SECTIONS)].imshow(mpimg.imread(io.BytesIO(report['wordcloud_png']), format='png'))
+            axes[len(QUESTION_SECTIONS)].set_title('Comments', fontsize=9)
+        charts.tight_layout()
+        pdf.savefig(charts)
+
+        lines = [('Students in this Program-Section', 13, 'bold')]
+        lines += [(_plain(f'{k}. {name} <{email}>'), 9, 'normal') for k, (name, email) in
+                  enumerate(report['students'][['Name', 'Email']].itertuples(index=False), 1)]
+        lines += [('', 9, 'normal'), ('Additional comments or suggestions', 13, 'bold')]
+        comments = report['comments']
+        if comments.empty:
+            lines.append(('No comments provided by students in this section.', 9, 'normal'))
+        lines += [(_plain(f'{name}: {comment}'), 9, 'normal')
+                  for name, comment in comments[['Name', 'Additional_Comments']].itertuples(index=False)]
+        _write_lines(pdf, None, lines)
+
+
+def _write_lines(pdf, page, lines, per_page=60, width=110):
+    # Plain text pages; long lines wrap, full pages flow onto new ones
+    import textwrap
+
+    from matplotlib.figure import Figure
+
+    fonts = _pdf_fonts()
+    wrapped = [(chunk, size, weight) for text, size, weight in lines
+               for chunk in (textwrap.wrap(str(text), width) or [''])]
+    for start in range(0, len(wrapped), per_page):
+        figure = page if page is not None and start == 0 else Figure(figsize=(8.27, 11.69))
+        for k, (text, size, weight) in enumerate(wrapped[start:start + per_page]):
+            figure.text(0.06, 0.96 - k * 0.92 / per_page, text, fontsize=size, weight=weight, va='top', family=fonts)
+        pdf.savefig(figure)
+
+
+# Per-process state of a report worker, set once by _start_worker
+_worker = {}
+
+
+def _start_worker(cube, scores, out_dir, formats, plotlyjs, names):
+    _worker.update(cube=cube, scores=scores, out_dir=out_dir, formats=formats, plotlyjs=plotlyjs, names=names)
+
+
+def render_section(task):
+    """Write one section's report files; ``task`` is (label, students, comments, summary, frequencies)."""
+    from survey_wordcloud import render_wordcloud, word_frequencies
+
+    start = time.perf_counter()
+    label, students, comments, summary, frequencies = task
+    if summary is None:
+        summary = section_summary(_worker['cube'], _worker['scores'], label)
+    report = {'summary': summary, 'students': students, 'comments': comments, 'wordcloud_png': None}
+    if not comments.empty:
+        if frequencies is None:
+            frequencies = word_frequencies(comments['Additional_Comments'])
+        if frequencies:
+            report['wordcloud_png'] = render_wordcloud(frequencies, 600, 300, f'Word Cloud of Comments - {label}',
+                                                       (10, 5))
+    stem = os.path.join(_worker['out_dir'], _worker['names'][label])
+    written = []
+    if 'html' in _worker['formats']:
+        with open(f'{stem}.html', 'w', encoding='utf-8') as f:
+            f.write(render_html(report, _worker['plotlyjs']))
+        written.append(f'{stem}.html')
+    if 'pdf' in _worker['formats']:
+        render_pdf(report, f'{stem}.pdf')
+        written.append(f'{stem}.pdf')
+    return label, written, time.perf_counter() - start
+
+
+def section_tasks(df, positions, cube, scores, prebuilt=None):
+    """One task per section of ``cube``: its students, non-blank comments and summary, plus prebuilt parts if any.
+
+    ``positions`` are the selected rows of ``df``; they are grouped by section in one pass,
+    and the summaries come from the prebuilt aggregates or one grouped pass over the cube.
+    """
+    rows = df.iloc[positions]
+    groups = rows.groupby('Program_Section', observed=True).indices
+    summaries = prebuilt.sections if prebuilt is not None else section_summaries(cube, scores)
+    for label in cube.sections():
+        section = rows.iloc[groups.get(label, [])]
+        text = section['Additional_Comments']
+        comments = section.loc[text.notna() & (text.str.strip() != ''), ['Name', 'Additional_Comments']]
+        summary = summaries.get(label)
+        frequencies = prebuilt.word_frequencies.get(label) if prebuilt is not None else None
+        yield label, section[['Name', 'Email']], comments, summary, frequencies
+
+
+def generate_reports(tasks, cube, scores, out_dir, formats=('html',), workers=None, plotlyjs='directory',
+                     log=print):
+    """Render every task across ``workers`` processes (default: one per CPU); returns the files written.
+
+    With ``plotlyjs='directory'`` every page loads one shared plotly.min.js from ``out_dir``,
+    so the reports work offline without embedding 3 MB of JavaScript in each file.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    names = report_filenames(cube.sections())
+    written = []
+    if 'html' in formats and plotlyjs == 'directory':
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        written.append(os.path.join(out_dir, 'plotly.min.js'))
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    done = 0
+    # spawn: the same fresh workers on every platform, and no forked copy of a Streamlit server
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_start_worker,
+                                                initargs=(cube, scores, out_dir, tuple(formats), plotlyjs,
+                                                          names)) as pool:
+        for label, files, seconds in pool.map(render_section, tasks, chunksize=4):
+            done += 1
+            written += files
+            log(f'{done:>5} {label:<30} {seconds:6.2f}s')
+    written.append(write_index(out_dir, cube, scores, formats, names))
+    log(f'{done} sections in {time.perf_counter() - start:.1f}s with {workers} workers')
+    return written
+
+
+def write_index(out_dir, cube, scores, formats, names=None):
+    """index.html: the section comparison table with a link to each section's reports.
+
+    ``names`` are the file name stems the reports were written under (report_filenames).
+    """
+    comparison = comparison_table(cube, scores)
+    names = names or report_filenames(cube.sections())
+    rows = []
+    for values in comparison.itertuples(index=False):
+        stem = names[values[0]]
+        links = ' '.join(f'<a href="{stem}.{fmt}">{fmt.upper()}</a>' for fmt in FORMATS if fmt in formats)
+        rows.append([html.escape(str(value)) for value in values] + [links])
+    head = ''.join(f'<th>{html.escape(str(column))}</th>' for column in list(comparison.columns) + ['Report'])
+    body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+    path = os.path.join(out_dir, 'index.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Program-Section Reports</title>'
+                f'<style>{STYLE}</style></head><body><h1>📋 Program-Section Reports</h1>'
+                f'<p>{cube.total} responses · {len(rows)} sections · {time.strftime("%Y-%m-%d %H:%M")}</p>'
+                f'<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table></body></html>')
+    return path
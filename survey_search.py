@@ -0,0 +1,249 @@
+import re
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Full-text search over Additional_Comments. The inverted index lists, for every word, the
+# rows and word positions it occurs at, so a query reads only its own words' postings and
+# never the comments themselves
+
+# Words: runs of letters and digits, compared in lower case ("Don't" -> "don", "t"). Comments
+# are split by Arrow (RE2 syntax) without a Python string per word; WORD finds the same runs
+# in Python, for queries and highlighting, where compiling the RE2 pattern would dominate
+SEPARATORS = r'[^\pL\pN]+'
+WORD = re.compile(r'[^\W_]+')
+# A quoted phrase, or one bare query word; either excluded with a leading minus
+_CLAUSE = re.compile(r'(-?)(?:"([^"]*)"?|(\S+))')
+# Word positions per comment are below this; a posting's (row, position) packs into one int64
+_POSITION_BITS = 24
+
+
+def _split(texts):
+    # Words of an Arrow string array, and the index of the text each came from
+    parts = pc.split_pattern_regex(pc.utf8_lower(texts), SEPARATORS)
+    found, parents = pc.list_flatten(parts), pc.list_parent_indices(parts)
+    # Separators at either end leave empty strings
+    keep = pc.greater(pc.utf8_length(found), 0)
+    return pc.filter(found, keep), pc.filter(parents, keep).to_numpy()
+
+
+def _lower(words):
+    # Arrow's lower case, the one the index was built with
+    return pc.utf8_lower(pa.array(words, pa.string())).to_pylist() if words else []
+
+
+def parse_query(query):
+    """Clauses of ``query``, each (words, negated) with ``words`` a list of (word, is_prefix)
+    matched as consecutive words.
+
+    ``visa`` is a keyword, ``vis*`` a prefix and ``"boat ride"`` a phrase (whose words may
+    be prefixes too). A word that splits into several, like ``e-mail``, is matched as a phrase.
+    ``-visa`` or ``-"boat ride"`` excludes the comments the clause matches.
+    """
+    found = _CLAUSE.findall(query)
+    texts = [phrase if phrase else word for _, phrase, word in found]
+    split = [WORD.findall(text) for text in texts]
+    # Lower-cased together: one Arrow call for the whole query
+    lowered = iter(_lower([word for parts in split for word in parts]))
+    clauses = []
+    for (minus, _, _), text, parts in zip(found, texts, split):
+        if not parts:
+            continue
+        words = [(next(lowered), False) for _ in parts]
+        if re.search(r'[^\W_]\*+\s*$', text):
+            # Only a star right after a word makes it a prefix
+            words[-1] = (words[-1][0], True)
+        clauses.append((words, bool(minus)))
+    return clauses
+
+
+class _Segment:
+    """Postings of a run of rows, grouped by word: word ``k`` of ``vocabulary`` (sorted) occurs
+    at ``keys[offsets[k]:offsets[k + 1]]``, each key a (row, position) packed in order."""
+
+    def __init__(self, vocabulary, offsets, keys):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.keys = keys
+        # One past the last row
+        self.end = int(keys.max() >> _POSITION_BITS) + 1 if len(keys) else 0
+
+    @classmethod
+    def from_postings(cls, codes, vocabulary, keys):
+        # Posting i is word vocabulary[codes[i]] (``vocabulary`` sorted); postings must come in
+        # key order, which the stable sort keeps within each word
+        order = np.argsort(codes, kind='stable')
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(vocabulary)), out=offsets[1:])
+        return cls(vocabulary, offsets, keys[order])
+
+    @classmethod
+    def build(cls, texts, rows):
+        """Segment of the Arrow string array ``texts``, the comments of ``rows``."""
+        found, parents = _split(texts)
+        encoded = pc.dictionary_encode(found)
+        # Sorted vocabulary (by code point, as Python compares str), so prefixes are ranges of it
+        order = pc.array_sort_indices(encoded.dictionary).to_numpy()
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        # Position of every word within its own comment
+        positions = np.arange(len(parents)) - np.searchsorted(parents, parents)
+        return cls.from_postings(rank[encoded.indices.to_numpy()].astype(np.int32),
+                                 np.asarray(encoded.dictionary.take(order).to_pylist(), dtype=object),
+                                 (rows[parents] << _POSITION_BITS) | positions)
+
+    @classmethod
+    def merge(cls, older, newer):
+        """One segment of ``older``'s rows followed by ``newer``'s."""
+        vocabulary = np.union1d(older.vocabulary, newer.vocabulary)
+        codes = [np.repeat(np.searchsorted(vocabulary, segment.vocabulary).astype(np.int32),
+                           np.diff(segment.offsets)) for segment in (older, newer)]
+        return cls.from_postings(np.concatenate(codes), vocabulary, np.concatenate([older.keys, newer.keys]))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def span(self, word, prefix):
+        """Range of vocabulary entries equal to ``word``, or starting with it when ``prefix``."""
+        if prefix:
+            # Words starting with ``word`` sort between it and it followed by the last code point
+            return np.searchsorted(self.vocabulary, [word, word + '\U0010ffff'])
+        return np.searchsorted(self.vocabulary, word, 'left'), np.searchsorted(self.vocabulary, word, 'right')
+
+    def size(self, word, prefix):
+        first, last = self.span(word, prefix)
+        return self.offsets[last] - self.offsets[first]
+
+    def matched_terms(self, word, prefix):
+        first, last = self.span(word, prefix)
+        return self.vocabulary[first:last]
+
+    def postings(self, word, prefix):
+        """Sorted keys of every occurrence of the word, or of any word with the prefix."""
+        first, last = self.span(word, prefix)
+        keys = self.keys[self.offsets[first]:self.offsets[last]]
+        # Each word's keys are in order; several words' need sorting together
+        return keys if last - first <= 1 else np.sort(keys)
+
+    def _rows(self, word, prefix):
+        first, last = self.span(word, prefix)
+        keys = self.keys[self.offsets[first]:self.offsets[last]]
+        if last - first <= 1:
+            return _distinct(keys >> _POSITION_BITS)
+        # Marking rows instead of sorting the keys of every word with the prefix, unless they are few
+        if len(keys) * 8 < self.end:
+            return _distinct(np.sort(keys >> _POSITION_BITS))
+        seen = np.zeros(self.end, dtype=bool)
+        seen[keys >> _POSITION_BITS] = True
+        return np.flatnonzero(seen)
+
+    def search(self, clause):
+        """Sorted rows where the clause's words occur one after another."""
+        if len(clause) == 1:
+            return self._rows(*clause[0])
+        # Phrase starts from the rarest word; each other word is then looked up at its offset from
+        # them, so a common word in the phrase costs a binary search per candidate, not a pass
+        # over its postings. A key minus an offset larger than its position matches nothing: no
+        # position is that close to the limit
+        offset, (word, prefix) = min(enumerate(clause), key=lambda item: self.size(*item[1]))
+        starts = self.postings(word, prefix) - offset
+        for other, (word, prefix) in enumerate(clause):
+            if other != offset and len(starts):
+                starts = within(starts + other, self.postings(word, prefix)) - other
+        return _distinct(starts >> _POSITION_BITS)
+
+
+class CommentIndex:
+    """Inverted index over the non-blank comments of a survey frame, by row position.
+
+    Appended rows are indexed on their own with ``extend``; the new segment is merged
+    into the older ones only once it is as large as they are, so each posting is
+    re-merged a few times at most. Instances are never modified after they are built.
+    """
+
+    def __init__(self, segments=(), comments=0):
+        self.segments = list(segments)
+        # Rows with a non-blank comment
+        self.comments = comments
+
+    @classmethod
+    def build(cls, df, column='Additional_Comments'):
+        """Index of every comment of ``df``."""
+        return cls().extend(df, 0, column)
+
+    def extend(self, df, start, column='Additional_Comments'):
+        """This index plus the comments of ``df``'s rows from position ``start`` (the first new row) on."""
+        text = df[column].iloc[start:]
+        # The rows the Comments tab lists (survey_analytics.RowView.nonblank)
+        nonblank = (text.notna() & (text.str.strip() != '')).to_numpy(dtype=bool, na_value=False)
+        # Arrow strings are passed as they are; object columns are converted once
+        texts = pa.array(text[nonblank], pa.large_string())
+        if isinstance(texts, pa.ChunkedArray):
+            texts = texts.combine_chunks()
+        segment = _Segment.build(texts, start + np.flatnonzero(nonblank))
+        segments = self.segments + [segment] if len(segment) else list(self.segments)
+        while len(segments) > 1 and len(segments[-1]) >= len(segments[-2]):
+            newer = segments.pop()
+            segments[-1] = _Segment.merge(segments[-1], newer)
+        return CommentIndex(segments, self.comments + int(nonblank.sum()))
+
+    def search(self, query):
+        """Sorted positions of the rows whose comment matches every clause of ``query`` and no
+        excluded one. A query of excluded clauses alone matches nothing."""
+        clauses = parse_query(query) if isinstance(query, str) else query
+        wanted = [words for words, negated in clauses if not negated]
+        excluded = [words for words, negated in clauses if negated]
+        if not wanted:
+            return np.zeros(0, dtype=np.int64)
+        found = []
+        for segment in self.segments:
+            rows = None
+            # Rarest clause first, so the others are looked up for fewer rows
+            for clause in sorted(wanted, key=lambda clause: min(segment.size(*word) for word in clause)):
+                matched = segment.search(clause)
+                rows = matched if rows is None else within(rows, matched)
+                if not len(rows):
+                    break
+            for clause in excluded:
+                if len(rows):
+                    rows = rows[~np.isin(rows, segment.search(clause), assume_unique=True)]
+            found.append(rows)
+        # Segments cover successive rows, so their results are already in order
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def matched_terms(self, query):
+        """Indexed words the query matches, for highlighting (every word a prefix expands to).
+        Excluded clauses are left out: no matching comment contains them."""
+        clauses = parse_query(query) if isinstance(query, str) else query
+        return {term for segment in self.segments for words, negated in clauses if not negated
+                for word, prefix in words for term in segment.matched_terms(word, prefix)}
+
+
+def _distinct(rows):
+    # Distinct values of a sorted array
+    if not len(rows):
+        return rows
+    return rows[np.concatenate(([True], rows[1:] != rows[:-1]))]
+
+
+def within(found, positions):
+    """The rows of ``found`` that are also in ``positions`` (both sorted): a binary search per row of ``found``."""
+    at = np.searchsorted(positions, found)
+    keep = at < len(positions)
+    keep[keep] = positions[at[keep]] == found[keep]
+    return found[keep]
+
+
+def highlight(text, terms, before='**', after='**'):
+    """``text`` with every word in ``terms`` (lower case, as indexed) wrapped in ``before``/``after``."""
+    found = list(WORD.finditer(text))
+    if not terms or not found:
+        return text
+    lowered = _lower([match.group() for match in found])
+    pieces, end = [], 0
+    for match, word in zip(found, lowered):
+        if word in terms:
+            pieces += [text[end:match.start()], before, match.group(), after]
+            end = match.end()
+    return ''.join(pieces) + text[end:]
@@ -0,0 +1,470 @@
+import functools
+import operator
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from survey_analytics import BARRIERS, CUBE_LEVELS, GROUP_KEYS, QUESTIONS, SurveyCube, section_scores
+from survey_data import (
+    CHOICE_COLUMNS, CHUNK_ROWS, COLUMNS, MULTISELECT_DELIMITER, barrier_column, choice_dtype, fingerprint, frame_memory
+)
+from survey_stream import stream_survey
+
+# Every semester's responses in one SQLite file. Selections become WHERE clauses and
+# aggregates GROUP BYs over indexed columns, so pandas only ever holds result-sized data
+
+# Bump whenever the tables below change; older databases have to be ingested again
+# 2: answers are stored as the text read from the CSV (sections were numbers when they looked like them)
+SCHEMA_VERSION = 2
+# Columns that can be fetched from ``responses``
+ROW_COLUMNS = COLUMNS + ['Program_Section']
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY, path TEXT, sha256 TEXT, rows INTEGER, last_timestamp, ingested TEXT
+);
+-- Answers are kept as read, as text; Responded_At is Timestamp as sortable ISO text
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY, source TEXT NOT NULL, Responded_At TEXT,
+    {', '.join(f'"{column}"' for column in ROW_COLUMNS)}
+);
+-- One row per ticked checkbox, instead of a column per (possibly free-text) option
+CREATE TABLE IF NOT EXISTS barriers (response_id INTEGER NOT NULL, option NOT NULL);
+-- Each source's SurveyCube, so Program/Section selections never scan responses
+CREATE TABLE IF NOT EXISTS cube_counts (source TEXT NOT NULL, Program, Section, question, answer, count INTEGER);
+CREATE TABLE IF NOT EXISTS cube_totals (source TEXT NOT NULL, Program, Section, count INTEGER);
+-- Distinct answers of every filter column and the first response giving them
+CREATE TABLE IF NOT EXISTS choices (question TEXT NOT NULL, answer NOT NULL, first_id INTEGER);
+CREATE INDEX IF NOT EXISTS responses_source ON responses (source);
+CREATE INDEX IF NOT EXISTS responses_program ON responses (Program, Section);
+CREATE INDEX IF NOT EXISTS responses_section ON responses (Section);
+CREATE INDEX IF NOT EXISTS responses_label ON responses (Program_Section);
+CREATE INDEX IF NOT EXISTS responses_responded_at ON responses (Responded_At);
+{''.join(f'CREATE INDEX IF NOT EXISTS "responses_{question}" ON responses ("{question}", Program, Section);'
+         for question in QUESTIONS)}
+CREATE INDEX IF NOT EXISTS barriers_option ON barriers (option, response_id);
+CREATE INDEX IF NOT EXISTS barriers_response ON barriers (response_id);
+CREATE INDEX IF NOT EXISTS cube_counts_section ON cube_counts (Program, Section);
+CREATE INDEX IF NOT EXISTS cube_counts_source ON cube_counts (source);
+CREATE INDEX IF NOT EXISTS cube_totals_source ON cube_totals (source);
+CREATE INDEX IF NOT EXISTS choices_question ON choices (question, first_id);
+"""
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _param(value):
+    # sqlite3 binds Python scalars only
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _records(frame):
+    """Rows of ``frame`` as tuples of Python values, missing values as None."""
+    frame = frame.astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def _nonblank(text):
+    # Registered as a SQL function so "blank" means exactly what str.strip() says it means
+    return text is not None and str(text).strip() != ''
+
+
+class SqlCondition:
+    """A WHERE clause over ``responses`` and its parameters; ``&`` and ``|`` combine them like boolean masks."""
+
+    def __init__(self, sql='1', params=()):
+        self.sql = sql
+        self.params = tuple(params)
+
+    def __and__(self, other):
+        return SqlCondition(f'({self.sql}) AND ({other.sql})', self.params + other.params)
+
+    def __or__(self, other):
+        return SqlCondition(f'({self.sql}) OR ({other.sql})', self.params + other.params)
+
+    def __invert__(self):
+        return SqlCondition(f'NOT ({self.sql})', self.params)
+
+
+class SqlColumn:
+    """A column of ``responses``; comparisons give SqlConditions instead of masks."""
+
+    def __init__(self, column):
+        self.sql = _quote(column)
+
+    __hash__ = None
+
+    def __eq__(self, value):
+        return SqlCondition(f'{self.sql} = ?', [_param(value)])
+
+    def __ne__(self, value):
+        return SqlCondition(f'{self.sql} != ?', [_param(value)])
+
+    def isin(self, values):
+        values = [_param(value) for value in values]
+        return SqlCondition(f"{self.sql} IN ({', '.join('?' * len(values))})", values)
+
+    def notna(self):
+        return SqlCondition(f'{self.sql} IS NOT NULL')
+
+
+class BarrierColumn(SqlColumn):
+    """A Barrier_* indicator, which the database keeps as rows of ``barriers``; 1 means ticked."""
+
+    def __init__(self, option):
+        self.option = option
+
+    def __eq__(self, value):
+        ticked = SqlCondition('id IN (SELECT response_id FROM barriers WHERE option = ?)', [self.option])
+        return ticked if value else ~ticked
+
+    def __ne__(self, value):
+        return self == (not value)
+
+    def isin(self, values):
+        return functools.reduce(operator.or_, (self == value for value in values), SqlCondition('0'))
+
+    def notna(self):
+        return SqlCondition()
+
+
+class SqlSelection:
+    """Condition and aggregates for one normalized sidebar selection, like ``survey_analytics.Selection``."""
+
+    def __init__(self, where, cube):
+        self.where = where
+        self.cube = cube
+        self.scores = section_scores(cube)
+
+
+class SqlRowView:
+    """RowView over the rows of a database selection, read one query at a time.
+
+    ``view[column]`` is a SqlColumn, so ``view.rows(view['Program_Section'] == label, columns)``
+    fetches just those rows and columns. ``prepare(frame)`` may rewrite each fetched frame
+    (e.g. pseudonymize it).
+    """
+
+    def __init__(self, database, where, prepare=None):
+        self.database = database
+        self.where = where
+        self.prepare = prepare
+        self._len = None
+        self._fetched = 0
+
+    def __len__(self):
+        if self._len is None:
+            self._len = self.database.count(self.where)
+        return self._len
+
+    def __getitem__(self, column):
+        options = self.database.barrier_columns()
+        return BarrierColumn(options[column]) if column in options else SqlColumn(column)
+
+    def nonblank(self, column):
+        """Condition for rows whose ``column`` holds more than whitespace."""
+        return SqlCondition(f'nonblank({_quote(column)})')
+
+    def rows(self, condition, columns):
+        """Frame of ``columns`` for the rows of the view matching ``condition``."""
+        frame = self.database.rows(self.where & condition, columns)
+        if self.prepare is not None:
+            frame = self.prepare(frame)
+        self._fetched += frame_memory(frame)
+        return frame
+
+    def memory(self):
+        """Bytes fetched for this view so far."""
+        return self._fetched
+
+
+class SurveyDatabase:
+    """Survey responses of any number of CSV files (sources) in an embedded SQLite database.
+
+    ``ingest`` stores a cleaned frame and its cube under a source name, replacing an
+    earlier version of that source. ``select`` answers a sidebar selection the way
+    ``survey_analytics.select`` does: Program/Section selections from the stored cubes,
+    answer filters with one GROUP BY per question over the indexed responses.
+    Connections are per thread, so one instance can serve every session.
+    """
+
+    def __init__(self, path, create=False):
+        if not create and not os.path.exists(path):
+            raise FileNotFoundError(f'{path} does not exist; create it with `python survey_cli.py ingest`')
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        if create:
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.execute('INSERT OR IGNORE INTO meta VALUES (?, ?)', ('schema_version', SCHEMA_VERSION))
+        version = connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or version[0] != SCHEMA_VERSION:
+            raise ValueError(f'{path} was written by another version of survey_sql; ingest the CSV files again')
+        self._choices = {}
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path)
+            connection.create_function('nonblank', 1, _nonblank, deterministic=True)
+        return connection
+
+    def close(self):
+        """Close the calling thread's connection; the next query opens a new one."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _query(self, sql, params=()):
+        return self._connection().execute(sql, params).fetchall()
+
+    def ingest(self, source, df, unique_barriers, cube, info, path=None):
+        """Store the cleaned survey ``df`` and its ``cube`` as ``source``, replacing the source's previous rows.
+
+        ``info`` is the ingest dict of ``survey_data.ingest_survey``. Returns False, without
+        writing, when the source already holds that content (same sha256).
+        """
+        if self._stored_sha256(source) == info['sha256']:
+            return False
+        connection = self._connection()
+        with connection:
+            self._delete(connection, source)
+            first = self._next_id(connection)
+            self._insert_rows(connection, source, df, unique_barriers, first + np.arange(len(df)))
+            self._insert_source(connection, source, path, info['sha256'], len(df), info['last_timestamp'], cube)
+        connection.execute('PRAGMA optimize')
+        self._choices = {}
+        return True
+
+    def ingest_csv(self, source, path, chunksize=CHUNK_ROWS, delimiter=MULTISELECT_DELIMITER):
+        """Stream the CSV at ``path`` into ``source``, ``chunksize`` rows at a time; same tables as ``ingest``.
+
+        Only one chunk and the cube are in memory at once. Returns the file's
+        ``survey_stream.StreamedSurvey``, or None when the source already holds it.
+        """
+        sha256 = fingerprint(path)['sha256']
+        if self._stored_sha256(source) == sha256:
+            return None
+        connection = self._connection()
+        with connection:
+            self._delete(connection, source)
+            first = self._next_id(connection)
+
+            def insert(df, unique_barriers):
+                # Chunk row labels run on through the file, so ids follow it as ``ingest``'s do
+                self._insert_rows(connection, source, df, unique_barriers, first + df.index.to_numpy())
+
+            survey = stream_survey(path, chunksize, delimiter, keep_comments=False, on_chunk=insert)
+            self._insert_source(connection, source, path, sha256, survey.rows, survey.last_timestamp, survey.cube)
+        connection.execute('PRAGMA optimize')
+        self._choices = {}
+        return survey
+
+    def _stored_sha256(self, source):
+        stored = self._query('SELECT sha256 FROM sources WHERE name = ?', (source,))
+        return stored[0][0] if stored else None
+
+    def _next_id(self, connection):
+        return connection.execute('SELECT COALESCE(MAX(id) + 1, 0) FROM responses').fetchone()[0]
+
+    def _insert_rows(self, connection, source, df, unique_barriers, ids):
+        responded = pd.to_datetime(df['Timestamp'].astype(object), errors='coerce', format='mixed')
+        rows = pd.DataFrame({'id': ids, 'source': source,
+                             'Responded_At': responded.dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()})
+        rows = pd.concat([rows, df[ROW_COLUMNS].reset_index(drop=True)], axis=1)
+        connection.executemany(
+            f"INSERT INTO responses (id, source, Responded_At, {', '.join(map(_quote, ROW_COLUMNS))}) "
+            f"VALUES ({', '.join('?' * len(rows.columns))})", _records(rows))
+        if len(unique_barriers):
+            hits, options = np.nonzero(df[[barrier_column(b) for b in unique_barriers]].to_numpy())
+            connection.executemany('INSERT INTO barriers VALUES (?, ?)', zip(
+                ids[hits].tolist(), np.asarray(unique_barriers, dtype=object)[options].tolist()))
+
+    def _insert_source(self, connection, source, path, sha256, rows, last_timestamp, cube):
+        counts = cube.counts.rename('count').reset_index()
+        connection.executemany('INSERT INTO cube_counts VALUES (?, ?, ?, ?, ?, ?)',
+                               [(source,) + row for row in _records(counts)])
+        totals = cube.totals.rename('count').reset_index()
+        connection.executemany('INSERT INTO cube_totals VALUES (?, ?, ?, ?)',
+                               [(source,) + row for row in _records(totals)])
+        connection.execute('INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?)', (
+            source, path, sha256, rows, _param(last_timestamp), time.strftime('%Y-%m-%dT%H:%M:%S%z')))
+        self._update_choices(connection)
+
+    def remove(self, source):
+        """Delete every row of ``source``; False if there was no such source."""
+        connection = self._connection()
+        with connection:
+            removed = self._delete(connection, source)
+            self._update_choices(connection)
+        self._choices = {}
+        return removed
+
+    def _delete(self, connection, source):
+        connection.execute('DELETE FROM barriers WHERE response_id IN (SELECT id FROM responses WHERE source = ?)',
+                           (source,))
+        for table in ['responses', 'cube_counts', 'cube_totals']:
+            connection.execute(f'DELETE FROM {table} WHERE source = ?', (source,))
+        return connection.execute('DELETE FROM sources WHERE name = ?', (source,)).rowcount > 0
+
+    def _update_choices(self, connection):
+        connection.execute('DELETE FROM choices')
+        for column in GROUP_KEYS + CHOICE_COLUMNS + ['Program_Section']:
+            connection.execute(f'INSERT INTO choices SELECT ?, {_quote(column)}, MIN(id) FROM responses '
+                               f'WHERE {_quote(column)} IS NOT NULL GROUP BY {_quote(column)}', (column,))
+        connection.execute('INSERT INTO choices SELECT ?, option, MIN(response_id) FROM barriers GROUP BY option',
+                           (BARRIERS,))
+
+    def sources(self):
+        """One row per ingested source: name, path, sha256, rows, last_timestamp and when it was ingested."""
+        return pd.DataFrame(self._query('SELECT * FROM sources ORDER BY ingested'),
+                            columns=['name', 'path', 'sha256', 'rows', 'last_timestamp', 'ingested'])
+
+    def info(self):
+        """Like the ingest dict of a loaded CSV: ``rows``, ``last_timestamp`` and the ``sources``."""
+        rows, sources = self._query('SELECT COALESCE(SUM(rows), 0), COUNT(*) FROM sources')[0]
+        latest = self._query('SELECT Timestamp FROM responses WHERE Responded_At IS NOT NULL '
+                             'ORDER BY Responded_At DESC, id DESC LIMIT 1')
+        return {'rows': rows, 'last_timestamp': latest[0][0] if latest else None, 'sources': sources}
+
+    def _answers(self, column):
+        # Distinct answers in order of first appearance, cached until the next write
+        if column not in self._choices:
+            self._choices[column] = [answer for answer, in self._query(
+                'SELECT answer FROM choices WHERE question = ? ORDER BY first_id', (column,))]
+        return self._choices[column]
+
+    @property
+    def unique_barriers(self):
+        return sorted(self._answers(BARRIERS))
+
+    def barrier_columns(self):
+        """{Barrier_* column: option}."""
+        return {barrier_column(barrier): barrier for barrier in self._answers(BARRIERS)}
+
+    def dtype(self, column):
+        """The categorical dtype ``column`` has in a frame loaded from the same CSV files."""
+        return choice_dtype(column, self._answers(column))
+
+    def values(self, column):
+        """Filter options for ``column``, in the order BitmapIndex.values gives them."""
+        if column == BARRIERS:
+            return self.unique_barriers
+        if column in CHOICE_COLUMNS:
+            present = set(self._answers(column))
+            return [answer for answer in self.dtype(column).categories if answer in present]
+        return list(self._answers(column))
+
+    def selection(self, programs=None, sections=None, answers=None, match_all=True, since=None, until=None):
+        """Condition for a sidebar selection, with the semantics of ``survey_analytics.select``.
+
+        ``None`` selects every program or section; ``since``/``until`` bound the response
+        time (ISO text such as '2025-08-01', e.g. for one semester).
+        """
+        where = SqlCondition()
+        if programs is not None:
+            where &= SqlColumn('Program').isin(programs)
+        if sections is not None:
+            where &= SqlColumn('Section').isin(sections)
+        if since is not None:
+            where &= SqlCondition('Responded_At >= ?', [since])
+        if until is not None:
+            where &= SqlCondition('Responded_At < ?', [until])
+        matches = []
+        for column, values in (answers or {}).items():
+            if not len(values):
+                continue
+            if column == BARRIERS:
+                values = [_param(value) for value in values]
+                matches.append(SqlCondition(
+                    f"id IN (SELECT response_id FROM barriers WHERE option IN ({', '.join('?' * len(values))}))",
+                    values))
+            else:
+                matches.append(SqlColumn(column).isin(values))
+        if matches:
+            where &= functools.reduce(operator.and_ if match_all else operator.or_, matches)
+        return where
+
+    def select(self, programs=None, sections=None, answers=None, match_all=True, since=None, until=None):
+        """SqlSelection of a sidebar selection; see ``selection`` for the arguments."""
+        where = self.selection(programs, sections, answers, match_all, since, until)
+        if any(len(values) for values in (answers or {}).values()) or since is not None or until is not None:
+            # Cuts across sections, so the selection gets its own cube
+            return SqlSelection(where, self.cube(where))
+        return SqlSelection(where, self.stored_cube(programs, sections))
+
+    def stored_cube(self, programs=None, sections=None):
+        """Cube of the given programs and sections, summed from the cubes stored at ingest.
+
+        The cells are filtered by SQLite but summed over sources by pandas, whose hash
+        aggregation beats SQLite's sorting GROUP BY on these result-sized rows.
+        """
+        where = SqlCondition()
+        if programs is not None:
+            where &= SqlColumn('Program').isin(programs)
+        if sections is not None:
+            where &= SqlColumn('Section').isin(sections)
+        counts = self._query(f'SELECT Program, Section, question, answer, count FROM cube_counts WHERE {where.sql}',
+                             where.params)
+        totals = self._query(f'SELECT Program, Section, count FROM cube_totals WHERE {where.sql}', where.params)
+        return self._cube(counts, totals)
+
+    def cube(self, where=None):
+        """Cube of the responses matching ``where`` (a SqlCondition), counted by SQLite."""
+        where = (where or SqlCondition()) & SqlCondition('Program IS NOT NULL AND Section IS NOT NULL')
+        connection = self._connection()
+        # The matching rows are found once, into a table of this connection, rather than once per question
+        connection.execute('DROP TABLE IF EXISTS temp.selected')
+        connection.execute(f"CREATE TEMP TABLE selected AS SELECT id, Program, Section, "
+                           f"{', '.join(map(_quote, QUESTIONS))} FROM responses WHERE {where.sql}", where.params)
+        try:
+            totals = self._query('SELECT Program, Section, COUNT(*) FROM temp.selected GROUP BY Program, Section')
+            counts = []
+            for question in QUESTIONS:
+                column = _quote(question)
+                counts += self._query(f'SELECT Program, Section, ?, {column}, COUNT(*) FROM temp.selected '
+                                      f'WHERE {column} IS NOT NULL GROUP BY Program, Section, {column}', (question,))
+            counts += self._query('SELECT Program, Section, ?, option, COUNT(*) FROM temp.selected '
+                                  'JOIN barriers ON barriers.response_id = selected.id '
+                                  'GROUP BY Program, Section, option', (BARRIERS,))
+        finally:
+            connection.execute('DROP TABLE temp.selected')
+        return self._cube(counts, totals)
+
+    def _cube(self, counts, totals):
+        # Rows of (keys..., count); keys may repeat, e.g. one row per source
+        counts = pd.DataFrame(counts, columns=CUBE_LEVELS + ['count'])
+        totals = pd.DataFrame(totals, columns=GROUP_KEYS + ['count'])
+        levels = {question: list(self.dtype(question).categories) for question in QUESTIONS}
+        return SurveyCube(
+            counts.groupby(CUBE_LEVELS, sort=True)['count'].sum().astype(np.int64).rename(None),
+            totals.groupby(GROUP_KEYS, sort=True)['count'].sum().astype(np.int64).rename(None),
+            levels
+        )
+
+    def count(self, where=None):
+        where = where or SqlCondition()
+        return self._query(f'SELECT COUNT(*) FROM responses WHERE {where.sql}', where.params)[0][0]
+
+    def rows(self, where, columns):
+        """Frame of ``columns`` for the responses matching ``where``, indexed by response id.
+
+        Choice columns come back as the same categoricals a loaded CSV has.
+        """
+        records = self._query(f"SELECT id, {', '.join(map(_quote, columns))} FROM responses "
+                              f"WHERE {where.sql} ORDER BY id", where.params)
+        frame = pd.DataFrame.from_records(records, columns=['id'] + list(columns)).set_index('id')
+        frame.index.name = None
+        for column in columns:
+            if column in CHOICE_COLUMNS or column == 'Program_Section':
+                frame[column] = frame[column].astype(self.dtype(column))
+        return frame
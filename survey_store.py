@@ -0,0 +1,120 @@
+import threading
+
+from survey_analytics import build_cube, build_index
+from survey_data import CACHE_DIR, MULTISELECT_DELIMITER, concat_surveys, frame_memory, ingest_survey
+from survey_search import CommentIndex
+from survey_waves import discover_waves, load_waves
+
+
+class DataVersion:
+    """One loaded version of the survey: rows, aggregates and indexes, never modified after loading."""
+
+    def __init__(self, state, df, unique_barriers, ingest, cube, index, comments, wave_cubes=None):
+        self.state = state
+        self.df = df
+        self.unique_barriers = unique_barriers
+        self.ingest = ingest
+        self.cube = cube
+        self.index = index
+        # survey_search.CommentIndex over Additional_Comments
+        self.comments = comments
+        # {wave: SurveyCube} when several wave files were loaded together
+        self.wave_cubes = wave_cubes
+        self.memory = frame_memory(df)
+
+
+class SurveyStore:
+    """Process-wide holder of the newest survey version, shared read-only by every session.
+
+    ``st.cache_data`` hands each caller its own unpickled copy of the frame; this
+    store hands out the same object, so N sessions cost one frame plus their own
+    filter state. ``get(state)`` reloads once when the (size, mtime) stamp moves,
+    and merges appended rows into the previous cube and comment index instead of
+    regrouping and re-tokenizing them.
+    ``prepare(df)`` may rewrite a freshly loaded frame (e.g. pseudonymize it)
+    before it is shared; after an append it is given only the new rows, so it
+    must treat each row on its own. With ``waves``, a glob pattern, every matching file is
+    loaded as one wave (see ``survey_waves``) instead of ``path``; pass
+    ``survey_waves.waves_state(waves)`` as the state.
+    """
+
+    def __init__(self, path='109.csv', cache_dir=CACHE_DIR, delimiter=MULTISELECT_DELIMITER, lean=False,
+                 prepare=None, waves=None):
+        self.path = path
+        self.waves = waves
+        self.cache_dir = cache_dir
+        self.delimiter = delimiter
+        self.lean = lean
+        self.prepare = prepare
+        self.loads = 0
+        self._current = None
+        self._lock = threading.Lock()
+        self._preloading = None
+        self._preload_lock = threading.Lock()
+
+    def get(self, state):
+        current = self._current
+        if current is not None and current.state == state:
+            return current
+        with self._lock:
+            # Another session may have loaded it while this one waited
+            if self._current is None or self._current.state != state:
+                self._current = self._load(state, self._current)
+            return self._current
+
+    def loaded(self, state):
+        """The version for ``state`` if it is already loaded, else None; never waits."""
+        current = self._current
+        return current if current is not None and current.state == state else None
+
+    def preload(self, state):
+        """Start loading ``state`` on a background thread, unless it is loaded or already loading."""
+        with self._preload_lock:
+            if self.loaded(state) is not None or self._preloading == state:
+                return
+            self._preloading = state
+        threading.Thread(target=self._preload, args=(state,), name='survey-preload', daemon=True).start()
+
+    def _preload(self, state):
+        try:
+            self.get(state)
+        finally:
+            # Also after a failure, so the next preload (or get) tries again
+            with self._preload_lock:
+                self._preloading = None
+
+    def _load(self, state, previous):
+        if self.waves is not None:
+            return self._load_waves(state)
+        df, unique_barriers, ingest = ingest_survey(self.path, self.cache_dir, self.delimiter, self.lean)
+        appended = previous is not None and ingest['base_sha256'] == previous.ingest['sha256']
+        if self.prepare is not None and appended:
+            # The previous frame was prepared already: only the appended rows go through prepare
+            tail = self.prepare(df.iloc[ingest['base_rows']:].copy())
+            df, _ = concat_surveys([(previous.df, previous.unique_barriers), (tail, unique_barriers)])
+        elif self.prepare is not None:
+            df = self.prepare(df)
+        if appended:
+            # Only the appended responses need aggregating and indexing
+            cube = previous.cube.merge(build_cube(df.iloc[ingest['base_rows']:], unique_barriers))
+            comments = previous.comments.extend(df, ingest['base_rows'])
+        else:
+            cube = build_cube(df, unique_barriers)
+            comments = CommentIndex.build(df)
+        self.loads += 1
+        return DataVersion(state, df, unique_barriers, ingest, cube, build_index(df, unique_barriers), comments)
+
+    def _load_waves(self, state):
+        df, unique_barriers, ingest, cube, wave_cubes = load_waves(
+            discover_waves(self.waves), self.cache_dir, self.delimiter, self.lean)
+        if self.prepare is not None:
+            df = self.prepare(df)
+        self.loads += 1
+        return DataVersion(state, df, unique_barriers, ingest, cube, build_index(df, unique_barriers),
+                           CommentIndex.build(df), wave_cubes)
+
+    def clear(self):
+        with self._lock:
+            self._current = None
+        with self._preload_lock:
+            self._preloading = None
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from survey_analytics import BARRIERS, GROUP_KEYS, RowView, build_cube, sum_cubes
+from survey_data import (
+    ARROW_STRING, CHOICE_COLUMNS, CHUNK_ROWS, COLUMNS, MULTISELECT_DELIMITER, arrow_strings, barrier_column,
+    choice_dtype, read_survey_chunks
+)
+from survey_tables import comments_tables
+
+# A survey read chunk by chunk: each cleaned chunk updates the aggregates and is dropped, so
+# memory depends on the chunk size and on what the dashboard shows, not on the file's length
+
+
+class StreamedSurvey:
+    """What the dashboard needs of a survey, updated one cleaned chunk at a time.
+
+    Holds the merged cube, the filter options in BitmapIndex order, the barrier options,
+    the row count, the last timestamp and, with ``keep_comments``, the comment rows; each
+    equal to what the whole frame gives. Text comes back as Arrow strings, as from a lean load.
+    ``prepare`` (e.g. a pseudonymizer) is applied to the comment rows as they are kept.
+    """
+
+    def __init__(self, keep_comments=True, prepare=None):
+        self.keep_comments = keep_comments
+        self.prepare = prepare
+        self.rows = 0
+        self.last_timestamp = None
+        self.unique_barriers = []
+        # Answers seen per filter column, as insertion-ordered dicts: first appearance first
+        self._answers = {column: {} for column in GROUP_KEYS + CHOICE_COLUMNS}
+        self._comments = []
+        self._empty = None
+        self._cube = None
+        self._pending = []
+
+    def add(self, df, unique_barriers):
+        """Count the cleaned chunk ``df`` (rows labelled by their position in the file) in."""
+        self._pending.append(build_cube(df, unique_barriers))
+        # Summed in once they outnumber the cells summed so far: each cell is re-summed
+        # only a few times, where merging every chunk's cube re-adds the whole cube
+        folded = len(self._cube.counts) if self._cube is not None else 0
+        if sum(len(cube.counts) for cube in self._pending) > folded:
+            self._fold()
+        self.rows += len(df)
+        if len(df):
+            self.last_timestamp = df['Timestamp'].iloc[-1]
+        self.unique_barriers = sorted(set(self.unique_barriers) | set(unique_barriers))
+        for column, answers in self._answers.items():
+            answers.update(dict.fromkeys(df[column].dropna().unique()))
+        if self.keep_comments:
+            # The comments tab's own selection, so the kept rows are exactly the ones it lists
+            comments = comments_tables(None, None, RowView(df, np.arange(len(df))))['comments']
+            comments = comments.astype({'Name': ARROW_STRING, 'Program_Section': object,
+                                        'Additional_Comments': ARROW_STRING})
+            self._comments.append(comments if self.prepare is None else self.prepare(comments))
+        if self._empty is None:
+            self._empty = df.iloc[:0]
+
+    def _fold(self):
+        self._cube = sum_cubes(([self._cube] if self._cube is not None else []) + self._pending)
+        self._pending = []
+
+    @property
+    def cube(self):
+        """SurveyCube of every row added so far."""
+        if self._pending:
+            self._fold()
+        return self._cube
+
+    def values(self, column):
+        """Filter options for ``column``, in the order BitmapIndex.values gives them."""
+        if column == BARRIERS:
+            return list(self.unique_barriers)
+        answers = self._answers[column]
+        if column in CHOICE_COLUMNS:
+            return [answer for answer in choice_dtype(column, answers).categories if answer in answers]
+        return list(answers)
+
+    def _section_dtype(self):
+        # Labels exist where Program and Section both do, i.e. for the cube's sections
+        return choice_dtype('Program_Section', self.cube.sections())
+
+    def comments(self):
+        """The kept comment rows, typed like the same rows of the whole survey's frame."""
+        if not self._comments:
+            return self.empty_rows()[['Name', 'Program_Section', 'Additional_Comments']]
+        return pd.concat(self._comments).astype({'Program_Section': self._section_dtype()})
+
+    def empty_rows(self):
+        """The whole survey's frame without rows: its columns, categories and Barrier_* indicators."""
+        empty = arrow_strings(self._empty.astype({column: object for column in CHOICE_COLUMNS + ['Program_Section']}))
+        empty = empty.astype({column: choice_dtype(column, self._answers[column]) for column in CHOICE_COLUMNS})
+        empty['Program_Section'] = empty['Program_Section'].astype(self._section_dtype())
+        indicators = {barrier_column(barrier): np.zeros(0, dtype=np.uint8) for barrier in self.unique_barriers}
+        return empty[COLUMNS + ['Program_Section']].assign(**indicators)
+
+
+def stream_survey(path, chunksize=CHUNK_ROWS, delimiter=MULTISELECT_DELIMITER, keep_comments=True, on_chunk=None,
+                  prepare=None):
+    """StreamedSurvey of the CSV at ``path``, read ``chunksize`` rows at a time.
+
+    ``on_chunk(df, unique_barriers)`` sees every cleaned chunk before it is dropped,
+    e.g. to write its rows to a database.
+    """
+    survey = StreamedSurvey(keep_comments, prepare)
+    for df, unique_barriers in read_survey_chunks(path, chunksize, delimiter):
+        survey.add(df, unique_barriers)
+        if on_chunk is not None:
+            on_chunk(df, unique_barriers)
+    return survey
@@ -0,0 +1,354 @@
+import pandas as pd
+
+from survey_analytics import (
+    BARRIERS, DISSATISFIED, EXPENSIVE, affordability_labels, confidence_labels, count_pct, pct_text, sentiment_labels,
+    trust_labels, willingness_labels
+)
+from survey_search import within
+
+# Every view's tables, computed from a cube and its scores with pandas only, so batch
+# jobs produce exactly what the dashboard shows without Streamlit or plotting libraries
+
+# Single-choice views: (question, name of the answer column in their tables)
+QUESTION_VIEWS = {
+    'location': ('Tour_Location_Preference', 'Location'),
+    'affordability': ('Affordability_Rating', 'Rating'),
+    'factors': ('Most_Important_Factor', 'Factor'),
+    'voting': ('Previous_Vote_Mattered', 'Response'),
+    'non_student_factors': ('Non_Student_Factors', 'Response'),
+    'willingness': ('Manila_Willingness', 'Response'),
+    'package': ('Preferred_Package', 'Package'),
+}
+
+
+def _by_section(columns):
+    return pd.DataFrame(columns).rename_axis('Program-Section').reset_index()
+
+
+def question_tables(cube, question, label):
+    """Answer counts, Program-Section crosstab with totals, row percentages and long-form chart data."""
+    counts = cube.value_counts(question).reset_index()
+    counts.columns = [label, 'Count']
+    return {
+        'counts': counts,
+        'breakdown': cube.crosstab(question, margins=True),
+        'percentages': cube.percentages(question).round(1),
+        'by_section': cube.melted_percentages(question, label),
+    }
+
+
+def overview_tables(cube, scores):
+    program_counts = cube.program_counts().reset_index()
+    program_counts.columns = ['Program', 'Count']
+    return {'program_counts': program_counts}
+
+
+def affordability_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['affordability'])
+    tables['sentiment'] = _by_section({
+        'Total Students': scores['total'],
+        'Find Expensive': count_pct(scores['expensive'], scores['expensive_pct']),
+        'Find Affordable': count_pct(scores['affordable'], scores['affordable_pct']),
+        'Sentiment': affordability_labels(scores['expensive_pct'])
+    })
+    return tables
+
+
+def factors_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['factors'])
+    top_factors = cube.top_answers('Most_Important_Factor')
+    tables['priority'] = pd.DataFrame({
+        'Total Students': scores['total'],
+        'Top Priority': top_factors['answer'],
+        'Top Priority Count': count_pct(top_factors['count'], top_factors['pct'])
+    }).dropna().rename_axis('Program-Section').reset_index()
+    return tables
+
+
+def voting_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['voting'])
+    tables['confidence'] = _by_section({
+        'Total Students': scores['total'],
+        'Dissatisfied': count_pct(scores['dissatisfied'], scores['dissatisfied_pct']),
+        'Satisfied': count_pct(scores['satisfied'], scores['satisfied_pct']),
+        'Confidence Level': confidence_labels(scores['dissatisfied_pct'])
+    })
+    return tables
+
+
+def non_student_factors_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['non_student_factors'])
+    tables['trust'] = _by_section({
+        'Total Students': scores['total'],
+        'Believes External Influence': count_pct(scores['believes_external'], scores['believes_external_pct']),
+        'Trust Level': trust_labels(scores['believes_external_pct'])
+    })
+    return tables
+
+
+def willingness_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['willingness'])
+    tables['sentiment'] = _by_section({
+        'Total Students': scores['total'],
+        'Definitely Willing': count_pct(scores['definitely_willing'], scores['definitely_willing_pct']),
+        'Total Positive': count_pct(scores['positive_willing'], scores['positive_willing_pct']),
+        'Sentiment': willingness_labels(scores['definitely_willing_pct'], scores['positive_willing_pct'])
+    })
+    return tables
+
+
+def barriers_tables(cube, scores):
+    counts = cube.value_counts(BARRIERS).reset_index()
+    counts.columns = ['Barrier', 'Count']
+    top_barriers = cube.top_answers(BARRIERS).reindex(scores.index)
+    breakdown = cube.crosstab(BARRIERS).reindex(cube.sections(), fill_value=0)
+    by_section = breakdown.reset_index().melt(id_vars='Program_Section', var_name='Barrier', value_name='Count')
+    return {
+        'counts': counts.head(10),
+        'analysis': _by_section({
+            'Total Students': scores['total'],
+            'Top Barrier': top_barriers['answer'].fillna("None reported"),
+            'Top Barrier Count': count_pct(top_barriers['count'].fillna(0), top_barriers['pct'].fillna(0)),
+            'Total Barriers Reported': scores['barriers_reported']
+        }),
+        'breakdown': breakdown,
+        'by_section': by_section[by_section['Count'] > 0],
+    }
+
+
+def package_tables(cube, scores):
+    tables = question_tables(cube, *QUESTION_VIEWS['package'])
+    top_packages = cube.top_answers('Preferred_Package')
+    tables['analysis'] = pd.DataFrame({
+        'Total Students': scores['total'],
+        'Top Choice': top_packages['answer'],
+        'Top Choice Count': count_pct(top_packages['count'], top_packages['pct'])
+    }).dropna().rename_axis('Program-Section').reset_index()
+    return tables
+
+
+def sentiment_overview(cube):
+    """The four 0-100 sentiment scores over every respondent in ``cube``."""
+    total = cube.total
+    financial = (100 - cube.count('Affordability_Rating', EXPENSIVE) / total * 100) if total > 0 else 0
+    participation = cube.count('Manila_Willingness', ['Yes, definitely']) / total * 100 if total > 0 else 0
+    process = (100 - cube.count('Previous_Vote_Mattered', DISSATISFIED) / total * 100) if total > 0 else 0
+    return {
+        'financial': financial,
+        'participation': participation,
+        'process': process,
+        'overall': (financial + participation + process) / 3,
+    }
+
+
+def sentiment_tables(cube, scores):
+    return {
+        'overview': pd.DataFrame([sentiment_overview(cube)]),
+        'sentiment': _by_section({
+            'Total Students': scores['total'],
+            'Financial Score': pct_text(scores['financial']),
+            'Participation Score': pct_text(scores['participation']),
+            'Process Score': pct_text(scores['process']),
+            'Overall Score': pct_text(scores['overall']),
+            'Sentiment Status': sentiment_labels(scores['overall'])
+        }),
+        'scores': scores[['financial', 'participation', 'process']].rename(columns={
+            'financial': 'Financial', 'participation': 'Participation', 'process': 'Process'
+        }).rename_axis('Program-Section').reset_index().melt(id_vars='Program-Section', var_name='Metric', value_name='Score'),
+    }
+
+
+def comparison_table(cube, scores):
+    """One row per section: size, affordability, willingness and the most chosen location and package."""
+    return pd.DataFrame({
+        'Total Students': scores['total'],
+        'Find Expensive (%)': pct_text(scores['expensive_pct']),
+        'Definitely Willing (%)': pct_text(scores['definitely_willing_pct']),
+        'Preferred Location': cube.top_answers('Tour_Location_Preference')['answer'].reindex(scores.index).fillna("N/A"),
+        'Preferred Package': cube.top_answers('Preferred_Package')['answer'].reindex(scores.index).fillna("N/A")
+    }).rename_axis('Program-Section').reset_index()
+
+
+def section_summary_tables(cube, scores):
+    return {'comparison': comparison_table(cube, scores)}
+
+
+def comments_tables(cube, scores, rows):
+    """Non-blank comments of ``rows`` (a RowView) and how many each section wrote."""
+    comments = rows.rows(rows.nonblank('Additional_Comments'), ['Name', 'Program_Section', 'Additional_Comments'])
+    return {
+        'comments': comments,
+        'by_section': comments.groupby('Program_Section', observed=True).size().reset_index(name='Comment Count'),
+    }
+
+
+def comment_search_tables(index, rows, query):
+    """Comments of ``rows`` (a RowView) matching ``query`` in ``index`` (a CommentIndex), and matches per section."""
+    found = within(index.search(query), rows.positions)
+    comments = rows.df.iloc[found, rows.df.columns.get_indexer(['Name', 'Program_Section', 'Additional_Comments'])]
+    return {
+        'comments': comments,
+        'by_section': comments.groupby('Program_Section', observed=True).size().reset_index(name='Matches'),
+    }
+
+
+VIEW_TABLES = {
+    'overview': overview_tables,
+    'location': lambda cube, scores: question_tables(cube, *QUESTION_VIEWS['location']),
+    'affordability': affordability_tables,
+    'factors': factors_tables,
+    'voting': voting_tables,
+    'non_student_factors': non_student_factors_tables,
+    'willingness': willingness_tables,
+    'barriers': barriers_tables,
+    'comments': comments_tables,
+    'package': package_tables,
+    'sentiment': sentiment_tables,
+    'section_summary': section_summary_tables,
+}
+# Views whose tables are built from rows rather than the cube
+ROW_VIEWS = {'comments'}
+
+
+def view_tables(view, cube, scores, rows=None):
+    """{table name: DataFrame} for one view; ROW_VIEWS also need ``rows``, a RowView of the selection."""
+    if view in ROW_VIEWS:
+        return VIEW_TABLES[view](cube, scores, rows)
+    return VIEW_TABLES[view](cube, scores)
+
+
+# Per-section measures compared between waves: section_scores column -> label
+WAVE_METRICS = {
+    'expensive_pct': 'Find Expensive (%)',
+    'definitely_willing_pct': 'Definitely Willing (%)',
+    'positive_willing_pct': 'Willing (%)',
+    'dissatisfied_pct': "Vote Didn't Matter (%)",
+    'financial': 'Financial Score',
+    'participation': 'Participation Score',
+    'process': 'Process Score',
+    'overall': 'Overall Score',
+}
+
+
+def wave_overview(cube):
+    """Respondents and every WAVE_METRICS measure over all respondents in ``cube``."""
+    total = cube.total
+
+    def pct(question, answers):
+        return cube.count(question, answers) / total * 100 if total > 0 else 0
+
+    sentiment = sentiment_overview(cube)
+    return {
+        'Respondents': total,
+        'Find Expensive (%)': pct('Affordability_Rating', EXPENSIVE),
+        'Definitely Willing (%)': pct('Manila_Willingness', ['Yes, definitely']),
+        'Willing (%)': pct('Manila_Willingness', ['Yes, definitely', 'Yes, probably']),
+        "Vote Didn't Matter (%)": pct('Previous_Vote_Mattered', DISSATISFIED),
+        'Financial Score': sentiment['financial'],
+        'Participation Score': sentiment['participation'],
+        'Process Score': sentiment['process'],
+        'Overall Score': sentiment['overall'],
+    }
+
+
+def wave_tables(waves, base=None, target=None, metrics=None):
+    """Wave-over-wave tables from {wave: (cube, scores)} in wave order; cube-derived only.
+
+    ``overall`` has one row per wave, ``trend`` every section's measures per wave in
+    long form (for line charts) and ``deltas`` one row per section with each of
+    ``metrics`` (section_scores columns, default all of WAVE_METRICS) in ``base`` and
+    ``target`` (default: the first and last wave) and the change in points. Sections
+    missing from a wave have no value there.
+    """
+    names = list(waves)
+    base, target = base or names[0], target or names[-1]
+    metrics = metrics or list(WAVE_METRICS)
+    overall = pd.DataFrame([{'Wave': wave, **wave_overview(cube)} for wave, (cube, _) in waves.items()])
+    by_wave = pd.concat({wave: scores[list(WAVE_METRICS)] for wave, (_, scores) in waves.items()},
+                        names=['Wave', 'Program-Section'])
+    trend = by_wave.rename(columns=WAVE_METRICS).reset_index().melt(
+        id_vars=['Wave', 'Program-Section'], var_name='Metric', value_name='Value')
+    before, after = waves[base][1], waves[target][1]
+    deltas = {f'Students {base}': before['total'], f'Students {target}': after['total']}
+    for metric in metrics:
+        label = WAVE_METRICS[metric]
+        deltas[f'{label} {base}'] = before[metric]
+        deltas[f'{label} {target}'] = after[metric]
+        deltas[f'{label} Δ'] = after[metric] - before[metric]
+    return {
+        'overall': overall.round(1),
+        'trend': trend,
+        'deltas': _by_section(deltas).round(1),
+    }
+
+
+def section_summary(cube, scores, label):
+    """Everything the Program-Section report shows for ``label``, apart from its rows.
+
+    ``counts`` has each question's value counts in the section, ``breakdowns`` the
+    same as (answer, count, percentage text) rows, ``top`` the most chosen answer of
+    each answered question as (answer, count, percentage) and ``barriers_reported``
+    the barriers ticked in all. ``scores`` is the section's row of ``section_scores``,
+    ``labels`` the sentiment wording and ``insights`` the generated recommendations.
+    """
+    return section_summaries(cube, scores, [label])[label]
+
+
+def section_summaries(cube, scores, labels=None):
+    """{label: section_summary(cube, scores, label)} for ``labels``, every section by default.
+
+    The counts come from the cube's grouped per-section value counts and the sentiment
+    wording is classified for all the sections at once, so this is one pass over the cube.
+    """
+    labels = cube.sections() if labels is None else list(labels)
+    questions = [question for question, _ in QUESTION_VIEWS.values()] + [BARRIERS]
+    grouped = {question: cube.section_value_counts(question) for question in questions}
+    # What value_counts gives for a section where nobody answered
+    unanswered = cube.counts.iloc[:0].groupby(level='answer').sum()
+    chosen = scores.loc[labels]
+    wording = pd.DataFrame({
+        'affordability': affordability_labels(chosen['expensive_pct']),
+        'confidence': confidence_labels(chosen['dissatisfied_pct']),
+        'trust': trust_labels(chosen['believes_external_pct']),
+        'willingness': willingness_labels(chosen['definitely_willing_pct'], chosen['positive_willing_pct']),
+        'sentiment': sentiment_labels(chosen['overall']),
+    }).to_dict('index')
+    return {label: _section_summary(label, scores.loc[label],
+                                    {question: grouped[question].get(label, unanswered) for question in questions},
+                                    wording[label])
+            for label in labels}
+
+
+def _section_summary(label, row, counts, labels):
+    total = int(row['total'])
+    insights = []
+    location = counts['Tour_Location_Preference']
+    if not location.empty:
+        insights.append(f"**Location Preference:** {location.iloc[0] / total * 100:.1f}% prefer {location.index[0]}")
+    if row['expensive'] > total * 0.5:
+        insights.append(f"**⚠️ Financial Concern:** {(row['expensive']/total*100):.1f}% find the tour expensive - consider financial assistance")
+    if row['definitely_willing'] < total * 0.6:
+        insights.append(f"**⚠️ Participation Risk:** Only {(row['definitely_willing']/total*100):.1f}% are definitely willing to join Manila tour")
+    if row['dissatisfied'] > total * 0.4:
+        insights.append(f"**⚠️ Trust Issue:** {(row['dissatisfied']/total*100):.1f}% feel their votes didn't matter")
+    barriers = counts[BARRIERS].to_dict()
+    if barriers:
+        top_barrier = max(barriers, key=barriers.get)
+        insights.append(f"**Main Barrier:** {top_barrier} affects {barriers[top_barrier]} students")
+
+    # Plain tuples rather than frames: prebuilt aggregates pickle one summary per section
+    breakdowns, top = {}, {}
+    for question, answers in counts.items():
+        breakdowns[question] = [(answer, count, f"{_share(count, total):.1f}%")
+                                for answer, count in zip(answers.index.tolist(), answers.tolist())]
+        if breakdowns[question]:
+            # The counts come most chosen first
+            answer, count, _ = breakdowns[question][0]
+            top[question] = (answer, count, _share(count, total))
+    reported = sum(count for _, count, _ in breakdowns[BARRIERS])
+    return {'label': label, 'total': total, 'counts': counts, 'breakdowns': breakdowns, 'top': top,
+            'barriers_reported': reported, 'scores': row, 'labels': labels, 'insights': insights}
+
+
+def _share(count, total):
+    return count / total * 100 if total > 0 else 0
@@ -0,0 +1,119 @@
+import fnmatch
+import os
+import threading
+
+from survey_data import file_state
+from survey_waves import waves_state
+
+# inotify reports reads too; they never change the data
+_IGNORED_EVENTS = ('opened', 'closed_no_write')
+
+
+class FileWatcher:
+    """Watches one file and calls ``on_change(state)`` once a burst of writes has settled.
+
+    Uses watchdog when it is installed, otherwise polls ``os.stat``. ``version``
+    counts settled changes, so sessions can compare a number instead of touching
+    the file.
+    """
+
+    def __init__(self, path, on_change=None, debounce=2.0, poll_interval=2.0):
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.state = self._stat()
+        self.version = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._stopped = threading.Event()
+        self._observer = None
+
+    def _stat(self):
+        try:
+            return file_state(self.path)
+        except OSError:
+            # Briefly missing while an editor or exporter replaces it
+            return None
+
+    def snapshot(self):
+        """(version, state) read together."""
+        with self._lock:
+            return self.version, self.state
+
+    def start(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            threading.Thread(target=self._poll, name=f'watch {self.path}', daemon=True).start()
+            return self
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in _IGNORED_EVENTS:
+                    return
+                paths = (event.src_path, getattr(event, 'dest_path', ''))
+                if any(path and watcher.matches(os.path.abspath(os.fsdecode(path))) for path in paths):
+                    watcher.touched()
+
+        # Watch the directory so atomic replaces (write temp file, rename) are seen too
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.schedule(Handler(), os.path.dirname(self.path))
+        self._observer.start()
+        return self
+
+    def matches(self, path):
+        return path == self.path
+
+    def _poll(self):
+        last = self.state
+        while not self._stopped.wait(self.poll_interval):
+            current = self._stat()
+            if current != last:
+                last = current
+                self.touched()
+
+    def touched(self):
+        """Note a write; the change is reported ``debounce`` seconds after the last one."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._settle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _settle(self):
+        state = self._stat()
+        with self._lock:
+            if state is None or state == self.state:
+                return
+            self.state = state
+            self.version += 1
+        if self.on_change is not None:
+            self.on_change(state)
+
+    def stop(self):
+        self._stopped.set()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        if self._observer is not None:
+            self._observer.stop()
+
+
+class PatternWatcher(FileWatcher):
+    """A FileWatcher over every file matching a glob pattern, e.g. the survey waves.
+
+    Its state is ``survey_waves.waves_state``, so a file added, removed or written
+    counts as a change. Only the file name may hold wildcards.
+    """
+
+    def _stat(self):
+        return waves_state(self.path)
+
+    def matches(self, path):
+        return os.path.dirname(path) == os.path.dirname(self.path) and fnmatch.fnmatch(path, self.path)
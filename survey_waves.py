@@ -0,0 +1,127 @@
+import concurrent.futures
+import glob
+import hashlib
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+from survey_analytics import build_cube, section_scores, sum_cubes
+from survey_data import CACHE_DIR, MULTISELECT_DELIMITER, concat_surveys, file_state, ingest_survey, snapshot_current
+
+# Every term's export of the same questionnaire, loaded side by side. Each wave is parsed
+# into its snapshot and counted in its own worker process; the parent memory-maps the
+# snapshots, concatenates the typed frames and sums the cubes
+
+# Column naming the wave (file name without .csv) a response came from
+WAVE_COLUMN = 'Wave'
+# Below this many bytes of CSV the waves are loaded in this process: starting a worker
+# (importing pandas) takes longer than parsing a few small files
+PARALLEL_MIN_BYTES = 8 << 20
+
+
+def wave_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def discover_waves(pattern):
+    """{wave: path} of the CSV files matching the glob ``pattern``, in file-name order.
+
+    Name the exports so they sort chronologically, e.g. 2024-2.csv, 2025-1.csv.
+    """
+    waves = {}
+    for path in sorted(glob.glob(pattern), key=os.path.basename):
+        name = wave_name(path)
+        if name in waves:
+            # Snapshots are cached by file name, and the wave would be ambiguous
+            raise ValueError(f'{waves[name]} and {path} are both wave {name!r}')
+        waves[name] = path
+    if not waves:
+        raise FileNotFoundError(f'no survey files match {pattern}')
+    return waves
+
+
+def waves_state(pattern):
+    """Cheap stamp of the wave files: their names and (size, mtime); moves when one is added or removed."""
+    state = []
+    for path in sorted(glob.glob(pattern), key=os.path.basename):
+        try:
+            state.append((wave_name(path), file_state(path)))
+        except OSError:
+            # Briefly missing while an exporter replaces it
+            continue
+    return tuple(state)
+
+
+def select_waves(df, unique_barriers, wave_cubes, positions, programs, sections, answers=None):
+    """{wave: (cube, scores)} of a selection, in wave order, for comparing the waves.
+
+    Program/Section selections are cut from the per-wave cubes built at load, so no
+    row is read; answer filters cut across sections, and then the selected rows
+    (``positions`` of ``df``) are counted per wave.
+    """
+    if not any(len(values) for values in (answers or {}).values()):
+        cubes = {wave: cube.select(programs, sections) for wave, cube in wave_cubes.items()}
+    else:
+        codes = df[WAVE_COLUMN].cat.codes.to_numpy()[positions]
+        cubes = {wave: build_cube(df.iloc[positions[codes == code]], unique_barriers)
+                 for code, wave in enumerate(df[WAVE_COLUMN].cat.categories)}
+    return {wave: (cube, section_scores(cube)) for wave, cube in cubes.items()}
+
+
+def _count_wave(task):
+    # Runs in a worker. Only the cube goes back: the rows stay in the snapshot this wrote,
+    # which the parent maps in for far less than unpickling them would cost
+    path, cache_dir, delimiter = task
+    df, unique_barriers, ingest = ingest_survey(path, cache_dir, delimiter, lean=True)
+    return ingest['sha256'], build_cube(df, unique_barriers)
+
+
+def load_waves(waves, cache_dir=CACHE_DIR, delimiter=MULTISELECT_DELIMITER, lean=False, workers=None):
+    """Every wave of ``waves`` ({wave: path}) as one survey: (df, unique_barriers, ingest, cube, wave_cubes).
+
+    Waves without a current snapshot are parsed in parallel, one per worker process
+    (default: one per CPU), so the time is about that of the largest. Rows keep the
+    waves' order and carry their wave in a categorical WAVE_COLUMN; ``wave_cubes`` is
+    {wave: SurveyCube}. ``ingest`` is like ``ingest_survey``'s, with the per-wave dicts
+    under ``waves``.
+    """
+    # Waves with a current snapshot are mapped in here in moments; only the others are worth a worker
+    stale = {name: path for name, path in waves.items() if not snapshot_current(path, cache_dir, delimiter)}
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    counted = {}
+    if workers > 1 and sum(os.path.getsize(path) for path in stale.values()) >= PARALLEL_MIN_BYTES:
+        # spawn: the same fresh workers on every platform, and no forked copy of a Streamlit server
+        context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(workers, mp_context=context) as pool:
+            tasks = [(path, cache_dir, delimiter) for path in stale.values()]
+            counted = dict(zip(stale, pool.map(_count_wave, tasks)))
+
+    parts, infos, wave_cubes = [], {}, {}
+    for name, path in waves.items():
+        # A snapshot hit after the workers; parsed here when they did not run or could not write it
+        df, unique_barriers, ingest = ingest_survey(path, cache_dir, delimiter, lean)
+        sha256, cube = counted.get(name, (None, None))
+        if sha256 != ingest['sha256']:
+            # Counted here, also when the file changed after its worker read it
+            cube = build_cube(df, unique_barriers)
+        parts.append((df, unique_barriers))
+        infos[name], wave_cubes[name] = ingest, cube
+
+    df, unique_barriers = concat_surveys(parts)
+    lengths = [len(part) for part, _ in parts]
+    wave = pd.Categorical.from_codes(np.repeat(np.arange(len(waves)), lengths), categories=list(waves), ordered=True)
+    df.insert(df.columns.get_loc('Program_Section') + 1, WAVE_COLUMN, wave)
+    last = [info['last_timestamp'] for info in infos.values() if info['rows']]
+    ingest = {
+        # One hash for the set of versions, so anything keyed on it changes with any wave
+        'sha256': hashlib.sha256('|'.join(f"{name}:{info['sha256']}" for name, info in infos.items())
+                                 .encode('utf-8')).hexdigest(),
+        'rows': len(df),
+        'last_timestamp': last[-1] if last else None,
+        'base_sha256': None,
+        'base_rows': None,
+        'waves': infos,
+    }
+    return df, unique_barriers, ingest, sum_cubes(list(wave_cubes.values())), wave_cubes
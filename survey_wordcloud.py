@@ -0,0 +1,48 @@
+import io
+
+from matplotlib.figure import Figure
+from wordcloud import WordCloud
+
+from survey_cache import LRUCache
+
+
+def word_frequencies(comments):
+    """WordCloud's own tokenizing (stopwords, plurals, bigrams) run once over the comments."""
+    return WordCloud().process_text(' '.join(comments.astype(str)))
+
+
+def render_wordcloud(frequencies, width, height, title, figsize):
+    """PNG bytes of a word cloud laid out from ``frequencies``."""
+    # Fixed seed so the same frequencies always give the same picture
+    cloud = WordCloud(width=width, height=height, background_color='white',
+                      random_state=0).generate_from_frequencies(frequencies)
+    # A bare Figure is never registered with pyplot, so nothing is left open
+    # once the bytes are written
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    ax.imshow(cloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title(title, fontsize=14)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class WordCloudCache:
+    """Word frequencies and rendered PNGs, each in its own LRU keyed by (filter, section)."""
+
+    def __init__(self, maxsize=32):
+        self.frequencies = LRUCache(maxsize)
+        self.images = LRUCache(maxsize)
+
+    def png(self, key, comments, width, height, title, figsize, frequencies=None):
+        # Prebuilt frequencies, when given, stand in for counting the comments
+        frequencies = self.frequencies.get(
+            key, lambda: word_frequencies(comments) if frequencies is None else frequencies
+        )
+        return self.images.get(key + (width, height, title),
+                               lambda: render_wordcloud(frequencies, width, height, title, figsize))
+
+    def clear(self):
+        self.frequencies.clear()
+        self.images.clear()
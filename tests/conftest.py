@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+from survey_analytics import SurveyCube  # noqa: E402
+from survey_data import COLUMNS  # noqa: E402
+from synthetic import generate_survey  # noqa: E402
+
+# Multi-line comments (quoted in the CSV) at these rows, so readers that split the file
+# into chunks or byte ranges meet a record spanning several lines
+MULTILINE_ROWS = [0, 9, 10, 11, 99, 100, 149]
+
+
+@pytest.fixture
+def survey():
+    """Synthetic responses with the 109.csv header: a few sections, some comments over several lines."""
+    df = generate_survey(200, seed=7)
+    comments = COLUMNS.index('Additional_Comments')
+    for row in MULTILINE_ROWS:
+        df.iloc[row, comments] = f'Line one of {row},\nline "two"\r\nand three'
+    return df
+
+
+def write_csv(df, path, append=False):
+    df.to_csv(path, index=False, header=not append, mode='a' if append else 'w', encoding='utf-8')
+    return path
+
+
+def assert_same_frame(got, expected):
+    # Snapshots give None where a CSV read gives NaN; both are a missing answer
+    pd.testing.assert_frame_equal(got.where(got.notna(), np.nan), expected.where(expected.notna(), np.nan))
+
+
+def assert_same_cube(got, expected):
+    assert isinstance(got, SurveyCube)
+    pd.testing.assert_series_equal(got.counts, expected.counts)
+    pd.testing.assert_series_equal(got.totals, expected.totals)
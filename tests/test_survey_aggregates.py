@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from conftest import write_csv
+from survey_aggregates import build_aggregates, read_aggregates, write_aggregates
+from survey_data import file_state, ingest_survey
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX permissions')
+def test_aggregates_others_could_write_are_not_loaded(survey, tmp_path):
+    path = write_csv(survey, tmp_path / 'survey.csv')
+    df, unique_barriers, info = ingest_survey(path, tmp_path / 'cache')
+    target = str(tmp_path / 'survey-aggregates.pkl')
+    previous = os.umask(0o002)
+    try:
+        write_aggregates(target, build_aggregates(str(path), file_state(path), df, unique_barriers, info))
+    finally:
+        os.umask(previous)
+
+    assert read_aggregates(target, str(path), file_state(path)).ingest['rows'] == len(df)
+    # Anyone who could have replaced the pickle could run code through it
+    os.chmod(target, 0o664)
+    assert read_aggregates(target, str(path), file_state(path)) is None
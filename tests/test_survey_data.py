@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from conftest import assert_same_cube, assert_same_frame, write_csv
+from survey_analytics import build_cube
+from survey_data import (
+    BARRIER_OPTIONS, CHOICE_COLUMNS, COLUMNS, LIKERT_LEVELS, barrier_column, clean_survey, encode_multiselect,
+    ingest_survey, read_survey_csv
+)
+
+
+def test_append_matches_full_read(survey, tmp_path):
+    path, cache = tmp_path / 'survey.csv', tmp_path / 'cache'
+    write_csv(survey.iloc[:100], path)
+    _, _, first = ingest_survey(path, cache)
+    # Row 100 starts with a multi-line comment
+    write_csv(survey.iloc[100:], path, append=True)
+    df, unique_barriers, info = ingest_survey(path, cache)
+
+    assert (info['base_sha256'], info['base_rows']) == (first['sha256'], 100)
+    expected, expected_barriers = read_survey_csv(path)
+    assert_same_frame(df, expected)
+    assert unique_barriers == expected_barriers
+    assert_same_cube(build_cube(df, unique_barriers), build_cube(expected, expected_barriers))
+    # The merged snapshot is what the next load reads
+    df, _, _ = ingest_survey(path, cache)
+    assert_same_frame(df, expected)
+
+
+def test_edited_prefix_rebuilds(survey, tmp_path):
+    path, cache = tmp_path / 'survey.csv', tmp_path / 'cache'
+    write_csv(survey.iloc[:100], path)
+    ingest_survey(path, cache)
+    edited = survey.copy()
+    # Same length, so the old rows still end where they did: only their hash shows the edit
+    edited.iloc[3, COLUMNS.index('Name')] = 'Student X'
+    write_csv(edited, path)
+    df, unique_barriers, info = ingest_survey(path, cache)
+
+    assert info['base_sha256'] is None
+    expected, expected_barriers = read_survey_csv(path)
+    assert_same_frame(df, expected)
+    assert df['Name'].iloc[3] == 'Student X'
+    assert unique_barriers == expected_barriers
+
+
+def test_multiselect_matches_whole_options():
+    answers = pd.Series(['Too expensive', 'Too expensive for me, and far', 'Safety concerns, Too expensive',
+                         None, '', 'Health concerns,Too expensive for me'], index=[10, 11, 12, 13, 14, 15])
+    known = ['Too expensive', 'Safety concerns', 'Health concerns']
+    for sparse in (False, True):
+        indicators, options = encode_multiselect(answers, known_options=known, sparse=sparse)
+
+        # "Other" text is one answer even with the delimiter in it, and never ticks an option it contains
+        assert options == ['Health concerns', 'Safety concerns', 'Too expensive', 'Too expensive for me',
+                           'Too expensive for me, and far']
+        assert list(indicators.index) == list(answers.index)
+        dense = indicators.sparse.to_dense() if sparse else indicators
+        assert dense.dtypes.eq(np.uint8).all()
+        assert list(dense['Too expensive']) == [1, 0, 1, 0, 0, 0]
+        assert list(dense['Too expensive for me, and far']) == [0, 1, 0, 0, 0, 0]
+        assert list(dense['Too expensive for me']) == [0, 0, 0, 0, 0, 1]
+        assert list(dense.sum(axis=1)) == [1, 1, 2, 0, 0, 2]
+
+
+def test_barrier_columns_count_exact_answers(survey):
+    survey = survey.set_axis(COLUMNS, axis=1)
+    survey.loc[:3, 'Barriers'] = ['Too expensive', 'Too expensive, Safety concerns', 'Too expensive-ish', None]
+    df, unique_barriers = clean_survey(survey)
+
+    ticked = survey['Barriers'].fillna('').str.split(',').apply(lambda parts: {part.strip() for part in parts})
+    for barrier in BARRIER_OPTIONS:
+        assert list(df[barrier_column(barrier)]) == list(ticked.apply(lambda chosen: int(barrier in chosen))), barrier
+    assert 'Too expensive-ish' in unique_barriers
+
+
+def test_likert_columns_are_ordered_in_declared_order(survey):
+    survey = survey.set_axis(COLUMNS, axis=1)
+    # An off-scale answer is kept, after the declared levels
+    survey.loc[0, 'Affordability_Rating'] = 'Cebu'
+    df, _ = clean_survey(survey)
+
+    for column in CHOICE_COLUMNS:
+        dtype = df[column].dtype
+        assert isinstance(dtype, pd.CategoricalDtype)
+        if column in LIKERT_LEVELS:
+            assert dtype.ordered, column
+            assert list(dtype.categories[:len(LIKERT_LEVELS[column])]) == LIKERT_LEVELS[column]
+        else:
+            assert not dtype.ordered and list(dtype.categories) == sorted(dtype.categories), column
+        assert df[column].astype(object).equals(survey[column].astype(object).where(survey[column].notna(), np.nan))
+    assert list(df['Affordability_Rating'].cat.categories) == LIKERT_LEVELS['Affordability_Rating'] + ['Cebu']
+
+    # Comparisons follow the scale, not the alphabet
+    levels = LIKERT_LEVELS['Manila_Willingness']
+    rank = survey['Manila_Willingness'].map({level: k for k, level in enumerate(levels)})
+    assert list(df['Manila_Willingness'] >= 'Yes, probably') == list(rank >= levels.index('Yes, probably'))
+    assert df['Affordability_Rating'].iloc[1:].max() == max(survey['Affordability_Rating'].iloc[1:],
+                                                           key=LIKERT_LEVELS['Affordability_Rating'].index)
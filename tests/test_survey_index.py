@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from survey_analytics import BARRIERS, GROUP_KEYS, QUESTIONS, build_index
+from survey_data import COLUMNS, barrier_column, clean_survey
+
+FILTERS = [
+    {},
+    {'Program': ['BSIT', 'BSCS'], 'Section': ['A']},
+    {'Affordability_Rating': ['Very Expensive', 'Expensive'], BARRIERS: ['Safety concerns']},
+    {'Manila_Willingness': ['No'], BARRIERS: ['Too expensive', 'Health concerns'], 'Section': ['B', 'C', 'H']},
+    # Values with no rows, alone and next to ones with rows
+    {'Affordability_Rating': ['Expensive']},
+    {'Program': ['NOPE', 'BSIS'], BARRIERS: ['Not an option']},
+]
+
+
+@pytest.fixture
+def frame(survey):
+    # Not a multiple of 8 rows, so the last packed byte has padding bits
+    return clean_survey(survey.iloc[:197].set_axis(COLUMNS, axis=1))
+
+
+def _mask(df, column, values):
+    if column == BARRIERS:
+        columns = [barrier_column(value) for value in values if barrier_column(value) in df]
+        return df[columns].to_numpy().any(axis=1) if columns else np.zeros(len(df), dtype=bool)
+    return df[column].isin(values).to_numpy()
+
+
+@pytest.mark.parametrize('filters', FILTERS)
+@pytest.mark.parametrize('match_all', [True, False])
+def test_bitmap_selection_matches_masks(frame, filters, match_all):
+    df, unique_barriers = frame
+    index = build_index(df, unique_barriers)
+    masks = [_mask(df, column, values) for column, values in filters.items()]
+    expected = np.ones(len(df), dtype=bool)
+    if masks:
+        expected = np.logical_and.reduce(masks) if match_all else np.logical_or.reduce(masks)
+
+    bits = index.match(filters, match_all)
+    assert list(index.positions(bits)) == list(np.flatnonzero(expected))
+    assert index.count(bits) == expected.sum()
+
+
+def test_bitmap_values_follow_the_column(frame):
+    df, unique_barriers = frame
+    index = build_index(df, unique_barriers)
+    for column in GROUP_KEYS + QUESTIONS:
+        present = df[column].dropna()
+        # Categoricals in category (Likert) order, the others in order of appearance; no empty values
+        expected = [value for value in present.cat.categories if (present == value).any()] \
+            if hasattr(present, 'cat') else list(present.unique())
+        assert index.values(column) == expected, column
+    assert index.values(BARRIERS) == unique_barriers
+    for option in unique_barriers:
+        assert index.count(index.bitmap(BARRIERS, option)) == df[barrier_column(option)].sum()
@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+
+from conftest import write_csv
+from survey_cli import pseudonymizer
+from survey_data import COLUMNS, file_state
+from survey_pseudonym import KEY_ENV, STORED_TABLE, PseudonymTable, pseudonym_key
+from survey_store import SurveyStore
+
+
+def _count_hashes(monkeypatch):
+    hashed = []
+    original = PseudonymTable._hash
+
+    def counting(self, column, value):
+        hashed.append((column, value))
+        return original(self, column, value)
+
+    monkeypatch.setattr(PseudonymTable, '_hash', counting)
+    return hashed
+
+
+def _load(path, cache, key):
+    store = SurveyStore(str(path), str(cache), lean=True, prepare=pseudonymizer(key, str(cache)))
+    return store.get(file_state(str(path))).df
+
+
+def test_reloads_reuse_the_table(survey, tmp_path, monkeypatch):
+    path, cache = tmp_path / 'survey.csv', tmp_path / 'cache'
+    cache.mkdir()
+    (cache / STORED_TABLE).write_text('{}')
+    prepare = pseudonymizer(b'key', str(cache))
+    # An earlier version's stored table goes when the hook is made, not on every load
+    assert not (cache / STORED_TABLE).exists()
+    (cache / STORED_TABLE).write_text('{}')
+    hashed = _count_hashes(monkeypatch)
+
+    store = SurveyStore(str(path), str(cache), lean=True, prepare=prepare)
+    first = store.get(file_state(str(write_csv(survey.iloc[:100], path)))).df
+    write_csv(survey.iloc[100:], path, append=True)
+    second = store.get(file_state(str(path))).df
+    # An edited row makes the next load read the whole file again
+    edited = survey.copy()
+    edited.iloc[3, COLUMNS.index('Name')] = 'Student X'
+    third = store.get(file_state(str(write_csv(edited, path)))).df
+
+    assert store.loads == 3
+    assert (cache / STORED_TABLE).exists()
+    # Each distinct name and email hashed once over all three loads
+    plain = edited.set_axis(COLUMNS, axis=1)
+    assert len(hashed) == len(set(hashed)) == plain['Name'].nunique() + plain['Email'].nunique() + 1
+    pd.testing.assert_series_equal(second['Name'].iloc[:100], first['Name'])
+    pd.testing.assert_frame_equal(third[['Name', 'Email']].drop(index=3), second[['Name', 'Email']].drop(index=3))
+    assert not third['Name'].isin(plain['Name']).any()
+
+
+def test_same_key_gives_same_pseudonyms_after_restart(survey, tmp_path, monkeypatch):
+    monkeypatch.delenv(KEY_ENV, raising=False)
+    path = write_csv(survey, tmp_path / 'survey.csv')
+    # Each "run" makes its key, table and store anew; the generated key file carries over
+    key = pseudonym_key(cache_dir=str(tmp_path / 'cache'))
+    assert os.path.exists(tmp_path / 'cache' / 'pseudonym.key')
+    first = _load(path, tmp_path / 'cache', key)
+    restarted = pseudonym_key(cache_dir=str(tmp_path / 'cache'))
+    assert restarted == key
+    # Another cache dir, so the second run parses the CSV rather than reading the first's snapshot
+    second = _load(path, tmp_path / 'other', restarted)
+    pd.testing.assert_frame_equal(first[['Name', 'Email']], second[['Name', 'Email']])
+
+    other = _load(path, tmp_path / 'third', b'another key')
+    assert not other['Name'].dropna().isin(first['Name']).any()
+    names = pd.Series(['Ana Cruz'])
+    table = PseudonymTable(key)
+    assert table.pseudonymize(names, 'Name')[0] != table.pseudonymize(names, 'Email')[0]
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+import survey_reports
+from survey_analytics import BARRIERS, build_cube, section_scores
+from survey_data import COLUMNS, barrier_column, clean_survey
+from survey_tables import QUESTION_VIEWS, section_summaries, section_summary
+
+COMMENT = '東京のツアーがいいです 👍 — 서울도 좋아요 (ＦＵＬＬ) Ñandú ⚠️'
+
+
+def test_plain_drops_only_emoji():
+    assert survey_reports._plain('😊 Positive') == 'Positive'
+    assert survey_reports._plain('⚠️ Financial Concern') == 'Financial Concern'
+    assert survey_reports._plain('👨‍👩‍👧 family') == 'family'
+    assert survey_reports._plain(COMMENT) == '東京のツアーがいいです  — 서울도 좋아요 (ＦＵＬＬ) Ñandú'
+
+
+# Without a CJK font installed the glyphs are drawn as boxes, with a warning each
+@pytest.mark.filterwarnings('ignore:Glyph')
+def test_pdf_keeps_non_latin_text(survey, tmp_path, monkeypatch):
+    survey = survey.copy()
+    survey.columns = COLUMNS
+    survey.loc[0, 'Name'] = '김민준'
+    survey.loc[0, 'Additional_Comments'] = COMMENT
+    df, unique_barriers = clean_survey(survey)
+    cube = build_cube(df, unique_barriers)
+    label = df['Program_Section'].iloc[0]
+    section = df[df['Program_Section'] == label]
+    written = []
+    real_write_lines = survey_reports._write_lines
+    monkeypatch.setattr(survey_reports, '_write_lines',
+                        lambda pdf, page, lines: (written.extend(text for text, _, _ in lines),
+                                                  real_write_lines(pdf, page, lines)))
+    report = {'summary': section_summary(cube, section_scores(cube), label), 'students': section[['Name', 'Email']],
+              'comments': section.loc[section['Additional_Comments'].notna(), ['Name', 'Additional_Comments']],
+              'wordcloud_png': None}
+    survey_reports.render_pdf(report, str(tmp_path / 'section.pdf'))
+
+    assert any(line.startswith('1. 김민준 <') for line in written)
+    assert '김민준: 東京のツアーがいいです  — 서울도 좋아요 (ＦＵＬＬ) Ñandú' in written
+    assert pd.Series(written).str.contains('[\U0001F300-\U0001FAFF]').sum() == 0
+
+
+def test_section_breakdowns_match_rows(survey):
+    df, unique_barriers = clean_survey(survey.set_axis(COLUMNS, axis=1))
+    cube = build_cube(df, unique_barriers)
+    for label, summary in section_summaries(cube, section_scores(cube)).items():
+        rows = df[df['Program_Section'] == label]
+        total = len(rows)
+        assert summary['total'] == total
+        expected = {question: rows[question].value_counts() for question, _ in QUESTION_VIEWS.values()}
+        expected[BARRIERS] = pd.Series({barrier: rows[barrier_column(barrier)].sum() for barrier in unique_barriers})
+        for question, counts in expected.items():
+            counts = counts[counts > 0]
+            breakdown = summary['breakdowns'][question]
+            assert {answer: (count, pct) for answer, count, pct in breakdown} == {
+                answer: (count, f'{count / total * 100:.1f}%') for answer, count in counts.items()}, (label, question)
+            # Most chosen first, as the dashboard and the reports list them
+            assert [count for _, count, _ in breakdown] == sorted(counts, reverse=True)
+            answer, count, pct = summary['top'][question]
+            assert count == counts.max() and counts[answer] == count and pct == count / total * 100
+        assert summary['barriers_reported'] == expected[BARRIERS].sum()
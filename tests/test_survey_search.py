@@ -0,0 +1,90 @@
+import re
+
+import numpy as np
+import pytest
+
+from conftest import MULTILINE_ROWS
+from survey_data import COLUMNS, arrow_strings, clean_survey
+from survey_search import CommentIndex, highlight
+
+QUERIES = [
+    'manila', 'MANILA', 'Cebu tour', '"Cebu air"', "doesn't", 'expens*', 'Manil*', '"the th*"', 'visa',
+    # Excluded words and phrases, and a query of nothing but exclusions
+    'tour -manila', '-cebu Manila -"to and"', '-tour',
+    # Words of the multi-line comments, phrases across their line breaks and quotes
+    'three', '"9 line two and"', '"line two"', '"one of 1*"', 'line -"of 99"',
+]
+
+
+def _words(text):
+    return re.findall(r'[^\W_]+', text.lower())
+
+
+def _has(words, clause):
+    return any(all(words[start + k] == word or prefix and words[start + k].startswith(word)
+                   for k, (word, prefix) in enumerate(clause))
+               for start in range(len(words) - len(clause) + 1))
+
+
+def _scan(comments, query):
+    # The query read by hand, and every comment split and compared word by word
+    clauses = []
+    for minus, phrase, word in re.findall(r'(-?)(?:"([^"]*)"?|(\S+))', query):
+        text = phrase or word
+        clause = [(word, False) for word in _words(text)]
+        if clause and text.endswith('*'):
+            clause[-1] = (clause[-1][0], True)
+        if clause:
+            clauses.append((clause, bool(minus)))
+    if all(negated for _, negated in clauses):
+        return []
+    return [row for row, text in enumerate(comments) if isinstance(text, str) and text.strip()
+            and all(_has(_words(text), clause) != negated for clause, negated in clauses)]
+
+
+@pytest.fixture(params=['object', 'arrow'])
+def frame(request, survey):
+    df, _ = clean_survey(survey.set_axis(COLUMNS, axis=1))
+    return arrow_strings(df) if request.param == 'arrow' else df
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_matches_scan(frame, query):
+    comments = list(frame['Additional_Comments'])
+    found = CommentIndex.build(frame).search(query)
+    assert list(found) == _scan(comments, query)
+
+
+def test_queries_find_something(frame):
+    comments = list(frame['Additional_Comments'])
+    # Otherwise an index that finds nothing would pass the comparison above
+    for query in ['manila', 'Cebu tour', '"Cebu air"', "doesn't", '"the th*"', 'expens*',
+                  'tour -manila', '"9 line two and"']:
+        assert _scan(comments, query), query
+    assert set(_scan(comments, 'three')) == set(MULTILINE_ROWS)
+    assert 0 < len(_scan(comments, 'tour -manila')) < len(_scan(comments, 'tour'))
+    assert len(_scan(comments, '-cebu Manila -"to and"')) < len(_scan(comments, 'manila'))
+
+
+def test_extended_index_matches_build(frame):
+    built = CommentIndex.build(frame)
+    grown = CommentIndex()
+    # Appends of unequal sizes, one starting on a multi-line comment, so segments merge at different points
+    for start, end in zip([0, 60, 100, 101, 170], [60, 100, 101, 170, len(frame)]):
+        grown = grown.extend(frame.iloc[:end], start)
+    assert len(grown.segments) > 1
+    assert grown.comments == built.comments == frame['Additional_Comments'].str.strip().fillna('').ne('').sum()
+    for query in QUERIES:
+        assert np.array_equal(grown.search(query), built.search(query)), query
+        assert grown.matched_terms(query) == built.matched_terms(query), query
+
+
+def test_highlight_marks_matched_words(frame):
+    index = CommentIndex.build(frame)
+    terms = index.matched_terms('Manil* -cebu')
+    assert terms == {'manila'}
+    text = frame['Additional_Comments'].iloc[index.search('Manil* -cebu')[0]]
+    marked = highlight(text, terms)
+    assert marked.replace('**', '') == text
+    assert re.findall(r'\*\*([^*]+)\*\*', marked) == [word for word in re.findall(r'[^\W_]+', text)
+                                                     if word.lower() == 'manila']
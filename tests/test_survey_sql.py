@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from conftest import assert_same_cube, write_csv
+from survey_analytics import BARRIERS, build_cube, build_index, select
+from survey_data import ingest_survey
+from survey_sql import SqlRowView, SurveyDatabase
+
+# Answer filters cut across sections, so they are counted by SQLite rather than summed from stored cubes
+ANSWERS = [
+    {},
+    {'Affordability_Rating': ['Very Expensive', 'Expensive']},
+    {BARRIERS: ['Too expensive', 'Safety concerns'], 'Manila_Willingness': ['No', 'Maybe/Undecided']},
+]
+
+
+@pytest.fixture
+def loaded(survey, tmp_path):
+    path = write_csv(survey, tmp_path / 'survey.csv')
+    df, unique_barriers, info = ingest_survey(path, tmp_path / 'cache')
+    return path, df, unique_barriers, info
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SurveyDatabase(str(tmp_path / 'survey.db'), create=True)
+    yield database
+    database.close()
+
+
+@pytest.mark.parametrize('answers', ANSWERS)
+@pytest.mark.parametrize('match_all', [True, False])
+def test_selection_matches_memory(loaded, database, answers, match_all):
+    path, df, unique_barriers, info = loaded
+    cube = build_cube(df, unique_barriers)
+    assert database.ingest('survey', df, unique_barriers, cube, info, str(path))
+    programs = sorted(df['Program'].dropna().unique())[::2]
+    sections = ['A', 'C', 'D']
+
+    expected = select(df, unique_barriers, cube, build_index(df, unique_barriers), programs, sections, answers,
+                      match_all)
+    assert len(expected.positions)
+    got = database.select(programs, sections, answers, match_all)
+    assert_same_cube(got.cube, expected.cube)
+    rows = SqlRowView(database, got.where)
+    assert len(rows) == len(expected.positions)
+    names = rows.rows(rows['Manila_Willingness'] == 'No', ['Name'])['Name']
+    chosen = df.iloc[expected.positions]
+    assert list(names) == list(chosen.loc[chosen['Manila_Willingness'] == 'No', 'Name'])
+
+
+def test_streamed_ingest_matches_frame_ingest(loaded, database, tmp_path):
+    path, df, unique_barriers, info = loaded
+    cube = build_cube(df, unique_barriers)
+    database.ingest('survey', df, unique_barriers, cube, info, str(path))
+    # Chunks of 10 rows: several end inside a multi-line comment's lines
+    streamed = SurveyDatabase(str(tmp_path / 'streamed.db'), create=True)
+    try:
+        assert streamed.ingest_csv('survey', str(path), chunksize=10).rows == len(df)
+        assert streamed.ingest_csv('survey', str(path), chunksize=10) is None
+        assert_same_cube(streamed.select().cube, cube)
+        assert_same_cube(streamed.cube(), database.cube())
+        for column in ['Program', 'Affordability_Rating', BARRIERS]:
+            assert streamed.values(column) == database.values(column)
+        columns = ['Name', 'Email', 'Additional_Comments']
+        pd.testing.assert_frame_equal(streamed.rows(streamed.selection(), columns),
+                                      database.rows(database.selection(), columns))
+    finally:
+        streamed.close()
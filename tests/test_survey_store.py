@@ -0,0 +1,30 @@
+import pytest
+
+from conftest import assert_same_cube, assert_same_frame, write_csv
+from survey_analytics import build_cube
+from survey_data import file_state
+from survey_store import SurveyStore
+
+
+@pytest.mark.parametrize('lean', [False, True])
+def test_append_prepares_only_new_rows(survey, tmp_path, lean):
+    path = tmp_path / 'survey.csv'
+    prepared = []
+
+    def prepare(df):
+        prepared.append(list(df.index))
+        df['Name'] = df['Name'].str.upper()
+        return df
+
+    store = SurveyStore(str(path), str(tmp_path / 'cache'), lean=lean, prepare=prepare)
+    store.get(file_state(str(write_csv(survey.iloc[:100], path))))
+    # Row 100 starts with a multi-line comment
+    write_csv(survey.iloc[100:], path, append=True)
+    data = store.get(file_state(str(path)))
+
+    assert prepared == [list(range(100)), list(range(100, len(survey)))]
+    expected = SurveyStore(str(path), str(tmp_path / 'fresh'), lean=lean, prepare=prepare).get(file_state(str(path)))
+    assert_same_frame(data.df, expected.df)
+    assert data.unique_barriers == expected.unique_barriers
+    assert_same_cube(data.cube, build_cube(expected.df, expected.unique_barriers))
+    assert list(data.comments.search('three')) == list(expected.comments.search('three'))
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import MULTILINE_ROWS, assert_same_cube, assert_same_frame, write_csv
+from survey_analytics import BARRIERS, GROUP_KEYS, QUESTIONS, RowView, build_cube, build_index
+from survey_data import arrow_strings, read_survey_csv
+from survey_stream import stream_survey
+from survey_tables import comments_tables
+
+
+@pytest.mark.parametrize('chunksize', [10, 100, 1000])
+def test_stream_matches_whole_read(survey, tmp_path, chunksize):
+    path = write_csv(survey, tmp_path / 'survey.csv')
+    chunks = []
+    streamed = stream_survey(path, chunksize, on_chunk=lambda df, _: chunks.append(df.index))
+    df, unique_barriers = read_survey_csv(path)
+
+    # Chunks follow the records: rows 9 and 10 (both over several lines) land in different ones
+    assert [index[0] for index in chunks] == list(range(0, len(df), chunksize))
+    assert {9, 10} <= set(MULTILINE_ROWS)
+    assert streamed.rows == len(df)
+    assert streamed.last_timestamp == df['Timestamp'].iloc[-1]
+    assert streamed.unique_barriers == unique_barriers
+    assert_same_cube(streamed.cube, build_cube(df, unique_barriers))
+    index = build_index(df, unique_barriers)
+    for column in GROUP_KEYS + QUESTIONS + [BARRIERS]:
+        assert streamed.values(column) == index.values(column), column
+
+    lean = arrow_strings(df)
+    expected = comments_tables(None, None, RowView(lean, np.arange(len(lean))))['comments']
+    assert_same_frame(streamed.comments(), expected)
+    assert streamed.comments()['Additional_Comments'].str.contains('\n').sum() == len(MULTILINE_ROWS)
+    pd.testing.assert_frame_equal(streamed.empty_rows(), lean.iloc[:0])